@@ -0,0 +1,249 @@
+"""
+Barrido de parámetros de las estrategias de apuesta con caché de resultados en disco.
+
+Cada celda de la grilla (estrategia, criterio, capital, apuesta inicial) se
+simula con el motor vectorizado y se guarda un resumen en un archivo JSON
+cuyo nombre es un hash de los parámetros, la semilla y la versión del código.
+Al repetir una grilla que se superpone con otra ya calculada solo se
+simulan las celdas nuevas.
+
+Uso:
+    python3 barrido.py [-s m,d] [-k rojo,par] [-a 100,inf] [--apuestas 1] [-c CORRIDAS] [-n TIRADAS]
+                       [--grilla GRILLA.json] [--seed SEMILLA] [--workers WORKERS]
+"""
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from comun.perezoso import ModuloPerezoso
+from comun.paralelo import ejecutar_corridas
+from comun.semillas import generador_numpy
+from estrategias import simular_estrategia
+from tp_2 import CRITERIOS
+
+np = ModuloPerezoso('numpy')
+
+# Archivos cuyo contenido define los resultados, relativos a este directorio: si cambian, la caché
+# anterior deja de valer (tp_2.py define CRITERIOS y comun/semillas.py cómo se derivan las semillas)
+ARCHIVOS_VERSIONADOS = ('barrido.py', 'estrategias.py', 'progresion.py', 'tp_2.py',
+                        os.path.join(os.pardir, 'comun', 'semillas.py'))
+
+DIRECTORIO_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache_barrido')
+
+_version_codigo = None
+
+
+def version_codigo():
+    """
+    Hash del código que calcula cada celda.
+
+    Retorna:
+        str: Primeros 16 dígitos hexadecimales del SHA-256 de ARCHIVOS_VERSIONADOS.
+    """
+    global _version_codigo
+    if _version_codigo is None:
+        digesto = hashlib.sha256()
+        directorio = os.path.dirname(os.path.abspath(__file__))
+        for nombre in ARCHIVOS_VERSIONADOS:
+            with open(os.path.join(directorio, nombre), 'rb') as archivo:
+                digesto.update(archivo.read())
+        _version_codigo = digesto.hexdigest()[:16]
+    return _version_codigo
+
+
+def expandir_grilla(grilla, cantidad_corridas, cantidad_tiradas, semilla):
+    """
+    Genera todas las combinaciones de la grilla.
+
+    Parámetros:
+        grilla (dict): Listas 'estrategias', 'criterios', 'capitales' (None para infinito) y 'apuestas'.
+        cantidad_corridas (int): Corridas por celda.
+        cantidad_tiradas (int): Tiradas por corrida.
+        semilla (int): Semilla raíz del barrido.
+
+    Retorna:
+        list: Un dict de parámetros por celda.
+    """
+    for criterio in grilla['criterios']:
+        if criterio not in CRITERIOS:
+            raise ValueError(f"Criterio {criterio} no soportado; opciones: {', '.join(CRITERIOS)}")
+    for estrategia in grilla['estrategias']:
+        if estrategia not in ('m', 'd', 'f', 'p'):
+            raise ValueError(f"Estrategia {estrategia} no soportada.")
+    # Los números se normalizan a float para que 100 y 100.0 compartan la clave de caché
+    return [
+        {'estrategia': estrategia, 'criterio': criterio, 'capital': None if capital is None else float(capital),
+         'apuesta': float(apuesta),
+         'corridas': cantidad_corridas, 'tiradas': cantidad_tiradas, 'semilla': semilla}
+        for estrategia, criterio, capital, apuesta in itertools.product(
+            grilla['estrategias'], grilla['criterios'], grilla['capitales'], grilla['apuestas'])
+    ]
+
+
+def clave_celda(celda):
+    """
+    Clave de caché de una celda: hash de sus parámetros, su semilla y la versión del código.
+
+    Parámetros:
+        celda (dict): Parámetros de la celda.
+
+    Retorna:
+        str: Hash SHA-256 en hexadecimal.
+    """
+    contenido = json.dumps(dict(celda, version=version_codigo()), sort_keys=True)
+    return hashlib.sha256(contenido.encode()).hexdigest()
+
+
+def simular_celda(celda):
+    """
+    Simula una celda y resume sus resultados.
+
+    La secuencia de semillas se deriva de la semilla y de los parámetros de la
+    celda, así que el resultado no depende de qué otras celdas tenga la grilla.
+
+    Parámetros:
+        celda (dict): Parámetros de la celda.
+
+    Retorna:
+        dict: Parámetros de la celda más la probabilidad de bancarrota, las tiradas medias
+        hasta la bancarrota y la media, mediana y percentiles 5 y 95 del capital final.
+    """
+    parametros = json.dumps({k: v for k, v in celda.items() if k != 'semilla'}, sort_keys=True)
+    entropia = int(hashlib.sha256(parametros.encode()).hexdigest()[:16], 16)
+    generador = generador_numpy(np.random.SeedSequence([celda['semilla'], entropia]))
+    salida = simular_estrategia(celda['estrategia'], CRITERIOS[celda['criterio']], celda['apuesta'],
+                                celda['tiradas'], celda['corridas'], generador, celda['capital'])
+    quebradas = salida['tiradas_ruina'] >= 0
+    capitales = salida['capitales_finales']
+    p5, mediana, p95 = np.percentile(capitales, (5, 50, 95)) if len(capitales) else (np.nan,) * 3
+    return dict(
+        celda,
+        probabilidad_ruina=float(quebradas.mean()) if len(quebradas) else np.nan,
+        tiradas_ruina_media=float(salida['tiradas_ruina'][quebradas].mean()) if quebradas.any() else np.nan,
+        capital_final_medio=float(capitales.mean()) if len(capitales) else np.nan,
+        capital_final_mediana=float(mediana),
+        capital_final_p5=float(p5),
+        capital_final_p95=float(p95),
+    )
+
+
+def _leer_cache(ruta):
+    try:
+        with open(ruta) as archivo:
+            return json.load(archivo)
+    except (OSError, ValueError):
+        return None
+
+
+def _escribir_cache(ruta, resultado):
+    # Se escribe en un temporal y se renombra, para no dejar archivos a medio escribir
+    temporal = f'{ruta}.{os.getpid()}.tmp'
+    with open(temporal, 'w') as archivo:
+        json.dump(resultado, archivo)
+    os.replace(temporal, ruta)
+
+
+def barrer(celdas, workers=1, directorio_cache=DIRECTORIO_CACHE):
+    """
+    Devuelve el resumen de cada celda, simulando solo las que no están en la caché.
+
+    Parámetros:
+        celdas (list): Parámetros de cada celda (ver expandir_grilla).
+        workers (int, opcional): Cantidad de procesos entre los que se reparten las celdas nuevas.
+        directorio_cache (str, opcional): Directorio de la caché; None para no usarla.
+
+    Retorna:
+        tuple: Resumen de cada celda, en el orden recibido, y cantidad de celdas leídas de la caché.
+    """
+    resultados = [None] * len(celdas)
+    rutas = [None] * len(celdas)
+    if directorio_cache is not None:
+        os.makedirs(directorio_cache, exist_ok=True)
+        for i, celda in enumerate(celdas):
+            rutas[i] = os.path.join(directorio_cache, clave_celda(celda) + '.json')
+            resultados[i] = _leer_cache(rutas[i])
+    pendientes = [i for i, resultado in enumerate(resultados) if resultado is None]
+
+    calculados = ejecutar_corridas(simular_celda, [celdas[i] for i in pendientes], workers)
+    for i, resultado in zip(pendientes, calculados):
+        resultados[i] = resultado
+        if rutas[i] is not None:
+            _escribir_cache(rutas[i], resultado)
+    return resultados, len(celdas) - len(pendientes)
+
+
+def _lista(texto, convertir=str):
+    return [convertir(valor.strip()) for valor in texto.split(',') if valor.strip()]
+
+
+def _capital(texto):
+    return None if texto in ('inf', 'i') else float(texto)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Barrido de parámetros de las estrategias de ruleta')
+    parser.add_argument('-s', '--estrategias', type=str, default='m,d,f,p',
+                        help='Estrategias separadas por coma (por defecto: m,d,f,p)')
+    parser.add_argument('-k', '--criterios', type=str, default='rojo',
+                        help=f"Criterios separados por coma, entre {', '.join(CRITERIOS)} (por defecto: rojo)")
+    parser.add_argument('-a', '--capitales', type=str, default='100',
+                        help='Capitales iniciales separados por coma; inf para infinito (por defecto: 100)')
+    parser.add_argument('--apuestas', type=str, default='1',
+                        help='Apuestas iniciales separadas por coma (por defecto: 1)')
+    parser.add_argument('--grilla', type=str, default=None,
+                        help='Archivo JSON con las listas estrategias, criterios, capitales (null para '
+                             'infinito) y apuestas; reemplaza a las opciones anteriores')
+    parser.add_argument('-c', '--numero_corridas', type=int, default=1000,
+                        help='Corridas por celda (por defecto: 1000)')
+    parser.add_argument('-n', '--numero_tiradas', type=int, default=1000,
+                        help='Tiradas por corrida (por defecto: 1000)')
+    parser.add_argument('--seed', type=int, default=0, help='Semilla raíz del barrido (por defecto: 0)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Cantidad de procesos para repartir las celdas (por defecto: 1)')
+    parser.add_argument('--cache-dir', type=str, default=DIRECTORIO_CACHE,
+                        help='Directorio de la caché de resultados (por defecto: TP_1.2/.cache_barrido)')
+    parser.add_argument('--sin-cache', action='store_true', help='Simula todas las celdas sin usar la caché')
+    parser.add_argument('--salida', type=str, default=None, help='Guarda los resultados en este archivo CSV')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.grilla:
+            with open(args.grilla) as archivo:
+                grilla = json.load(archivo)
+        else:
+            grilla = {'estrategias': _lista(args.estrategias), 'criterios': _lista(args.criterios),
+                      'capitales': _lista(args.capitales, _capital), 'apuestas': _lista(args.apuestas, float)}
+        if args.numero_corridas < 1 or args.numero_tiradas < 0:
+            raise ValueError("-c debe ser positivo y -n no negativo")
+        if args.workers < 1:
+            raise ValueError("--workers debe ser un entero positivo")
+        celdas = expandir_grilla(grilla, args.numero_corridas, args.numero_tiradas, args.seed)
+        if not celdas:
+            raise ValueError("La grilla no tiene celdas: cada lista debe tener al menos un valor")
+    except (OSError, KeyError, ValueError) as e:
+        print("Error en los argumentos de entrada:", e)
+        return
+
+    resultados, en_cache = barrer(celdas, args.workers, None if args.sin_cache else args.cache_dir)
+    print(f"celdas: {len(celdas)}  en caché: {en_cache}  simuladas: {len(celdas) - en_cache}")
+    for resultado in resultados:
+        capital = 'inf' if resultado['capital'] is None else resultado['capital']
+        print(f"{resultado['estrategia']}  {resultado['criterio']:>5}  capital={capital}  "
+              f"apuesta={resultado['apuesta']}  ruina={resultado['probabilidad_ruina']:.4f}  "
+              f"capital final medio={resultado['capital_final_medio']:.6g}")
+
+    if args.salida:
+        with open(args.salida, 'w', newline='') as archivo:
+            escritor = csv.DictWriter(archivo, fieldnames=list(resultados[0]))
+            escritor.writeheader()
+            escritor.writerows(resultados)
+    return resultados
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmarks de rendimiento de las estrategias de apuesta.
+
+Uso:
+    python3 benchmark.py [-c CORRIDAS] [-n TIRADAS] [--tramos TRAMOS]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from comun.semillas import generador_numpy, secuencia_raiz, secuencias_hijas
+from estrategias import simular_estrategia
+from tp_2 import CRITERIOS, Ruleta
+
+CRITERIO_ROJO = CRITERIOS['rojo']
+
+
+def benchmark_estrategia(estrategia, cantidad_corridas, cantidad_tiradas, semilla=0, capital=1000):
+    """
+    Mide el tiempo de simular una estrategia con el motor vectorizado.
+
+    Parámetros:
+        estrategia (str): 'm', 'p', 'd' o 'f'.
+        cantidad_corridas (int): Cantidad de corridas.
+        cantidad_tiradas (int): Cantidad de tiradas por corrida.
+        semilla (int, opcional): Semilla raíz.
+        capital (float, opcional): Capital inicial; None para capital infinito (sin bancarrotas).
+
+    Retorna:
+        float: Segundos transcurridos.
+    """
+    generador = generador_numpy(secuencia_raiz(semilla))
+    inicio = time.perf_counter()
+    simular_estrategia(estrategia, CRITERIO_ROJO, 1, cantidad_tiradas, cantidad_corridas, generador, capital=capital)
+    return time.perf_counter() - inicio
+
+
+def benchmark_fibonacci_largo(tiradas_por_tramo, tramos, semilla=0):
+    """
+    Mide corridas de fibonacci (motor escalar, capital infinito) cada vez más largas.
+
+    La corrida k tiene k tramos de tiradas; si el costo por tirada creciera con
+    la longitud de la corrida se vería en las corridas más largas.
+
+    Parámetros:
+        tiradas_por_tramo (int): Tiradas de cada tramo.
+        tramos (int): Cantidad de tramos de la corrida más larga.
+        semilla (int, opcional): Semilla del generador.
+
+    Retorna:
+        list: Microsegundos por tirada de cada corrida.
+    """
+    ruleta = Ruleta(tiradas_por_tramo, 0, 'f', None, CRITERIO_ROJO)
+    tiempos = []
+    for tramo in range(1, tramos + 1):
+        ruleta.cantidad_tiradas = tramo * tiradas_por_tramo
+        rng = generador_numpy(secuencias_hijas(1, semilla)[0])
+        inicio = time.perf_counter()
+        ruleta.simular_corrida(rng)
+        tiempos.append((time.perf_counter() - inicio) * 1e6 / ruleta.cantidad_tiradas)
+    return tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de las estrategias de apuesta')
+    parser.add_argument('-c', '--numero_corridas', type=int, default=100_000, help='Número de corridas')
+    parser.add_argument('-n', '--numero_tiradas', type=int, default=10_000, help='Número de tiradas')
+    parser.add_argument('--tramos', type=int, default=10,
+                        help='Tramos de N tiradas de la corrida larga de fibonacci (por defecto: 10)')
+    args = parser.parse_args()
+
+    # Con capital finito las corridas quebradas salen del lote y dejan de costar
+    for capital in (1000, None):
+        for estrategia in ('m', 'p', 'd', 'f'):
+            segundos = benchmark_estrategia(estrategia, args.numero_corridas, args.numero_tiradas, capital=capital)
+            print(f"estrategia {estrategia}  capital={capital or 'inf'}  c={args.numero_corridas:,}  "
+                  f"n={args.numero_tiradas:,}  {segundos:8.3f} s")
+
+    tiempos = benchmark_fibonacci_largo(args.numero_tiradas, args.tramos)
+    for tramo, microsegundos in enumerate(tiempos, start=1):
+        print(f"fibonacci escalar  n={tramo * args.numero_tiradas:,}  {microsegundos:6.2f} us/tirada")
+
+
+if __name__ == "__main__":
+    main()
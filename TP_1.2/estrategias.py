@@ -0,0 +1,268 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from comun.perezoso import ModuloPerezoso
+from progresion import PASO_INICIAL, PASO_MAXIMO, TERMINOS
+
+np = ModuloPerezoso('numpy')
+
+# Tamaño máximo (en bytes) del bloque de tiradas sorteadas por adelantado
+BYTES_BLOQUE = 1 << 26
+
+
+def tabla_ganadora(criterio):
+    """
+    Precalcula para cada número de la ruleta si la apuesta gana.
+
+    Parámetros:
+        criterio (list): Números que hacen ganar la apuesta.
+
+    Retorna:
+        np.ndarray: Vector booleano de 37 posiciones.
+    """
+    tabla = np.zeros(37, dtype=bool)
+    tabla[list(criterio)] = True
+    return tabla
+
+
+# Cada estrategia es un par de funciones: la primera convierte la tabla de aciertos
+# por número en la tabla del operando que corresponde a cada número, y la segunda
+# aplica un paso al estado de todas las corridas, en el lugar. El estado es la apuesta,
+# salvo en fibonacci, donde es el paso de la progresión. Así los
+# operandos de cada paso se obtienen con una sola indexación.
+
+def _operandos_martingala(ganadas):
+    # Gana: mantiene la apuesta; pierde: la duplica
+    return np.where(ganadas, 1.0, 2.0)
+
+
+def _operandos_paroli(ganadas):
+    # Gana: duplica la apuesta; pierde: la mantiene
+    return np.where(ganadas, 2.0, 1.0)
+
+
+def _operandos_d_alembert(ganadas):
+    # Gana: resta una unidad; pierde: suma una unidad
+    return np.where(ganadas, -1.0, 1.0)
+
+
+def _operandos_fibonacci(ganadas):
+    # Opera sobre el paso de la progresión: pierde avanza un paso, gana lo mantiene
+    return np.where(ganadas, 0, 1).astype(np.int16)
+
+
+def _paso_multiplicar(apuestas, factores):
+    apuestas *= factores
+
+
+def _paso_d_alembert(apuestas, deltas):
+    apuestas += deltas
+    # La apuesta mínima es 1; al perder la apuesta siempre supera ese mínimo
+    np.maximum(apuestas, 1, out=apuestas)
+
+
+def _paso_fibonacci(pasos, avances):
+    pasos += avances
+    np.minimum(pasos, PASO_MAXIMO, out=pasos)
+
+
+def _tabla_fibonacci():
+    """
+    Términos de la progresión de Fibonacci como float, para leerlos por paso.
+
+    Retorna:
+        np.ndarray: tabla[paso] = termino(paso).
+    """
+    global _TABLA_FIBONACCI
+    if _TABLA_FIBONACCI is None:
+        _TABLA_FIBONACCI = np.array([float(valor) for valor in TERMINOS])
+    return _TABLA_FIBONACCI
+
+
+_TABLA_FIBONACCI = None
+
+KERNELS = {
+    'm': (_operandos_martingala, _paso_multiplicar),
+    'p': (_operandos_paroli, _paso_multiplicar),
+    'd': (_operandos_d_alembert, _paso_d_alembert),
+    'f': (_operandos_fibonacci, _paso_fibonacci),
+}
+
+
+def reservar_historia(historia, cantidad_corridas, cantidad_tiradas):
+    """
+    Reserva las matrices de apuestas y capitales de cada tirada.
+
+    Parámetros:
+        historia (bool | str): False para no guardarlas, True para tenerlas en memoria, o un
+            directorio donde se escriben como apuestas.npy y capitales.npy mapeados en disco,
+            así la memoria usada no depende de la cantidad de corridas ni de tiradas.
+        cantidad_corridas (int): Filas de cada matriz.
+        cantidad_tiradas (int): Columnas de cada matriz.
+
+    Retorna:
+        tuple: Matrices (corridas, tiradas) de apuestas y de capitales, o (None, None).
+    """
+    if historia is False or historia is None:
+        return None, None
+    forma = (cantidad_corridas, cantidad_tiradas)
+    if historia is True:
+        return np.empty(forma), np.empty(forma)
+    os.makedirs(historia, exist_ok=True)
+    # En disco por columnas: cada bloque de tiradas se escribe como un tramo contiguo del
+    # archivo en lugar de tocar todas sus páginas
+    return tuple(np.lib.format.open_memmap(os.path.join(historia, f'{nombre}.npy'), mode='w+', shape=forma,
+                                           fortran_order=True)
+                 for nombre in ('apuestas', 'capitales'))
+
+
+def simular_estrategia(estrategia, criterio, apuesta_inicial, cantidad_tiradas, cantidad_corridas, generador,
+                       capital=None, guardar_historia=False):
+    """
+    Simula muchas corridas de una estrategia a la vez, avanzando todas juntas tirada a tirada.
+
+    Las tiradas se sortean por bloques de un único generador: cada llamada llena una
+    matriz (tiradas, corridas activas), así cada paso lee las tiradas de todas las
+    corridas en una fila contigua. Con el mismo generador y los mismos parámetros los
+    resultados son idénticos.
+
+    En cada tirada la apuesta se cobra (pago 1 a 1) o se pierde. Con capital finito,
+    una corrida quiebra cuando su próxima apuesta supera el capital disponible: se
+    registra y se retira del lote, así que las corridas quebradas no consumen más
+    tiempo ni sorteos.
+
+    Parámetros:
+        estrategia (str): 'm' (martingala), 'p' (paroli), 'd' (d'Alembert) o 'f' (fibonacci).
+        criterio (list): Números que hacen ganar la apuesta.
+        apuesta_inicial (float): Apuesta con la que comienza cada corrida.
+        cantidad_tiradas (int): Cantidad de tiradas por corrida.
+        cantidad_corridas (int): Cantidad de corridas.
+        generador (np.random.Generator): Generador del que se sortean las tiradas de todas las corridas.
+        capital (float, opcional): Capital inicial de cada corrida; None para capital infinito
+            (el capital parte de 0 y nunca quiebra).
+        guardar_historia (bool | str, opcional): Si se guarda la apuesta y el capital de cada
+            tirada; ver reservar_historia. Por defecto no se guardan, y la memoria usada no
+            depende de la cantidad de tiradas.
+
+    Retorna:
+        dict: 'apuestas' y 'capitales', matrices (corridas, tiradas) con la apuesta y el capital
+        tras cada tirada (o None); después de quebrar la apuesta es 0 y el capital queda fijo.
+        'apuestas_finales', 'capitales_finales' y 'tiradas_ruina', vectores por corrida; la
+        tirada de ruina es la cantidad de tiradas jugadas antes de quebrar, o -1 si no quebró.
+    """
+    if estrategia not in KERNELS:
+        raise ValueError(f"Estrategia {estrategia} no soportada.")
+    operandos_por_numero, paso_kernel = KERNELS[estrategia]
+    tabla = tabla_ganadora(criterio)
+    tabla_operandos = operandos_por_numero(tabla)
+    # Lo que suma cada número al capital, por unidad apostada
+    tabla_signos = np.where(tabla, 1.0, -1.0)
+    finito = capital is not None
+    capital_inicial = float(capital) if finito else 0.0
+
+    apuestas = np.full(cantidad_corridas, apuesta_inicial, dtype=np.float64)
+    capitales = np.full(cantidad_corridas, capital_inicial)
+    es_fibonacci = estrategia == 'f'
+    if es_fibonacci:
+        # El estado de fibonacci es el paso de la progresión, del que se deriva la apuesta
+        estados = np.full(cantidad_corridas, PASO_INICIAL, dtype=np.int16)
+        terminos = _tabla_fibonacci()
+    else:
+        estados = apuestas
+
+    # Resultados indexados por corrida; las corridas activas se identifican por su índice
+    activas = np.arange(cantidad_corridas)
+    apuestas_finales = np.full(cantidad_corridas, float(apuesta_inicial))
+    capitales_finales = np.full(cantidad_corridas, capital_inicial)
+    tiradas_ruina = np.full(cantidad_corridas, -1, dtype=np.int64)
+    historia_apuestas, historia_capitales = reservar_historia(guardar_historia, cantidad_corridas, cantidad_tiradas)
+    guardar = historia_apuestas is not None
+
+    if finito and apuesta_inicial > capital_inicial:
+        # Ninguna corrida puede cubrir la primera apuesta
+        tiradas_ruina[:] = 0
+        activas, apuestas, capitales = activas[:0], apuestas[:0], capitales[:0]
+
+    # Bytes por tirada y corrida: el sorteo en int16 (el más rápido de NumPy), su copia
+    # en int8 (la más rápida de indexar) y, si se guarda la historia, su bloque en float64
+    bytes_celda = 3 + (16 if guardar else 0)
+    tiradas_bloque = max(1, min(cantidad_tiradas, BYTES_BLOQUE // bytes_celda // max(1, cantidad_corridas)))
+    memoria_bloque = np.empty(tiradas_bloque * cantidad_corridas, dtype=np.int8)
+    if guardar:
+        # La historia de cada bloque se escribe fila a fila (una fila contigua por tirada)
+        # y se vuelca traspuesta a las matrices (corridas, tiradas) una vez por bloque
+        bloque_apuestas = np.empty((tiradas_bloque, cantidad_corridas))
+        bloque_capitales = np.empty((tiradas_bloque, cantidad_corridas))
+    escritas = 0
+
+    # Las apuestas que crecen sin límite llegan a inf, que es el resultado esperado
+    with np.errstate(over='ignore', invalid='ignore'):
+        for inicio in range(0, cantidad_tiradas, tiradas_bloque):
+            if not len(activas):
+                break
+            cantidad = min(tiradas_bloque, cantidad_tiradas - inicio)
+            bloque = memoria_bloque[:cantidad * len(activas)].reshape(cantidad, len(activas))
+            np.copyto(bloque, generador.integers(0, 37, size=bloque.shape, dtype=np.int16), casting='unsafe')
+            # Columna del bloque de cada corrida activa; None mientras no quiebre ninguna
+            columnas = None
+            if guardar:
+                # Las corridas ya quebradas quedan con apuesta 0 y su capital final
+                bloque_apuestas[:cantidad] = 0.0
+                bloque_capitales[:cantidad] = capitales_finales
+
+            for paso in range(cantidad):
+                fila = bloque[paso] if columnas is None else bloque[paso, columnas]
+                capitales += apuestas * tabla_signos.take(fila)
+                paso_kernel(estados, tabla_operandos.take(fila))
+                if es_fibonacci:
+                    np.take(terminos, estados, out=apuestas)
+                    apuestas *= apuesta_inicial
+                if guardar:
+                    if len(activas) == cantidad_corridas:
+                        bloque_apuestas[paso] = apuestas
+                        bloque_capitales[paso] = capitales
+                    else:
+                        bloque_apuestas[paso, activas] = apuestas
+                        bloque_capitales[paso, activas] = capitales
+                if not finito:
+                    continue
+
+                quebradas = apuestas > capitales
+                if not quebradas.any():
+                    continue
+                retiradas = activas[quebradas]
+                tiradas_ruina[retiradas] = inicio + paso + 1
+                apuestas_finales[retiradas] = apuestas[quebradas]
+                capitales_finales[retiradas] = capitales[quebradas]
+                if guardar:
+                    bloque_capitales[paso + 1:cantidad, retiradas] = capitales[quebradas]
+                siguen = ~quebradas
+                if columnas is None:
+                    columnas = np.arange(len(activas))
+                columnas = columnas[siguen]
+                activas = activas[siguen]
+                apuestas = apuestas[siguen]
+                capitales = capitales[siguen]
+                estados = estados[siguen] if es_fibonacci else apuestas
+                if not len(activas):
+                    break
+
+            if guardar:
+                historia_apuestas[:, inicio:inicio + cantidad] = bloque_apuestas[:cantidad].T
+                historia_capitales[:, inicio:inicio + cantidad] = bloque_capitales[:cantidad].T
+            escritas = inicio + cantidad
+
+    apuestas_finales[activas] = apuestas
+    capitales_finales[activas] = capitales
+    if guardar and escritas < cantidad_tiradas:
+        # Todas las corridas quebraron antes de la última tirada
+        historia_apuestas[:, escritas:] = 0.0
+        historia_capitales[:, escritas:] = capitales_finales[:, None]
+    return {
+        'apuestas': historia_apuestas,
+        'capitales': historia_capitales,
+        'apuestas_finales': apuestas_finales,
+        'capitales_finales': capitales_finales,
+        'tiradas_ruina': tiradas_ruina,
+    }
@@ -2,12 +2,6 @@ import matplotlib.pyplot as plt
 import random
 
 
-def fibonacci(n):
-  if n == 0 or n == 1:
-    return n
-  else:
-    return fibonacci(n - 1) + fibonacci(n - 2)
-
 def simulacion(tipo_capital, capital, corridas):
   secuencia_fibonacci = []
   ganancias_perdidas = []
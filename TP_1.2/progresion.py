@@ -0,0 +1,62 @@
+"""
+Progresión de Fibonacci para la estrategia de apuestas homónima.
+
+La apuesta de la estrategia es apuesta_inicial * fibonacci(paso): se guarda el
+paso de la progresión, no el monto, y cada término se lee de una tabla
+precalculada de tamaño fijo.
+"""
+
+# Paso con el que comienza cada corrida: fibonacci(1) = 1
+PASO_INICIAL = 1
+
+# Último paso de la progresión: fibonacci(1476) es el mayor término representable
+# como float, así que la apuesta deja de crecer ahí en lugar de desbordarse
+PASO_MAXIMO = 1476
+
+
+def _calcular_terminos(paso_maximo):
+    """
+    Calcula los términos de Fibonacci hasta paso_maximo inclusive.
+
+    Parámetros:
+        paso_maximo (int): Último término a calcular.
+
+    Retorna:
+        tuple: terminos[n] = fibonacci(n).
+    """
+    terminos = [0, 1]
+    while len(terminos) <= paso_maximo:
+        terminos.append(terminos[-1] + terminos[-2])
+    return tuple(terminos[:paso_maximo + 1])
+
+
+TERMINOS = _calcular_terminos(PASO_MAXIMO)
+
+
+def termino(paso):
+    """
+    Devuelve fibonacci(paso) en O(1), sin calcular ni guardar términos nuevos.
+
+    Parámetros:
+        paso (int): Paso de la progresión; los pasos mayores a PASO_MAXIMO se truncan.
+
+    Retorna:
+        int: Término de la progresión.
+    """
+    if paso < 0:
+        raise ValueError(f"El paso de la progresión no puede ser negativo: {paso}")
+    return TERMINOS[min(paso, PASO_MAXIMO)]
+
+
+def siguiente_paso(paso):
+    """
+    Avanza un paso en la progresión (tras perder una apuesta).
+
+    Parámetros:
+        paso (int): Paso actual.
+
+    Retorna:
+        int: Paso siguiente, sin superar PASO_MAXIMO.
+    """
+    return min(paso + 1, PASO_MAXIMO)
+
@@ -0,0 +1,275 @@
+"""
+Probabilidad de bancarrota y duración esperada de una estrategia, calculadas con una cadena de Markov.
+
+El estado de la cadena es (capital, estado de la apuesta): la apuesta misma en
+martingala, paroli y d'Alembert, o el paso de la progresión en fibonacci. Las
+reglas de cada estrategia son las mismas funciones que usa tp_2.py y la
+bancarrota se define igual que en la simulación: la próxima apuesta supera el
+capital disponible.
+
+Uso:
+    python3 ruina.py -s ESTRATEGIA -a CAPITAL [-n TIRADAS] [--meta META] [--corridas CORRIDAS]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from comun.perezoso import ModuloPerezoso
+from comun.semillas import generador_numpy, secuencia_raiz
+from estrategias import simular_estrategia
+from progresion import PASO_INICIAL, termino
+from tp_2 import d_alembert, fibonacci_estrategia, martingala, paroli
+
+np = ModuloPerezoso('numpy')
+sparse = ModuloPerezoso('scipy.sparse')
+sparse_linalg = ModuloPerezoso('scipy.sparse.linalg')
+
+REGLAS = {'m': martingala, 'p': paroli, 'd': d_alembert, 'f': fibonacci_estrategia}
+
+# Tope de estados transitorios: sin meta, las estrategias cuya apuesta no vuelve a la
+# inicial tras ganar (martingala y paroli) alcanzan capitales cada vez más dispersos
+MAX_ESTADOS = 500_000
+
+
+def construir_cadena(estrategia, criterio, apuesta_inicial, capital, meta=None, horizonte=None):
+    """
+    Construye la parte transitoria de la cadena, recorriendo los estados alcanzables desde el inicial.
+
+    Los estados absorbentes (bancarrota y, si se indica, alcanzar la meta) no se
+    enumeran: se guarda para cada estado transitorio la probabilidad de caer en ellos.
+
+    Parámetros:
+        estrategia (str): 'm', 'p', 'd' o 'f'.
+        criterio (list): Números que hacen ganar la apuesta.
+        apuesta_inicial (float): Apuesta con la que comienza la corrida.
+        capital (float): Capital inicial.
+        meta (float, opcional): Capital con el que el jugador se retira; None para no retirarse.
+        horizonte (int, opcional): Cantidad de tiradas; solo se recorren los estados alcanzables en ellas.
+
+    Retorna:
+        dict: 'transiciones' (matriz dispersa Q entre estados transitorios), 'a_ruina' y 'a_meta'
+        (probabilidad de absorción desde cada estado) y 'estados' (lista de (capital, estado)),
+        con el estado inicial en la posición 0. Si la primera apuesta no se puede cubrir,
+        'estados' queda vacía.
+    """
+    if estrategia not in REGLAS:
+        raise ValueError(f"Estrategia {estrategia} no soportada.")
+    if meta is None and horizonte is None:
+        raise ValueError("Sin meta ni horizonte la cadena tiene infinitos estados.")
+    perdedores = [numero for numero in range(37) if numero not in criterio]
+    if not criterio or not perdedores:
+        raise ValueError("El criterio debe tener entre 1 y 36 números.")
+    regla = REGLAS[estrategia]
+    p_ganar = len(set(criterio)) / 37
+    numero_gana, numero_pierde = criterio[0], perdedores[0]
+
+    if estrategia == 'f':
+        inicial = PASO_INICIAL
+
+        def apuesta(estado):
+            return apuesta_inicial * termino(estado)
+    else:
+        inicial = float(apuesta_inicial)
+
+        def apuesta(estado):
+            return estado
+
+    estados = []
+    indices = {}
+    filas, columnas, probabilidades = [], [], []
+    a_ruina, a_meta = [], []
+    if apuesta(inicial) > capital:
+        return {'transiciones': sparse.csr_matrix((0, 0)), 'a_ruina': np.zeros(0), 'a_meta': np.zeros(0),
+                'estados': estados}
+
+    indices[(capital, inicial)] = 0
+    estados.append((capital, inicial))
+    profundidades = [0]
+    pendiente = 0
+    while pendiente < len(estados):
+        origen = pendiente
+        pendiente += 1
+        capital_actual, estado = estados[origen]
+        ruina = meta_alcanzada = 0.0
+        if horizonte is None or profundidades[origen] < horizonte:
+            monto = apuesta(estado)
+            for numero, probabilidad, ganancia in ((numero_gana, p_ganar, monto),
+                                                   (numero_pierde, 1 - p_ganar, -monto)):
+                nuevo_capital = capital_actual + ganancia
+                nuevo_estado = regla(criterio, numero, estado)
+                if apuesta(nuevo_estado) > nuevo_capital:
+                    ruina += probabilidad
+                elif meta is not None and nuevo_capital >= meta:
+                    meta_alcanzada += probabilidad
+                else:
+                    clave = (nuevo_capital, nuevo_estado)
+                    destino = indices.get(clave)
+                    if destino is None:
+                        if len(estados) >= MAX_ESTADOS:
+                            raise ValueError(_mensaje_limite(profundidades[origen] + 1, meta, horizonte))
+                        destino = indices[clave] = len(estados)
+                        estados.append(clave)
+                        profundidades.append(profundidades[origen] + 1)
+                    filas.append(origen)
+                    columnas.append(destino)
+                    probabilidades.append(probabilidad)
+        a_ruina.append(ruina)
+        a_meta.append(meta_alcanzada)
+
+    transiciones = sparse.csr_matrix((probabilidades, (filas, columnas)), shape=(len(estados), len(estados)))
+    return {'transiciones': transiciones, 'a_ruina': np.array(a_ruina), 'a_meta': np.array(a_meta),
+            'estados': estados}
+
+
+def _mensaje_limite(tirada, meta, horizonte):
+    """Error al superar MAX_ESTADOS, con la tirada en que se alcanzó y cómo achicar la cadena."""
+    sugerencias = []
+    if horizonte is not None:
+        sugerencias.append(f"reduzca el horizonte a menos de {tirada} tiradas")
+    sugerencias.append("indique una meta" if meta is None else "acerque la meta al capital inicial")
+    donde = f"en la tirada {tirada}" + (f" de {horizonte}" if horizonte is not None else "")
+    return f"La cadena supera {MAX_ESTADOS:,} estados {donde}; {' o '.join(sugerencias)}."
+
+
+def resolver_ruina(estrategia, criterio, apuesta_inicial, capital, meta=None, horizonte=None):
+    """
+    Calcula la probabilidad de bancarrota y la duración esperada sin simular.
+
+    Sin horizonte se resuelven los sistemas (I - Q) x = r con una factorización LU
+    dispersa; con horizonte se propaga la distribución del estado tirada a tirada.
+
+    Parámetros:
+        estrategia (str): 'm', 'p', 'd' o 'f'.
+        criterio (list): Números que hacen ganar la apuesta.
+        apuesta_inicial (float): Apuesta con la que comienza la corrida.
+        capital (float): Capital inicial.
+        meta (float, opcional): Capital con el que el jugador se retira.
+        horizonte (int, opcional): Cantidad máxima de tiradas de la corrida.
+
+    Retorna:
+        dict: 'probabilidad_ruina', 'probabilidad_meta', 'duracion_esperada' (tiradas jugadas
+        hasta quebrar, retirarse o agotar el horizonte) y 'estados' (cantidad de estados transitorios).
+    """
+    cadena = construir_cadena(estrategia, criterio, apuesta_inicial, capital, meta, horizonte)
+    cantidad_estados = len(cadena['estados'])
+    if not cantidad_estados or horizonte == 0:
+        return {'probabilidad_ruina': float(not cantidad_estados), 'probabilidad_meta': 0.0,
+                'duracion_esperada': 0.0, 'estados': cantidad_estados}
+
+    if horizonte is None:
+        sistema = sparse_linalg.splu((sparse.identity(cantidad_estados, format='csc')
+                                      - cadena['transiciones']).tocsc())
+        return {
+            'probabilidad_ruina': float(sistema.solve(cadena['a_ruina'])[0]),
+            'probabilidad_meta': float(sistema.solve(cadena['a_meta'])[0]),
+            'duracion_esperada': float(sistema.solve(np.ones(cantidad_estados))[0]),
+            'estados': cantidad_estados,
+        }
+
+    # distribucion[i] es la probabilidad de seguir jugando en el estado i
+    traspuesta = cadena['transiciones'].T.tocsr()
+    distribucion = np.zeros(cantidad_estados)
+    distribucion[0] = 1.0
+    probabilidad_ruina = probabilidad_meta = duracion = 0.0
+    for _ in range(horizonte):
+        duracion += distribucion.sum()
+        probabilidad_ruina += distribucion @ cadena['a_ruina']
+        probabilidad_meta += distribucion @ cadena['a_meta']
+        distribucion = traspuesta @ distribucion
+    return {'probabilidad_ruina': float(probabilidad_ruina), 'probabilidad_meta': float(probabilidad_meta),
+            'duracion_esperada': float(duracion), 'estados': cantidad_estados}
+
+
+def comparar_con_monte_carlo(estrategia, criterio, apuesta_inicial, capital, horizonte, cantidad_corridas,
+                             semilla=None):
+    """
+    Contrasta la solución de la cadena con el motor vectorizado de simulación.
+
+    Parámetros:
+        estrategia (str): 'm', 'p', 'd' o 'f'.
+        criterio (list): Números que hacen ganar la apuesta.
+        apuesta_inicial (float): Apuesta con la que comienza cada corrida.
+        capital (float): Capital inicial.
+        horizonte (int): Cantidad de tiradas por corrida.
+        cantidad_corridas (int): Corridas de la simulación.
+        semilla (int, opcional): Semilla raíz de la simulación.
+
+    Retorna:
+        dict: Para 'analitico' y 'monte_carlo', la probabilidad de ruina y la duración esperada;
+        además 'error_estandar' de la probabilidad de ruina simulada.
+    """
+    analitico = resolver_ruina(estrategia, criterio, apuesta_inicial, capital, horizonte=horizonte)
+    salida = simular_estrategia(estrategia, criterio, apuesta_inicial, horizonte, cantidad_corridas,
+                                generador_numpy(secuencia_raiz(semilla)), capital)
+    quebradas = salida['tiradas_ruina'] >= 0
+    probabilidad = float(quebradas.mean())
+    return {
+        'analitico': {'probabilidad_ruina': analitico['probabilidad_ruina'],
+                      'duracion_esperada': analitico['duracion_esperada']},
+        'monte_carlo': {'probabilidad_ruina': probabilidad,
+                        'duracion_esperada': float(np.where(quebradas, salida['tiradas_ruina'], horizonte).mean())},
+        'error_estandar': (probabilidad * (1 - probabilidad) / cantidad_corridas) ** 0.5,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Probabilidad de bancarrota con una cadena de Markov')
+    parser.add_argument('-s', '--estrategia', type=str, default='m', choices=['m', 'd', 'f', 'p'],
+                        help='Estrategia de apuesta (por defecto: m)')
+    parser.add_argument('-a', '--capital', type=float, required=True, help='Capital inicial')
+    parser.add_argument('--apuesta', type=float, default=1, help='Apuesta inicial (por defecto: 1)')
+    parser.add_argument('-n', '--numero_tiradas', type=int, default=None,
+                        help='Cantidad máxima de tiradas (por defecto: sin límite, requiere --meta)')
+    parser.add_argument('--meta', type=float, default=None,
+                        help='Capital con el que el jugador se retira (por defecto: no se retira)')
+    parser.add_argument('--ganadores', type=int, default=18,
+                        help='Cantidad de números que hacen ganar la apuesta (por defecto: 18)')
+    parser.add_argument('--corridas', type=int, default=0,
+                        help='Corridas de Monte Carlo para contrastar el resultado; requiere -n (por defecto: 0)')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Semilla raíz de la simulación de contraste (por defecto: aleatoria)')
+    args = parser.parse_args(argv)
+
+    try:
+        if not 1 <= args.ganadores <= 36:
+            raise ValueError("--ganadores debe estar entre 1 y 36")
+        if args.numero_tiradas is None and args.meta is None:
+            raise ValueError("Se requiere -n o --meta")
+        if args.corridas and (args.numero_tiradas is None or args.meta is not None):
+            raise ValueError("El contraste con Monte Carlo requiere -n y no admite --meta")
+    except ValueError as ve:
+        print("Error en los argumentos de entrada:", ve)
+        return
+    criterio = list(range(1, args.ganadores + 1))
+
+    # La importación de scipy (cientos de ms) queda fuera del tiempo de resolución
+    sparse_linalg.splu
+    inicio = time.perf_counter()
+    try:
+        resultado = resolver_ruina(args.estrategia, criterio, args.apuesta, args.capital, args.meta,
+                                   args.numero_tiradas)
+    except ValueError as ve:
+        print("Error al resolver la cadena:", ve)
+        return
+    segundos = time.perf_counter() - inicio
+    print(f"estados transitorios: {resultado['estados']:,}  ({segundos * 1e3:.1f} ms)")
+    print('probabilidad de bancarrota: ', resultado['probabilidad_ruina'])
+    if args.meta is not None:
+        print('probabilidad de alcanzar la meta: ', resultado['probabilidad_meta'])
+    print('tiradas esperadas: ', resultado['duracion_esperada'])
+
+    if args.corridas:
+        comparacion = comparar_con_monte_carlo(args.estrategia, criterio, args.apuesta, args.capital,
+                                               args.numero_tiradas, args.corridas, args.seed)
+        simulado = comparacion['monte_carlo']
+        print(f"Monte Carlo ({args.corridas:,} corridas): probabilidad de bancarrota "
+              f"{simulado['probabilidad_ruina']} ± {comparacion['error_estandar']:.4f}, "
+              f"tiradas esperadas {simulado['duracion_esperada']}")
+        resultado['monte_carlo'] = simulado
+    return resultado
+
+
+if __name__ == "__main__":
+    main()
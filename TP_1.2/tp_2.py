@@ -1,23 +1,28 @@
 import argparse
-import random
-import matplotlib.pyplot as plt
-import numpy as np
-
-num_fibo = [0, 1]
-
-
-def fibonacci(n):
-    if n == 0 or n == 1:
-        return num_fibo[n]
-    for i in range(2, n + 1):
-        num_fibo.append(num_fibo[i - 1] + num_fibo[i - 2])
-    return num_fibo[n]
-
-
-def fibonacci_estrategia(numero_elegido, numero_resultado, monto_apostar):
-    if numero_elegido != numero_resultado:
-        return fibonacci(monto_apostar + 1)
-    return monto_apostar
+import os
+import sys
+from functools import partial
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from comun.perezoso import ModuloPerezoso
+from comun.resultados import Resultados
+from comun.graficos import configurar_salida, graficar_corridas, mostrar_o_guardar, obtener_figura
+from comun.paralelo import iterar_corridas
+from comun.semillas import generador_numpy, secuencia_raiz, secuencias_hijas
+from estrategias import reservar_historia, simular_estrategia
+from progresion import PASO_INICIAL, siguiente_paso, termino
+
+np = ModuloPerezoso('numpy')
+
+# Números que hacen ganar cada apuesta simple
+CRITERIOS = {
+    'rojo': [1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36],
+    'negro': [2, 4, 6, 8, 10, 11, 13, 15, 17, 20, 22, 24, 26, 28, 29, 31, 33, 35],
+    'par': [x for x in range(37) if x % 2 == 0],
+    'impar': [x for x in range(37) if x % 2 != 0],
+    'alto': [x for x in range(19, 37)],
+    'bajo': [x for x in range(1, 19)],
+}
 
 def martingala(criterio, numero_resultado, monto_apostar):
     if numero_resultado in criterio:
@@ -37,15 +42,17 @@ def d_alembert(criterio, numero_resultado, monto_apostar):
     return monto_apostar + 1
 
 
-def fibonacci_estrategia(criterio, numero_resultado, monto_apostar):
+def fibonacci_estrategia(criterio, numero_resultado, paso):
+    # Recibe y devuelve el paso de la progresión; la apuesta es apuesta_inicial * termino(paso)
     if numero_resultado not in criterio:
-        return fibonacci(monto_apostar + 1)
-    return monto_apostar
+        return siguiente_paso(paso)
+    return paso
 
 
 
 class Ruleta:
-    def __init__(self, _cantidad_tiradas, _cantidad_corridas, _estrategia, _tipo_capital, _criterio=[], _apuesta_inicial=1):
+    def __init__(self, _cantidad_tiradas, _cantidad_corridas, _estrategia, _tipo_capital, _criterio=[], _apuesta_inicial=1, _workers=1,
+                 _semilla=None, _vectorizado=False, _historia=True):
         """
         Inicializa una instancia de la clase Ruleta.
 
@@ -53,67 +60,173 @@ class Ruleta:
             _cantidad_tiradas (int): Cantidad de tiradas por corrida.
             _cantidad_corridas (int): Cantidad de corridas a simular.
             _estrategia (str): Estrategia que se utilizará en la simulación.
-            _tipo_capital (str): Tipo de capital que se utilizará en la simulación.
+            _tipo_capital (str): Capital inicial de cada corrida; None para capital infinito.
             _criterio (int, opcional): Criterio que determina cuándo termina una corrida (por ejemplo, una cantidad mínima de capital).
             _apuesta_inicial (int, opcional): La cantidad de apuesta inicial con la que se comenzará en cada corrida.
+            _workers (int, opcional): Cantidad de procesos entre los que se reparten las corridas.
+            _semilla (int, opcional): Semilla raíz; con la misma semilla los resultados son
+                idénticos sin importar la cantidad de workers.
+            _vectorizado (bool, opcional): Si es True avanza todas las corridas juntas con NumPy.
+            _historia (bool | str, opcional): True guarda en memoria la apuesta y el capital de cada
+                tirada; un directorio los escribe ahí mapeados en disco (ver reservar_historia); False
+                solo conserva la tirada de ruina y el capital final de cada corrida. Los gráficos
+                de cada tirada necesitan la historia, por eso está activada por defecto.
         """
         self.cantidad_tiradas = _cantidad_tiradas
         self.cantidad_corridas = _cantidad_corridas
         self.estrategia = _estrategia
-        self.tipo_capital = _tipo_capital
+        self.tipo_capital = float(_tipo_capital) if _tipo_capital is not None else None
         self.criterio = _criterio
+        self.apuesta_inicial = _apuesta_inicial
         self.monto_apostar = _apuesta_inicial
+        self.workers = _workers
+        self.semilla = _semilla
+        self.vectorizado = _vectorizado
+        self.historia = _historia
         self.bancas_rotas = 0
         self.ganadas_mg = 0
+        self.capitales = []
+        self.tiradas_ruina = []
+        self.capitales_finales = []
         try:
             self.resultados = self._simular_corridas()
         except Exception as e:
             print("Error al simular las corridas:", e)
 
 
-    def simular_corrida(self):
+    def simular_corrida(self, rng=None):
         """
-        Simula una corrida de la ruleta y calcula las medidas estadísticas.
+        Simula una corrida de la ruleta llevando la apuesta y el capital de la corrida.
+
+        En cada tirada la apuesta se cobra (pago 1 a 1) o se pierde. Con capital finito,
+        la corrida quiebra cuando la próxima apuesta supera el capital disponible, y las
+        tiradas restantes no se simulan. El estado de la corrida es local, así que las
+        corridas no se afectan entre sí.
+
+        Parámetros:
+            rng (np.random.Generator, opcional): Generador de la corrida (por defecto: uno nuevo sin semilla).
+
+        Retorna:
+            tuple: Apuesta tras cada tirada, capital tras cada tirada, cantidad de tiradas
+            jugadas antes de quebrar (-1 si no quebró) y apuesta final. Después de quebrar
+            la apuesta es 0 y el capital queda fijo.
         """
-        resultados_corrida = []
+        if rng is None:
+            rng = np.random.default_rng()
+        finito = self.tipo_capital is not None
+        capital = self.tipo_capital if finito else 0.0
+        monto_apostar = float(self.apuesta_inicial)
+        paso_fibonacci = PASO_INICIAL
+        apuestas = []
+        capitales = []
+        tirada_ruina = -1
         try:
-            resultados = [random.randint(0, 36) for _ in range(self.cantidad_tiradas)]
-
-            for tirada in resultados:
+            if finito and monto_apostar > capital:
+                # No alcanza para cubrir la primera apuesta
+                tirada_ruina = 0
+                resultados = []
+            else:
+                resultados = rng.integers(0, 37, size=self.cantidad_tiradas).tolist()
+
+            for numero_tirada, tirada in enumerate(resultados):
+                if tirada in self.criterio:
+                    capital += monto_apostar
+                else:
+                    capital -= monto_apostar
 
                 if self.estrategia == 'm':
-                    self.monto_apostar = martingala(self.criterio, tirada, self.monto_apostar)
+                    monto_apostar = martingala(self.criterio, tirada, monto_apostar)
 
                 if self.estrategia == 'd':
-                    self.monto_apostar = d_alembert(self.criterio, tirada, self.monto_apostar)
+                    monto_apostar = d_alembert(self.criterio, tirada, monto_apostar)
 
                 if self.estrategia == 'p':
-                    self.monto_apostar = paroli(self.criterio, tirada, self.monto_apostar)
+                    monto_apostar = paroli(self.criterio, tirada, monto_apostar)
 
                 if self.estrategia == 'f':
-                    self.monto_apostar = fibonacci_estrategia(self.criterio, tirada, self.monto_apostar)
+                    paso_fibonacci = fibonacci_estrategia(self.criterio, tirada, paso_fibonacci)
+                    monto_apostar = self.apuesta_inicial * termino(paso_fibonacci)
 
-                if self.tipo_capital is not None:
-                    self.tipo_capital = float(self.tipo_capital)
-                    if self.monto_apostar > self.tipo_capital:
-                        self.bancas_rotas = self.bancas_rotas + 1
-                resultados_corrida.append(self.monto_apostar)
+                apuestas.append(monto_apostar)
+                capitales.append(capital)
+                if finito and monto_apostar > capital:
+                    tirada_ruina = numero_tirada + 1
+                    break
 
         except IndexError as e:
             print("Error al simular las corridas:", e)
 
-        return resultados_corrida
-
-
+        restantes = self.cantidad_tiradas - len(apuestas)
+        apuestas.extend([0.0] * restantes)
+        capitales.extend([capital] * restantes)
+        return apuestas, capitales, tirada_ruina, monto_apostar
 
     def _simular_corridas(self):
         """
         Realiza todas las corridas de la simulación.
 
+        También guarda el capital tras cada tirada, la tirada de ruina y el capital
+        final de cada corrida, y la cantidad de corridas que quebraron.
+
         Retorna:
-            list: Lista de resultados de cada corrida.
+            np.ndarray: Matriz (corridas, tiradas) con la apuesta tras cada tirada.
+        """
+        if self.vectorizado:
+            return self._simular_corridas_lote()
+        secuencias = secuencias_hijas(self.cantidad_corridas, self.semilla)
+        resultados, self.capitales = reservar_historia(self.historia, len(secuencias), self.cantidad_tiradas)
+        self.tiradas_ruina = np.empty(len(secuencias), dtype=np.int64)
+        self.capitales_finales = np.empty(len(secuencias))
+        # Cada corrida se vuelca a su fila apenas termina, sin juntar antes las de todas
+        salidas = iterar_corridas(partial(_simular_corrida_con_semilla, self), secuencias, self.workers)
+        for fila, (apuestas, capitales, tirada_ruina, monto_apostar, capital_final) in enumerate(salidas):
+            if resultados is not None:
+                resultados[fila] = apuestas
+                self.capitales[fila] = capitales
+            self.tiradas_ruina[fila] = tirada_ruina
+            self.capitales_finales[fila] = capital_final
+            self.monto_apostar = monto_apostar
+        self.bancas_rotas = int(np.count_nonzero(self.tiradas_ruina >= 0))
+        return resultados
+
+    def _simular_corridas_lote(self):
         """
-        return [self.simular_corrida() for _ in range(self.cantidad_corridas)]
+        Simula todas las corridas juntas con el motor vectorizado de estrategias.
+
+        Las tiradas de todas las corridas salen de un único generador derivado de la
+        semilla raíz, así que no coinciden con las del modo corrida por corrida.
+
+        Retorna:
+            np.ndarray: Matriz (corridas, tiradas) con la apuesta tras cada tirada.
+        """
+        salida = simular_estrategia(self.estrategia, self.criterio, self.apuesta_inicial, self.cantidad_tiradas,
+                                    self.cantidad_corridas, generador_numpy(secuencia_raiz(self.semilla)),
+                                    self.tipo_capital, self.historia)
+        self.capitales = salida['capitales']
+        self.tiradas_ruina = salida['tiradas_ruina']
+        self.capitales_finales = salida['capitales_finales']
+        self.bancas_rotas = int(np.count_nonzero(self.tiradas_ruina >= 0))
+        if len(salida['apuestas_finales']):
+            self.monto_apostar = salida['apuestas_finales'][-1]
+        return salida['apuestas']
+
+    def a_resultados(self):
+        """
+        Reúne los resultados de la simulación en un contenedor columnar.
+
+        Retorna:
+            Resultados: Columnas 'apuestas' y 'capitales' (corridas, tiradas) si se guardó la
+            historia, 'tiradas_ruina' y 'capitales_finales' (una por corrida), con los parámetros
+            como metadatos.
+        """
+        columnas = {'tiradas_ruina': self.tiradas_ruina, 'capitales_finales': self.capitales_finales}
+        if self.resultados is not None:
+            columnas.update(apuestas=self.resultados, capitales=self.capitales)
+        return Resultados(
+            columnas,
+            {'estrategia': self.estrategia, 'criterio': list(self.criterio), 'capital': self.tipo_capital,
+             'apuesta_inicial': float(self.apuesta_inicial), 'cantidad_tiradas': self.cantidad_tiradas,
+             'cantidad_corridas': self.cantidad_corridas, 'semilla': self.semilla})
 
     def graficar_frecuencia_relativa(self):
         """
@@ -158,144 +271,193 @@ class Ruleta:
         Parámetros:
             ylabel (str): Etiqueta del eje y.
         """
-        plt.figure(figsize=(20, 10))
+        fig, ax = obtener_figura(ylabel, figsize=(20, 10))
         labels = {'Frecuencia Relativa': 0, 'Promedio': 1, 'Varianza': 2, 'Desvío': 3}
         index = labels[ylabel]
-        for i, corrida in enumerate(self.resultados, start=1):
-            data = corrida[index]
-            plt.plot(range(self.cantidad_tiradas), data, label=f'Corrida {i}')
-        plt.xlabel('Cantidad de tiradas')
-        plt.ylabel(ylabel)
-        plt.title(ylabel)
-        plt.legend(loc='upper center', bbox_to_anchor=(0.5, -0.2), ncol=len(self.resultados), fancybox=True,
-                   shadow=True)
-        plt.grid(True)
-        plt.show()
-
-
-parser = argparse.ArgumentParser(description='Simulación de ruleta')
-parser.add_argument('-c', '--numero_corridas', type=int, default=3, help='Número de corridas (por defecto: 5)')
-parser.add_argument('-n', '--numero_tiradas', type=int, default=10, help='Número de tiradas (por defecto: 100)')
-parser.add_argument('-s', '--estrategia', type=str, default='m',
-                    help='Ingrese la estrategia que va a usar (por defecto: m)')
-parser.add_argument('-a', '--capital', type=str, default=None,
-                    help='Ingrese la capital que va a usar (por defecto: es infinito)')
-parser.add_argument('--apuesta', type=float, default=1, help='Ingrese la capital que va a apostar (por defecto: 1)')
-parser.add_argument('--color', type=str, choices=['rojo', 'negro'], help='Elija el color (rojo o negro)')
-parser.add_argument('--paridad', type=str, choices=['par', 'impar'], help='Elija la paridad (par o impar)')
-parser.add_argument('--alto_bajo', type=str, choices=['alto', 'bajo'], help='Elija si alto (19-36) o bajo (1-18)')
-
-args = parser.parse_args()
-cantidad_corridas = args.numero_corridas
-cantidad_tiradas = args.numero_tiradas
-estrategia = args.estrategia
-tipo_capital = args.capital
-color = args.color
-paridad = args.paridad
-alto_bajo = args.alto_bajo
-apuesta_minimo = args.apuesta
-try:
-    if not color and not paridad and not alto_bajo:
-        raise ValueError("Se requiere definir criterio de apuesta: color O paridad O alto_bajo")
-
-    if color and color not in ['rojo', 'negro']:
-        raise ValueError("--color debe ser rojo o negro")
-    if paridad and paridad not in ['par', 'impar']:
-        raise ValueError("--paridad debe ser par o impar")
-
-    if alto_bajo and alto_bajo not in ['alto', 'bajo']:
-        raise ValueError("--alto_bajo debe ser alto o bajo")
-
-    if cantidad_corridas < 0:
-        raise ValueError("-c debe ser un entero positivo")
-    if cantidad_tiradas < 0:
-        raise ValueError("-n debe ser un entero positivo")
-
-    if estrategia not in ['m', 'd', 'f', 'p']:
-        raise ValueError("-s debe ser m, d, f, u p")
-
-    if (color and paridad) or (color and alto_bajo) or (paridad and alto_bajo):
-        raise ValueError("Solo puede elegir una opción entre color, paridad, y alto/bajo")
-    criterio = []
-    if color:
-        if color == 'rojo':
-            criterio = [1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36]
-        else:
-            criterio = [2, 4, 6, 8, 10, 11, 13, 15, 17, 20, 22, 24, 26, 28, 29, 31, 33, 35]
-
-    if paridad:
-        if paridad == 'par':
-            criterio = [x for x in range(37) if x % 2 == 0]
-        else:
-            criterio = [x for x in range(37) if x % 2 != 0]
-
-    if alto_bajo:
-        if alto_bajo == 'alto':
-            criterio = [x for x in range(19, 37)]
-        else:
-            criterio = [x for x in range(1, 19)]
-
-except ValueError as ve:
-    print("Error en los argumentos de entrada:", ve)
-    exit()
-print(apuesta_minimo, 'minimo')
-ruleta = Ruleta(_cantidad_tiradas=cantidad_tiradas, _cantidad_corridas=cantidad_corridas, _estrategia=estrategia,
-                 _tipo_capital=tipo_capital, _criterio=criterio, _apuesta_inicial=apuesta_minimo)
-
-if tipo_capital:
-    print('num bancarotas: ',ruleta.bancas_rotas)
-print('ultima apuesta: ',ruleta.monto_apostar)
-resultados_todas_corridas = ruleta.resultados
-dinero_por_tirada_todas_corridas = []
-
-# Recorrer cada corrida
-for corrida in resultados_todas_corridas:
-    dinero_acumulado = 0  # Inicializar el dinero acumulado en cada corrida
-    dinero_por_tirada_corrida = []  # Inicializar una lista para almacenar la evolución del dinero en la corrida actual
-
-    # Recorrer cada tirada de la corrida actual
-    for monto_apuesta in corrida:
-        dinero_acumulado -= monto_apuesta  # Restar el monto apostado al dinero acumulado
-        dinero_por_tirada_corrida.append(dinero_acumulado)  # Agregar el dinero acumulado en esta tirada a la lista
-
-    dinero_por_tirada_todas_corridas.append(
-        dinero_por_tirada_corrida)  # Agregar la lista de dinero por tirada de la corrida a la lista de todas las corridas
-
-# Graficar la evolución del dinero en cada tirada de todas las corridas
-plt.figure(figsize=(10, 6))
-for i, corrida in enumerate(dinero_por_tirada_todas_corridas, start=1):
-    plt.plot(range(1, len(corrida) + 1), corrida, label=f'Corrida {i}')
-plt.title('Evolución del dinero en todas las corridas')
-plt.xlabel('Número de tiradas')
-plt.ylabel('Dinero disponible')
-plt.grid(True)
-plt.legend()
-plt.show()
-
-
-
-montos_apostados = [monto for corrida in resultados_todas_corridas for monto in corrida]
-
-# Graficar el histograma de frecuencias de los montos apostados
-plt.figure(figsize=(10, 6))
-plt.hist(montos_apostados, bins=20, color='skyblue', edgecolor='black', alpha=0.7)
-plt.title('Histograma de frecuencias de montos apostados en todas las corridas')
-plt.xlabel('Monto apostado')
-plt.ylabel('Frecuencia')
-plt.grid(True)
-plt.show()
-
-plt.figure(figsize=(10, 6))
-for i, corrida in enumerate(resultados_todas_corridas, start=1):
-    dinero_por_tirada = []
-    dinero_acumulado = ruleta.tipo_capital if ruleta.tipo_capital else 0
-    for monto_apuesta in corrida:
-        dinero_acumulado -= monto_apuesta
-        dinero_por_tirada.append(dinero_acumulado)
-    plt.plot(range(1, len(dinero_por_tirada) + 1), dinero_por_tirada, label=f'Corrida {i}')
-plt.title('Evolución del dinero en cada corrida')
-plt.xlabel('Número de tiradas')
-plt.ylabel('Dinero disponible')
-plt.legend()
-plt.grid(True)
-plt.show()
+        graficar_corridas(ax, range(self.cantidad_tiradas), [corrida[index] for corrida in self.resultados])
+        ax.set_xlabel('Cantidad de tiradas')
+        ax.set_ylabel(ylabel)
+        ax.set_title(ylabel)
+        ax.grid(True)
+        mostrar_o_guardar(fig, f'{ylabel}.png')
+
+
+def _simular_corrida_con_semilla(ruleta, secuencia):
+    """
+    Simula una corrida con su propio generador; puede ejecutarse en los procesos del pool.
+
+    Parámetros:
+        ruleta (Ruleta): Instancia con los parámetros de la simulación.
+        secuencia (np.random.SeedSequence): Secuencia de semillas de la corrida.
+
+    Retorna:
+        tuple: Lo mismo que Ruleta.simular_corrida más el capital final. Las apuestas y los
+        capitales van como arreglos float64 (más compactos que las listas para devolverlos
+        desde el pool), o None si la ruleta no guarda la historia.
+    """
+    apuestas, capitales, tirada_ruina, monto_apostar = ruleta.simular_corrida(generador_numpy(secuencia))
+    capital_final = capitales[-1] if capitales else (ruleta.tipo_capital or 0.0)
+    if not ruleta.historia:
+        return None, None, tirada_ruina, monto_apostar, capital_final
+    return (np.array(apuestas, dtype=np.float64), np.array(capitales, dtype=np.float64), tirada_ruina,
+            monto_apostar, capital_final)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Simulación de ruleta')
+    parser.add_argument('-c', '--numero_corridas', type=int, default=3, help='Número de corridas (por defecto: 5)')
+    parser.add_argument('-n', '--numero_tiradas', type=int, default=10, help='Número de tiradas (por defecto: 100)')
+    parser.add_argument('-s', '--estrategia', type=str, default='m',
+                        help='Ingrese la estrategia que va a usar (por defecto: m)')
+    parser.add_argument('-a', '--capital', type=str, default=None,
+                        help='Ingrese la capital que va a usar (por defecto: es infinito)')
+    parser.add_argument('--apuesta', type=float, default=1, help='Ingrese la capital que va a apostar (por defecto: 1)')
+    parser.add_argument('--color', type=str, choices=['rojo', 'negro'], help='Elija el color (rojo o negro)')
+    parser.add_argument('--paridad', type=str, choices=['par', 'impar'], help='Elija la paridad (par o impar)')
+    parser.add_argument('--alto_bajo', type=str, choices=['alto', 'bajo'], help='Elija si alto (19-36) o bajo (1-18)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Cantidad de procesos para repartir las corridas (por defecto: 1)')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Semilla raíz para reproducir la simulación (por defecto: aleatoria)')
+    parser.add_argument('--vectorizado', action='store_true',
+                        help='Avanza todas las corridas juntas con NumPy (por defecto: desactivado)')
+    parser.add_argument('--bandas', action='store_true',
+                        help='Grafica bandas de percentiles en lugar de cada corrida (por defecto: desactivado)')
+    parser.add_argument('--guardar', type=str, default=None,
+                        help='Guarda los resultados en este directorio (columnas .npy) o archivo .npz comprimido')
+    parser.add_argument('--historia', type=str, default=None,
+                        help='Escribe la apuesta y el capital de cada tirada en este directorio, mapeados en '
+                             'disco, en lugar de tenerlos en memoria (por defecto: en memoria)')
+    parser.add_argument('--analitico', action='store_true',
+                        help='Calcula la probabilidad de bancarrota con una cadena de Markov, sin simular; '
+                             'requiere -a (por defecto: desactivado)')
+    parser.add_argument('--output-dir', type=str, default=None,
+                        help='Guarda los gráficos en este directorio sin abrir ventanas (por defecto: se muestran)')
+
+    args = parser.parse_args(argv)
+    cantidad_corridas = args.numero_corridas
+    cantidad_tiradas = args.numero_tiradas
+    estrategia = args.estrategia
+    tipo_capital = args.capital
+    color = args.color
+    paridad = args.paridad
+    alto_bajo = args.alto_bajo
+    apuesta_minimo = args.apuesta
+    try:
+        if not color and not paridad and not alto_bajo:
+            raise ValueError("Se requiere definir criterio de apuesta: color O paridad O alto_bajo")
+
+        if color and color not in ['rojo', 'negro']:
+            raise ValueError("--color debe ser rojo o negro")
+        if paridad and paridad not in ['par', 'impar']:
+            raise ValueError("--paridad debe ser par o impar")
+
+        if alto_bajo and alto_bajo not in ['alto', 'bajo']:
+            raise ValueError("--alto_bajo debe ser alto o bajo")
+
+        if cantidad_corridas < 0:
+            raise ValueError("-c debe ser un entero positivo")
+        if cantidad_tiradas < 0:
+            raise ValueError("-n debe ser un entero positivo")
+        if args.workers < 1:
+            raise ValueError("--workers debe ser un entero positivo")
+        if tipo_capital is not None:
+            try:
+                float(tipo_capital)
+            except ValueError:
+                raise ValueError("-a debe ser un número") from None
+
+        if estrategia not in ['m', 'd', 'f', 'p']:
+            raise ValueError("-s debe ser m, d, f, u p")
+        if args.analitico and tipo_capital is None:
+            raise ValueError("--analitico requiere un capital finito (-a)")
+
+        if (color and paridad) or (color and alto_bajo) or (paridad and alto_bajo):
+            raise ValueError("Solo puede elegir una opción entre color, paridad, y alto/bajo")
+        criterio = CRITERIOS[color or paridad or alto_bajo]
+
+    except ValueError as ve:
+        print("Error en los argumentos de entrada:", ve)
+        return
+    print(apuesta_minimo, 'minimo')
+    if args.analitico:
+        # Importación local: ruina.py usa las reglas de las estrategias definidas en este módulo
+        from ruina import resolver_ruina
+        try:
+            resultado = resolver_ruina(estrategia, criterio, apuesta_minimo, float(tipo_capital),
+                                       horizonte=cantidad_tiradas)
+        except ValueError as ve:
+            # Acá el horizonte es -n y no hay meta: ruina.py --meta resuelve la cadena con una
+            print("Error al resolver la cadena:", ve, "(el horizonte es -n; para fijar una meta use ruina.py --meta)")
+            return
+        print('probabilidad de bancarrota: ', resultado['probabilidad_ruina'])
+        print('tiradas esperadas: ', resultado['duracion_esperada'])
+        return resultado
+    ruleta = Ruleta(_cantidad_tiradas=cantidad_tiradas, _cantidad_corridas=cantidad_corridas, _estrategia=estrategia,
+                     _tipo_capital=tipo_capital, _criterio=criterio, _apuesta_inicial=apuesta_minimo,
+                     _workers=args.workers, _semilla=args.seed,
+                     _vectorizado=args.vectorizado, _historia=args.historia or True)
+
+    if tipo_capital:
+        print('num bancarotas: ',ruleta.bancas_rotas)
+        if ruleta.bancas_rotas:
+            tiradas_ruina = ruleta.tiradas_ruina[ruleta.tiradas_ruina >= 0]
+            print('tiradas hasta la bancarrota (media, mediana): ', tiradas_ruina.mean(), np.median(tiradas_ruina))
+    print('ultima apuesta: ',ruleta.monto_apostar)
+    if len(ruleta.capitales_finales):
+        print('capital final (media, mediana): ', ruleta.capitales_finales.mean(), np.median(ruleta.capitales_finales))
+    if args.guardar:
+        print('resultados guardados en: ', ruleta.a_resultados().guardar(args.guardar))
+    configurar_salida(args.output_dir)
+    montos = ruleta.resultados
+    capitales = ruleta.capitales
+    tiradas = np.arange(1, montos.shape[1] + 1)
+
+    # Ganancia acumulada tras cada tirada de todas las corridas, respecto del capital inicial
+    dinero_inicial = ruleta.tipo_capital if ruleta.tipo_capital else 0
+    fig, ax = obtener_figura('dinero_todas_corridas', figsize=(10, 6))
+    graficar_corridas(ax, tiradas, capitales, args.bandas, desplazamiento=-dinero_inicial)
+    ax.set_title('Evolución del dinero en todas las corridas')
+    ax.set_xlabel('Número de tiradas')
+    ax.set_ylabel('Ganancia acumulada')
+    ax.grid(True)
+    mostrar_o_guardar(fig, 'dinero_todas_corridas.png')
+
+    # Graficar el histograma de frecuencias de los montos apostados
+    fig, ax = obtener_figura('histograma_montos', figsize=(10, 6))
+    ax.hist(montos.ravel(order='K'), bins=20, color='skyblue', edgecolor='black', alpha=0.7)
+    ax.set_title('Histograma de frecuencias de montos apostados en todas las corridas')
+    ax.set_xlabel('Monto apostado')
+    ax.set_ylabel('Frecuencia')
+    ax.grid(True)
+    mostrar_o_guardar(fig, 'histograma_montos.png')
+
+    fig, ax = obtener_figura('dinero_por_corrida', figsize=(10, 6))
+    graficar_corridas(ax, tiradas, capitales, args.bandas)
+    ax.set_title('Evolución del dinero en cada corrida')
+    ax.set_xlabel('Número de tiradas')
+    ax.set_ylabel('Dinero disponible')
+    ax.grid(True)
+    mostrar_o_guardar(fig, 'dinero_por_corrida.png')
+
+    fig, ax = obtener_figura('capital_final', figsize=(10, 6))
+    ax.hist(ruleta.capitales_finales, bins=20, color='skyblue', edgecolor='black', alpha=0.7)
+    ax.set_title('Distribución del capital final de las corridas')
+    ax.set_xlabel('Capital final')
+    ax.set_ylabel('Frecuencia')
+    ax.grid(True)
+    mostrar_o_guardar(fig, 'capital_final.png')
+
+    if ruleta.bancas_rotas:
+        fig, ax = obtener_figura('tiradas_hasta_bancarrota', figsize=(10, 6))
+        ax.hist(ruleta.tiradas_ruina[ruleta.tiradas_ruina >= 0], bins=20, color='salmon', edgecolor='black', alpha=0.7)
+        ax.set_title('Distribución de la cantidad de tiradas hasta la bancarrota')
+        ax.set_xlabel('Tiradas jugadas')
+        ax.set_ylabel('Frecuencia')
+        ax.grid(True)
+        mostrar_o_guardar(fig, 'tiradas_hasta_bancarrota.png')
+    return ruleta
+
+
+if __name__ == "__main__":
+    main()
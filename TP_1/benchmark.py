@@ -0,0 +1,58 @@
+"""
+Benchmarks de rendimiento de la simulación de ruleta.
+
+Uso:
+    python3 benchmark.py
+"""
+import time
+
+import numpy as np
+
+from tp_1 import Ruleta
+
+
+def benchmark_corrida(cantidad_tiradas=1_000_000, numero_elegido=0):
+    """
+    Mide el tiempo de una corrida larga de Ruleta.simular_corrida.
+
+    Parámetros:
+        cantidad_tiradas (int): Cantidad de tiradas de la corrida.
+        numero_elegido (int): Número elegido en la ruleta.
+
+    Retorna:
+        float: Segundos transcurridos.
+    """
+    ruleta = Ruleta(numero_elegido, cantidad_tiradas, 0)
+    inicio = time.perf_counter()
+    ruleta.simular_corrida(np.random.default_rng(0))
+    return time.perf_counter() - inicio
+
+
+def benchmark_lote(cantidad_corridas=1000, cantidad_tiradas=10_000, numero_elegido=0):
+    """
+    Mide el tiempo de simular muchas corridas juntas con el modo vectorizado.
+
+    Parámetros:
+        cantidad_corridas (int): Cantidad de corridas.
+        cantidad_tiradas (int): Cantidad de tiradas por corrida.
+        numero_elegido (int): Número elegido en la ruleta.
+
+    Retorna:
+        float: Segundos transcurridos.
+    """
+    inicio = time.perf_counter()
+    Ruleta(numero_elegido, cantidad_tiradas, cantidad_corridas, _vectorizado=True, _semilla=0)
+    return time.perf_counter() - inicio
+
+
+def main():
+    for cantidad_tiradas in (10_000, 100_000, 1_000_000):
+        segundos = benchmark_corrida(cantidad_tiradas)
+        print(f"simular_corrida  n={cantidad_tiradas:>10,}  {segundos:8.3f} s")
+    for cantidad_corridas in (100, 1000):
+        segundos = benchmark_lote(cantidad_corridas)
+        print(f"lote vectorizado c={cantidad_corridas:>9,}  n=10,000  {segundos:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import math
+
+
+def series_acumuladas(tiradas, numero_elegido, previas=(0, 0, 0, 0)):
+    """
+    Calcula las series de todas las corridas a la vez con sumas acumuladas.
+
+    Reemplaza a la actualización de Welford tirada a tirada: las tiradas son enteras,
+    así que las sumas acumuladas y las de cuadrados son exactas en float64 (hasta 2^53),
+    y con valores entre 0 y 36 la varianza E[x^2] - E[x]^2 no pierde precisión apreciable.
+
+    Parámetros:
+        tiradas (np.ndarray): Matriz de enteros de forma (corridas, tiradas), o un
+            vector con las tiradas de una sola corrida.
+        numero_elegido (int): Número cuya frecuencia relativa se sigue.
+        previas (tuple, opcional): Cantidad de tiradas, apariciones, suma y suma de
+            cuadrados de las tiradas anteriores, para continuar una corrida por bloques.
+
+    Retorna:
+        np.ndarray: Bloque de forma (4,) + tiradas.shape con la frecuencia
+        relativa, el promedio, la varianza y el desvío; se puede desempaquetar
+        en cuatro matrices.
+    """
+    import numpy as np
+
+    tiradas = np.asarray(tiradas)
+    cantidad_previa, apariciones, suma, suma_cuadrados = previas
+    bloque = np.empty((4,) + tiradas.shape)
+    frecuencias, promedios, varianzas, desvios = bloque
+    cantidad = np.arange(cantidad_previa + 1, cantidad_previa + tiradas.shape[-1] + 1, dtype=np.float64)
+
+    np.cumsum(tiradas == numero_elegido, axis=-1, dtype=np.float64, out=frecuencias)
+    frecuencias += apariciones
+    frecuencias /= cantidad
+    np.cumsum(tiradas, axis=-1, dtype=np.float64, out=promedios)
+    promedios += suma
+    promedios /= cantidad
+    # Varianza poblacional como E[x^2] - E[x]^2; las sumas son enteras y exactas
+    np.cumsum(np.square(tiradas, dtype=np.float64), axis=-1, out=varianzas)
+    varianzas += suma_cuadrados
+    varianzas /= cantidad
+    varianzas -= np.square(promedios)
+    np.maximum(varianzas, 0.0, out=varianzas)
+    np.sqrt(varianzas, out=desvios)
+    return bloque
+
+
+class SeriesPorBloques:
+    """
+    Calcula las series de una corrida bloque a bloque.
+
+    Arrastra las sumas enteras de los bloques anteriores, así la memoria usada
+    depende del tamaño del bloque y no de la cantidad total de tiradas, y las
+    medidas finales se obtienen en forma exacta.
+    """
+
+    def __init__(self, numero_elegido):
+        """
+        Inicializa el acumulador vacío.
+
+        Parámetros:
+            numero_elegido (int): Número cuya frecuencia relativa se sigue.
+        """
+        self.numero_elegido = numero_elegido
+        self.cantidad = 0
+        self.apariciones = 0
+        self.suma = 0
+        self.suma_cuadrados = 0
+
+    def procesar(self, tiradas):
+        """
+        Incorpora un bloque de tiradas y devuelve sus series.
+
+        Parámetros:
+            tiradas (np.ndarray): Vector con las tiradas del bloque.
+
+        Retorna:
+            np.ndarray: Bloque de forma (4, len(tiradas)); la columna j tiene la
+            frecuencia relativa, el promedio, la varianza y el desvío tras la tirada j.
+        """
+        import numpy as np
+
+        tiradas = np.asarray(tiradas)
+        bloque = series_acumuladas(tiradas, self.numero_elegido,
+                                   (self.cantidad, self.apariciones, self.suma, self.suma_cuadrados))
+        self.cantidad += tiradas.size
+        self.apariciones += int(np.count_nonzero(tiradas == self.numero_elegido))
+        self.suma += int(tiradas.sum(dtype=np.int64))
+        self.suma_cuadrados += int(np.square(tiradas, dtype=np.int64).sum())
+        return bloque
+
+    def finales(self):
+        """
+        Calcula las medidas exactas sobre todas las tiradas procesadas.
+
+        Retorna:
+            dict: Frecuencia relativa, promedio, varianza y desvío.
+        """
+        varianza = (self.cantidad * self.suma_cuadrados - self.suma ** 2) / self.cantidad ** 2
+        return {
+            'Frecuencia Relativa': self.apariciones / self.cantidad,
+            'Promedio': self.suma / self.cantidad,
+            'Varianza': varianza,
+            'Desvío': math.sqrt(varianza)
+        }
+
+
+def indices_muestra(cantidad_tiradas, puntos, escala='log'):
+    """
+    Elige las tiradas que se conservan para graficar una serie larga.
+
+    Parámetros:
+        cantidad_tiradas (int): Cantidad total de tiradas.
+        puntos (int): Cantidad máxima de puntos a conservar.
+        escala (str, opcional): 'log' concentra los puntos en las primeras tiradas,
+            donde las medidas varían más; 'lineal' los reparte uniformemente.
+
+    Retorna:
+        np.ndarray: Índices (base 0) ordenados y sin repetir.
+    """
+    import numpy as np
+
+    if cantidad_tiradas <= puntos:
+        return np.arange(cantidad_tiradas)
+    if escala == 'log':
+        indices = np.geomspace(1, cantidad_tiradas, puntos) - 1
+    elif escala == 'lineal':
+        indices = np.linspace(0, cantidad_tiradas - 1, puntos)
+    else:
+        raise ValueError("La escala debe ser 'log' o 'lineal'")
+    return np.unique(np.rint(indices).astype(np.int64))
@@ -1,11 +1,32 @@
 import argparse
-import random
-import matplotlib.pyplot as plt
-import numpy as np
+import os
+import sys
+from functools import partial
+from estadisticas import SeriesPorBloques, indices_muestra, series_acumuladas
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from comun.perezoso import ModuloPerezoso
+from comun.graficos import configurar_salida, graficar_corridas, mostrar_o_guardar, obtener_figura
+from comun.paralelo import ejecutar_corridas
+from comun.resultados import Resultados
+from comun.secuencial import correr_hasta_precision, describir_informe
+from comun.semillas import generador_numpy, secuencia_raiz, secuencias_hijas
+
+np = ModuloPerezoso('numpy')
+
+# Tiradas que se sortean y procesan juntas en el modo streaming
+TAMANO_BLOQUE = 1 << 20
+
+# Fila de cada medida en el bloque de resultados
+MEDIDAS = ('Frecuencia Relativa', 'Promedio', 'Varianza', 'Desvío')
+
+# Nombre de cada medida como columna de Resultados y como archivo de gráfico
+COLUMNAS = ('frecuencia_relativa', 'promedio', 'varianza', 'desvio')
 
 
 class Ruleta:
-    def __init__(self, _numero_elegido, _cantidad_tiradas, _cantidad_corridas):
+    def __init__(self, _numero_elegido, _cantidad_tiradas, _cantidad_corridas, _vectorizado=False, _workers=1,
+                 _semilla=None, _streaming=False, _puntos_grafico=1000, _escala_muestra='log'):
         """
         Inicializa una instancia de la clase Ruleta.
 
@@ -13,130 +34,397 @@ class Ruleta:
             numero_elegido (int): Número elegido en la ruleta.
             cantidad_tiradas (int): Cantidad de tiradas por corrida.
             cantidad_corridas (int): Cantidad de corridas a simular.
+            vectorizado (bool, opcional): Si es True simula todas las corridas juntas con NumPy.
+            workers (int, opcional): Cantidad de procesos entre los que se reparten las corridas.
+            semilla (int, opcional): Semilla raíz; con la misma semilla los resultados son
+                idénticos sin importar el modo ni la cantidad de workers.
+            streaming (bool, opcional): Si es True procesa cada corrida por bloques y solo conserva
+                una muestra de puntos para graficar, con memoria acotada.
+            puntos_grafico (int, opcional): Cantidad máxima de puntos por serie en el modo streaming.
+            escala_muestra (str, opcional): 'log' o 'lineal', distribución de los puntos conservados.
         """
         self.numero_elegido = _numero_elegido
         self.cantidad_tiradas = _cantidad_tiradas
         self.cantidad_corridas = _cantidad_corridas
+        self.vectorizado = _vectorizado
+        self.workers = _workers
+        self.semilla = _semilla
+        self.streaming = _streaming
+        if _streaming:
+            self.eje_tiradas = indices_muestra(_cantidad_tiradas, _puntos_grafico, _escala_muestra)
+        else:
+            self.eje_tiradas = np.arange(_cantidad_tiradas)
+        self.finales = None
         try:
             self.resultados = self._simular_corridas()
         except Exception as e:
             print("Error al simular las corridas:", e)
 
-    def simular_corrida(self):
+    def simular_corrida(self, rng=None):
         """
         Simula una corrida de la ruleta y calcula las medidas estadísticas.
 
+        Parámetros:
+            rng (np.random.Generator, opcional): Generador de la corrida (por defecto: uno nuevo sin semilla).
+
+        Las medidas se calculan con las mismas sumas acumuladas que el modo vectorizado y el
+        streaming, así que con la misma semilla los tres dan resultados idénticos.
+
+        Retorna:
+            tuple: Tupla conteniendo las series de frecuencia relativa, promedio, varianza y desvío.
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        return tuple(series_acumuladas(_sortear_tiradas(rng, self.cantidad_tiradas), self.numero_elegido))
+
+    def iterar_corrida(self, rng=None, series=None):
+        """
+        Genera las medidas de una corrida bloque a bloque, sin guardar la corrida completa.
+
+        Parámetros:
+            rng (np.random.Generator, opcional): Generador de la corrida (por defecto: uno nuevo sin semilla).
+            series (SeriesPorBloques, opcional): Acumulador a usar; al terminar tiene las medidas
+                finales exactas de la corrida.
+
         Retorna:
-            tuple: Tupla conteniendo las listas de frecuencia relativa, promedio, varianza y desvío.
-        """
-        resultados = [random.randint(0, 36) for _ in range(self.cantidad_tiradas)]
-        contador_numero_elegido = 0
-        frecuencias_relativas = []
-        promedios = []
-        varianzas = []
-        desvios = []
-        for i, tirada in enumerate(resultados, start=1):
-            if tirada == self.numero_elegido:
-                contador_numero_elegido += 1
-            frecuencia_relativa = contador_numero_elegido / i
-            frecuencias_relativas.append(frecuencia_relativa)
-            promedio = sum(resultados[:i]) / i
-            promedios.append(promedio)
-            varianza = sum((x - promedio) ** 2 for x in resultados[:i]) / i
-            varianzas.append(varianza)
-            desvio = np.sqrt(varianza)
-            desvios.append(desvio)
-        return frecuencias_relativas, promedios, varianzas, desvios
-
-    def _simular_corridas(self):
+            generator: Bloques de forma (4, m); la columna j tiene la frecuencia relativa, el
+            promedio, la varianza y el desvío de una tirada.
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        if series is None:
+            series = SeriesPorBloques(self.numero_elegido)
+        for inicio in range(0, self.cantidad_tiradas, TAMANO_BLOQUE):
+            cantidad = min(TAMANO_BLOQUE, self.cantidad_tiradas - inicio)
+            yield series.procesar(_sortear_tiradas(rng, cantidad))
+
+    def simular_corrida_streaming(self, rng=None):
+        """
+        Simula una corrida en modo streaming y conserva solo los puntos de eje_tiradas.
+
+        Parámetros:
+            rng (np.random.Generator, opcional): Generador de la corrida (por defecto: uno nuevo sin semilla).
+
+        Retorna:
+            tuple: Muestra de forma (4, len(eje_tiradas)) y diccionario con las medidas finales exactas.
+        """
+        series = SeriesPorBloques(self.numero_elegido)
+        muestra = np.empty((4, len(self.eje_tiradas)))
+        inicio = 0
+        for bloque in self.iterar_corrida(rng, series):
+            fin = inicio + bloque.shape[1]
+            desde, hasta = np.searchsorted(self.eje_tiradas, [inicio, fin])
+            muestra[:, desde:hasta] = bloque[:, self.eje_tiradas[desde:hasta] - inicio]
+            inicio = fin
+        return muestra, series.finales()
+
+    def _simular_corridas(self, secuencias=None):
         """
         Realiza todas las corridas de la simulación.
 
+        Parámetros:
+            secuencias (list, opcional): Secuencia de semillas de cada corrida (por defecto: las
+                cantidad_corridas primeras hijas de la semilla raíz).
+
+        Retorna:
+            np.ndarray: Bloque de forma (corridas, 4, puntos) con la frecuencia relativa,
+            el promedio, la varianza y el desvío de cada corrida.
+        """
+        if secuencias is None:
+            secuencias = secuencias_hijas(self.cantidad_corridas, self.semilla)
+        if self.vectorizado:
+            return self._simular_corridas_lote(secuencias)
+        if self.streaming:
+            salidas = ejecutar_corridas(partial(_simular_corrida_streaming_con_semilla, self), secuencias,
+                                        self.workers)
+            self.finales = [finales for _, finales in salidas]
+            return _apilar([muestra for muestra, _ in salidas], len(self.eje_tiradas))
+        corridas = ejecutar_corridas(partial(_simular_corrida_con_semilla, self), secuencias, self.workers)
+        return _apilar(corridas, self.cantidad_tiradas)
+
+    def simular_hasta_precision(self, metrica, precision, confianza=0.95, lote=10, max_corridas=10000):
+        """
+        Reemplaza las corridas por lotes nuevos hasta estimar la medida final de metrica con la precisión pedida.
+
+        La corrida i usa siempre la hija i de la semilla raíz, así que con la misma
+        semilla las corridas coinciden con las de una simulación de cantidad fija.
+
+        Parámetros:
+            metrica (str): Medida a estimar, una de MEDIDAS; se toma su valor al final de cada corrida.
+            precision (float): Semiancho relativo buscado del intervalo de confianza.
+            confianza (float, opcional): Nivel de confianza del intervalo.
+            lote (int, opcional): Corridas por lote.
+            max_corridas (int, opcional): Presupuesto máximo de corridas.
+
+        Retorna:
+            dict: Informe de comun.secuencial.correr_hasta_precision.
+        """
+        if metrica not in MEDIDAS:
+            raise ValueError(f"Métrica {metrica} no soportada; opciones: {', '.join(MEDIDAS)}")
+        if self.cantidad_tiradas < 1:
+            raise ValueError("Se necesita al menos una tirada por corrida")
+        # Copia de la raíz sin hijas derivadas: los lotes siguen su numeración desde la hija 0
+        raiz = secuencia_raiz(self.semilla)
+        raiz = np.random.SeedSequence(raiz.entropy, spawn_key=raiz.spawn_key, pool_size=raiz.pool_size)
+        fila = MEDIDAS.index(metrica)
+        bloques, finales = [], []
+
+        def simular_lote(cantidad):
+            bloque = self._simular_corridas(secuencias_hijas(cantidad, raiz))
+            bloques.append(bloque)
+            if self.streaming:
+                finales.extend(self.finales)
+                return [medidas[metrica] for medidas in self.finales]
+            return bloque[:, fila, -1]
+
+        informe = correr_hasta_precision(simular_lote, precision, confianza, lote, max_corridas)
+        self.resultados = np.concatenate(bloques)
+        self.cantidad_corridas = len(self.resultados)
+        self.finales = finales or None
+        return informe
+
+    def _simular_corridas_lote(self, secuencias):
+        """
+        Sortea todas las tiradas de todas las corridas en una sola matriz y
+        calcula las medidas estadísticas con sumas acumuladas.
+
+        Parámetros:
+            secuencias (list): Secuencia de semillas de cada corrida.
+
+        Retorna:
+            np.ndarray: Bloque contiguo de forma (corridas, 4, tiradas) con la frecuencia
+            relativa, el promedio, la varianza y el desvío de cada corrida.
+        """
+        tiradas = np.empty((len(secuencias), self.cantidad_tiradas), dtype=np.int8)
+        for fila, secuencia in zip(tiradas, secuencias):
+            fila[:] = _sortear_tiradas(generador_numpy(secuencia), self.cantidad_tiradas)
+        return np.ascontiguousarray(series_acumuladas(tiradas, self.numero_elegido).transpose(1, 0, 2))
+
+    def a_resultados(self):
+        """
+        Reúne los resultados de la simulación en un contenedor columnar.
+
         Retorna:
-            list: Lista de resultados de cada corrida.
+            Resultados: Una columna (corridas, puntos) por medida, 'tiradas' con la tirada
+            (base 1) de cada punto y, en modo streaming, 'finales_<medida>' con las medidas
+            exactas de cada corrida; los parámetros van como metadatos.
         """
-        return [self.simular_corrida() for _ in range(self.cantidad_corridas)]
+        columnas = {columna: self.resultados[:, fila] for fila, columna in enumerate(COLUMNAS)}
+        columnas['tiradas'] = self.eje_tiradas + 1
+        if self.finales:
+            for medida, columna in zip(MEDIDAS, COLUMNAS):
+                columnas[f'finales_{columna}'] = [finales[medida] for finales in self.finales]
+        return Resultados(
+            columnas,
+            {'numero_elegido': self.numero_elegido, 'cantidad_tiradas': self.cantidad_tiradas,
+             'cantidad_corridas': self.cantidad_corridas, 'semilla': self.semilla, 'streaming': self.streaming})
 
-    def graficar_frecuencia_relativa(self):
+    def graficar_frecuencia_relativa(self, bandas=False):
         """
         Grafica la frecuencia relativa para cada corrida.
+
+        Parámetros:
+            bandas (bool, opcional): Si es True grafica percentiles entre corridas.
         """
         try:
-            self._graficar('Frecuencia Relativa')
+            self._graficar('Frecuencia Relativa', bandas)
         except Exception as e:
             print("Error al graficar la frecuencia relativa:", e)
 
-    def graficar_promedio(self):
+    def graficar_promedio(self, bandas=False):
         """
         Grafica el promedio para cada corrida.
+
+        Parámetros:
+            bandas (bool, opcional): Si es True grafica percentiles entre corridas.
         """
         try:
-            self._graficar('Promedio')
+            self._graficar('Promedio', bandas)
         except Exception as e:
             print("Error al graficar el promedio:", e)
 
-    def graficar_varianza(self):
+    def graficar_varianza(self, bandas=False):
         """
         Grafica la varianza para cada corrida.
+
+        Parámetros:
+            bandas (bool, opcional): Si es True grafica percentiles entre corridas.
         """
         try:
-            self._graficar('Varianza')
+            self._graficar('Varianza', bandas)
         except Exception as e:
             print("Error al graficar la varianza:", e)
 
-    def graficar_desvio(self):
+    def graficar_desvio(self, bandas=False):
         """
         Grafica el desvío para cada corrida.
+
+        Parámetros:
+            bandas (bool, opcional): Si es True grafica percentiles entre corridas.
         """
         try:
-            self._graficar('Desvío')
+            self._graficar('Desvío', bandas)
         except Exception as e:
             print("Error al graficar el desvío:", e)
 
-    def _graficar(self, ylabel):
+    def _graficar(self, ylabel, bandas=False):
         """
         Función interna para graficar.
 
         Parámetros:
             ylabel (str): Etiqueta del eje y.
+            bandas (bool, opcional): Si es True grafica percentiles entre corridas.
         """
-        plt.figure(figsize=(20, 10))
-        labels = {'Frecuencia Relativa': 0, 'Promedio': 1, 'Varianza': 2, 'Desvío': 3}
-        index = labels[ylabel]
-        for i, corrida in enumerate(self.resultados, start=1):
-            data = corrida[index]
-            plt.plot(range(self.cantidad_tiradas), data, label=f'Corrida {i}')
-        plt.xlabel('Cantidad de tiradas')
-        plt.ylabel(ylabel)
-        plt.title(ylabel)
-        plt.legend(loc='upper center', bbox_to_anchor=(0.5, -0.2), ncol=len(self.resultados), fancybox=True,
-                   shadow=True)
-        plt.grid(True)
-        plt.show()
-
-
-# Manejo de argumentos de línea de comandos
-parser = argparse.ArgumentParser(description='Simulacion de ruleta')
-parser.add_argument('-c', '--numero_corridas', type=int, default=-1, help='Número de corridas (por defecto: 5)')
-parser.add_argument('-n', '--numero_tiradas', type=int, default=-1, help='Número de tiradas (por defecto: 100)')
-parser.add_argument('-e', '--numero_eleguido', type=int, default=0, help='Número elegido (por defecto: 0)')
-
-args = parser.parse_args()
-cantidad_corridas, cantidad_tiradas, numero_elegido = args.numero_corridas, args.numero_tiradas, args.numero_eleguido
-try:
-    if cantidad_corridas < 0:
-        raise ValueError("-c debe ser un entero positivo")
-    if cantidad_tiradas < 0:
-        raise ValueError("-n debe ser un entero positivo")
-    if not 0 <= numero_elegido <= 36:
-        raise ValueError("-e debe ser un entero positivo entre 0 y 36")
-except ValueError as ve:
-    print("Error en los argumentos de entrada:", ve)
-    exit()
-
-
-ruleta = Ruleta(numero_elegido, cantidad_tiradas, cantidad_corridas)
-ruleta.graficar_frecuencia_relativa()
-ruleta.graficar_promedio()
-ruleta.graficar_varianza()
-ruleta.graficar_desvio()
+        fig, ax = obtener_figura(ylabel, figsize=(20, 10))
+        index = MEDIDAS.index(ylabel)
+        graficar_corridas(ax, self.eje_tiradas, self.resultados[:, index], bandas)
+        ax.set_xlabel('Cantidad de tiradas')
+        ax.set_ylabel(ylabel)
+        ax.set_title(ylabel)
+        ax.grid(True)
+        mostrar_o_guardar(fig, f'{COLUMNAS[index]}.png')
+
+
+def _sortear_tiradas(rng, cantidad_tiradas):
+    """
+    Sortea las tiradas de una corrida.
+
+    Parámetros:
+        rng (np.random.Generator): Generador de la corrida.
+        cantidad_tiradas (int): Cantidad de tiradas.
+
+    Retorna:
+        np.ndarray: Resultados entre 0 y 36.
+    """
+    # int32 y no int8: NumPy sortea los enteros de 8 bits con un buffer propio de cada llamada,
+    # y así sortear por bloques no daría la misma secuencia que sortear todo junto
+    return rng.integers(0, 37, size=cantidad_tiradas, dtype=np.int32)
+
+
+def _apilar(corridas, puntos):
+    """
+    Reúne las matrices (4, puntos) de cada corrida en un único bloque contiguo.
+
+    Parámetros:
+        corridas (list): Matriz de cada corrida.
+        puntos (int): Puntos por serie (para el caso sin corridas).
+
+    Retorna:
+        np.ndarray: Bloque de forma (corridas, 4, puntos).
+    """
+    bloque = np.empty((len(corridas), 4, puntos))
+    for fila, corrida in zip(bloque, corridas):
+        fila[...] = corrida
+    return bloque
+
+
+def _simular_corrida_con_semilla(ruleta, secuencia):
+    """
+    Simula una corrida con su propio generador; puede ejecutarse en los procesos del pool.
+
+    Parámetros:
+        ruleta (Ruleta): Instancia con los parámetros de la simulación.
+        secuencia (np.random.SeedSequence): Secuencia de semillas de la corrida.
+
+    Retorna:
+        np.ndarray: Matriz (4, tiradas) con la frecuencia relativa, el promedio, la varianza y el desvío.
+    """
+    return np.array(ruleta.simular_corrida(generador_numpy(secuencia)), dtype=np.float64)
+
+
+def _simular_corrida_streaming_con_semilla(ruleta, secuencia):
+    """
+    Simula una corrida en modo streaming con su propio generador; puede ejecutarse en los procesos del pool.
+
+    Parámetros:
+        ruleta (Ruleta): Instancia con los parámetros de la simulación.
+        secuencia (np.random.SeedSequence): Secuencia de semillas de la corrida.
+
+    Retorna:
+        tuple: Muestra de las series y medidas finales exactas.
+    """
+    return ruleta.simular_corrida_streaming(generador_numpy(secuencia))
+
+
+def main(argv=None):
+    # Manejo de argumentos de línea de comandos
+    parser = argparse.ArgumentParser(description='Simulacion de ruleta')
+    parser.add_argument('-c', '--numero_corridas', type=int, default=-1, help='Número de corridas (por defecto: 5)')
+    parser.add_argument('-n', '--numero_tiradas', type=int, default=-1, help='Número de tiradas (por defecto: 100)')
+    parser.add_argument('-e', '--numero_eleguido', type=int, default=0, help='Número elegido (por defecto: 0)')
+    parser.add_argument('--vectorizado', action='store_true',
+                        help='Simula todas las corridas juntas con NumPy (por defecto: desactivado)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Cantidad de procesos para repartir las corridas (por defecto: 1)')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Semilla raíz para reproducir la simulación (por defecto: aleatoria)')
+    parser.add_argument('--streaming', action='store_true',
+                        help='Procesa las corridas por bloques con memoria acotada (por defecto: desactivado)')
+    parser.add_argument('--puntos', type=int, default=1000,
+                        help='Puntos por serie a conservar en modo streaming (por defecto: 1000)')
+    parser.add_argument('--escala', type=str, choices=['log', 'lineal'], default='log',
+                        help='Distribución de los puntos conservados en modo streaming (por defecto: log)')
+    parser.add_argument('--bandas', action='store_true',
+                        help='Grafica bandas de percentiles en lugar de cada corrida (por defecto: desactivado)')
+    parser.add_argument('--output-dir', type=str, default=None,
+                        help='Guarda los gráficos en este directorio sin abrir ventanas (por defecto: se muestran)')
+    parser.add_argument('--precision', type=float, default=None,
+                        help='Semiancho relativo buscado para --metrica; lanza lotes de corridas hasta '
+                             'alcanzarlo en lugar de usar -c (por defecto: desactivado)')
+    parser.add_argument('--confianza', type=float, default=0.95,
+                        help='Nivel de confianza del intervalo con --precision (por defecto: 0.95)')
+    parser.add_argument('--metrica', type=str, choices=MEDIDAS, default='Frecuencia Relativa',
+                        help='Medida final a estimar con --precision (por defecto: Frecuencia Relativa)')
+    parser.add_argument('--lote', type=int, default=10,
+                        help='Corridas por lote con --precision (por defecto: 10)')
+    parser.add_argument('--max-corridas', type=int, default=10000,
+                        help='Presupuesto máximo de corridas con --precision (por defecto: 10000)')
+    parser.add_argument('--guardar', type=str, default=None,
+                        help='Guarda los resultados en este directorio (columnas .npy) o archivo .npz comprimido')
+
+    args = parser.parse_args(argv)
+    cantidad_corridas, cantidad_tiradas, numero_elegido = args.numero_corridas, args.numero_tiradas, args.numero_eleguido
+    try:
+        if args.precision is not None:
+            if args.precision <= 0:
+                raise ValueError("--precision debe ser positiva")
+            if not 0 < args.confianza < 1:
+                raise ValueError("--confianza debe estar entre 0 y 1")
+            if args.lote < 2 or args.max_corridas < 2:
+                raise ValueError("--lote y --max-corridas deben ser al menos 2")
+            cantidad_corridas = 0
+        if cantidad_corridas < 0:
+            raise ValueError("-c debe ser un entero positivo")
+        if cantidad_tiradas < 1:
+            raise ValueError("-n debe ser un entero positivo")
+        if not 0 <= numero_elegido <= 36:
+            raise ValueError("-e debe ser un entero positivo entre 0 y 36")
+        if args.workers < 1:
+            raise ValueError("--workers debe ser un entero positivo")
+        if args.puntos < 1:
+            raise ValueError("--puntos debe ser un entero positivo")
+    except ValueError as ve:
+        print("Error en los argumentos de entrada:", ve)
+        return
+
+    ruleta = Ruleta(numero_elegido, cantidad_tiradas, cantidad_corridas, args.vectorizado, args.workers,
+                    args.seed, args.streaming, args.puntos, args.escala)
+    if args.precision is not None:
+        informe = ruleta.simular_hasta_precision(args.metrica, args.precision, args.confianza, args.lote,
+                                                 args.max_corridas)
+        print(describir_informe(informe, args.metrica))
+    if args.guardar:
+        print('resultados guardados en: ', ruleta.a_resultados().guardar(args.guardar))
+    configurar_salida(args.output_dir)
+    ruleta.graficar_frecuencia_relativa(args.bandas)
+    ruleta.graficar_promedio(args.bandas)
+    ruleta.graficar_varianza(args.bandas)
+    ruleta.graficar_desvio(args.bandas)
+    if ruleta.finales:
+        for i, finales in enumerate(ruleta.finales, start=1):
+            print(f'Corrida {i}:', ', '.join(f'{medida} = {valor:.6f}' for medida, valor in finales.items()))
+    return ruleta
+
+
+if __name__ == "__main__":
+    main()
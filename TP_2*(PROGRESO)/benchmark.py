@@ -0,0 +1,223 @@
+"""
+Benchmark de calidad y rendimiento de los generadores de números pseudoaleatorios.
+
+Para cada generador (los métodos de RandomNumber y los PCG64 y MT19937 de NumPy) y cada
+tamaño de muestra, genera los números en bloques, los pasa por la batería incremental y
+repite con semillas distintas. Informa números por segundo, pico de memoria y la proporción
+de repeticiones que aprueba cada prueba, y guarda todo en un reporte JSON.
+
+Uso:
+    python3 benchmark.py [-n TAMAÑOS ...] [-r REPETICIONES] [-g GENERADORES ...] [-o SALIDA]
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from tp2_1 import METODOS, TAMANO_BLOQUE, BateriaIncremental, RandomNumber, ajustar_semilla, valores_p
+
+TAMANOS = tuple(10 ** exponente for exponente in range(3, 9))
+
+# Generadores de NumPy: bit generator y rango de random_raw (PCG64 da 64 bits, MT19937 32)
+GENERADORES_NUMPY = {
+    'pcg64': (np.random.PCG64, 2 ** 64),
+    'mt19937': (np.random.MT19937, 2 ** 32),
+}
+
+GENERADORES = METODOS + tuple(GENERADORES_NUMPY)
+
+PRUEBAS = ('chi2', 'runs', 'ks', 'autocorr')
+
+
+def fuente(generador, cantidad, semilla, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Bloques de números de un generador y el rango de sus valores.
+
+    Parámetros:
+        generador (str): Método de RandomNumber o generador de GENERADORES_NUMPY.
+        cantidad (int): Cantidad de números.
+        semilla (int): Semilla de 32 bits; se adapta a lo que acepta cada método.
+        tamano_bloque (int, opcional): Números por bloque.
+
+    Retorna:
+        tuple: Iterador de bloques NumPy y tupla (bajo, alto) del rango.
+    """
+    if generador in GENERADORES_NUMPY:
+        clase, alto = GENERADORES_NUMPY[generador]
+        return _bloques_numpy(clase(semilla), cantidad, tamano_bloque), (0, alto)
+    if generador not in METODOS:
+        raise ValueError(f"Generador {generador} no soportado; opciones: {', '.join(GENERADORES)}")
+    rng = RandomNumber(cantidad, generador, seed=ajustar_semilla(generador, semilla))
+    return rng.iterar_bloques(tamano_bloque), rng.rango()
+
+
+def _bloques_numpy(bit_generator, cantidad, tamano_bloque):
+    for inicio in range(0, cantidad, tamano_bloque):
+        yield bit_generator.random_raw(min(tamano_bloque, cantidad - inicio))
+
+
+def correr(generador, cantidad, semilla, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Genera y prueba una muestra en una pasada, midiendo por separado generación y batería.
+
+    Retorna:
+        tuple: Segundos de generación, segundos de la batería y resultados de la batería.
+    """
+    bloques, (bajo, alto) = fuente(generador, cantidad, semilla, tamano_bloque)
+    bateria = BateriaIncremental(bajo, alto)
+    segundos_generacion = segundos_bateria = 0.0
+    inicio = time.perf_counter()
+    for bloque in bloques:
+        generado = time.perf_counter()
+        bateria.actualizar(bloque)
+        probado = time.perf_counter()
+        segundos_generacion += generado - inicio
+        segundos_bateria += probado - generado
+        inicio = probado
+    return segundos_generacion, segundos_bateria, bateria.resultados()
+
+
+def aprobadas(resultados, alfa):
+    """Qué pruebas de la batería aprueba una muestra al nivel de significación alfa."""
+    analisis = resultados['analisis_autocorrelacion']
+    return {
+        'chi2': resultados['p_value_chi2'] > alfa,
+        'runs': resultados['p_value_runs'] is not None and resultados['p_value_runs'] > alfa,
+        'ks': resultados['p_value_ks'] > alfa,
+        'autocorr': len(analisis['rezagos']) > 0 and analisis['p_value_ljung_box'] > alfa,
+    }
+
+
+def medir_configuracion(generador, cantidad, repeticiones=3, semilla=0, alfa=0.01, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Mide un generador con un tamaño de muestra.
+
+    Cada repetición usa una semilla distinta derivada de semilla. Las repeticiones se
+    cronometran sin trazar la memoria; el pico de memoria se mide en una pasada más con
+    tracemalloc, que registra también los bloques de NumPy.
+
+    Parámetros:
+        generador (str): Nombre en GENERADORES.
+        cantidad (int): Tamaño de la muestra.
+        repeticiones (int, opcional): Cantidad de repeticiones cronometradas.
+        semilla (int, opcional): Semilla raíz de las repeticiones.
+        alfa (float, opcional): Nivel de significación de las pruebas.
+        tamano_bloque (int, opcional): Números por bloque.
+
+    Retorna:
+        dict: Tiempos, números por segundo (mediana), pico de memoria en bytes, valores p de
+        cada repetición y proporción de repeticiones que aprueba cada prueba.
+    """
+    semillas = np.random.SeedSequence(semilla).generate_state(repeticiones).tolist()
+    segundos, segundos_bateria, valores_p_repeticiones, aprobaciones = [], [], [], []
+    for semilla_repeticion in semillas:
+        generacion, bateria, resultados = correr(generador, cantidad, semilla_repeticion, tamano_bloque)
+        segundos.append(generacion)
+        segundos_bateria.append(bateria)
+        valores_p_repeticiones.append(valores_p(resultados))
+        aprobaciones.append(aprobadas(resultados, alfa))
+
+    tracemalloc.start()
+    correr(generador, cantidad, semillas[0], tamano_bloque)
+    memoria_pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    tasas = {prueba: float(np.mean([aprobacion[prueba] for aprobacion in aprobaciones])) for prueba in PRUEBAS}
+    return {
+        'generador': generador,
+        'n': cantidad,
+        'repeticiones': repeticiones,
+        'segundos': segundos,
+        'segundos_bateria': segundos_bateria,
+        'numeros_por_segundo': cantidad / float(np.median(segundos)) if np.median(segundos) > 0 else None,
+        'memoria_pico_bytes': memoria_pico,
+        'valores_p': valores_p_repeticiones,
+        'tasa_aprobacion': tasas,
+        'tasa_aprobacion_total': float(np.mean([all(aprobacion.values()) for aprobacion in aprobaciones])),
+    }
+
+
+def benchmark(generadores=GENERADORES, tamanos=TAMANOS, repeticiones=3, semilla=0, alfa=0.01,
+              tamano_bloque=TAMANO_BLOQUE, presupuesto=120.0, mostrar=print):
+    """
+    Recorre todas las combinaciones de generador y tamaño.
+
+    Los tamaños de cada generador van de menor a mayor; si el tiempo por número del último
+    tamaño medido hace prever que una configuración (repeticiones más la pasada de memoria)
+    supera presupuesto segundos, se omite y se registra la estimación.
+
+    Retorna:
+        dict: Reporte con los parámetros, el entorno y una entrada por configuración.
+    """
+    if repeticiones < 1 or tamano_bloque < 1 or not 0 < alfa < 1:
+        raise ValueError("Las repeticiones y el tamaño de bloque deben ser positivos y alfa estar entre 0 y 1.")
+    if any(cantidad < 2 for cantidad in tamanos):
+        raise ValueError("Los tamaños de muestra deben ser de al menos 2 números.")
+    configuraciones = []
+    for generador in generadores:
+        segundos_por_numero = 0.0
+        for cantidad in sorted(tamanos):
+            estimacion = segundos_por_numero * cantidad * (repeticiones + 1)
+            if presupuesto is not None and estimacion > presupuesto:
+                configuraciones.append({'generador': generador, 'n': cantidad, 'omitida': True,
+                                        'segundos_estimados': estimacion})
+                mostrar(f"{generador:<17} n={cantidad:>11,}  omitida (estimado {estimacion:,.0f} s)")
+                continue
+            configuracion = medir_configuracion(generador, cantidad, repeticiones, semilla, alfa, tamano_bloque)
+            segundos_por_numero = (np.median(configuracion['segundos'])
+                                   + np.median(configuracion['segundos_bateria'])) / cantidad
+            configuraciones.append(configuracion)
+            mostrar(_describir(configuracion))
+    return {
+        'parametros': {'generadores': list(generadores), 'tamanos': sorted(tamanos), 'repeticiones': repeticiones,
+                       'semilla': semilla, 'alfa': alfa, 'tamano_bloque': tamano_bloque,
+                       'presupuesto': presupuesto},
+        'entorno': {'python': sys.version.split()[0], 'numpy': np.__version__, 'plataforma': platform.platform(),
+                    'procesador': platform.machine()},
+        'configuraciones': configuraciones,
+    }
+
+
+def _describir(configuracion):
+    velocidad = configuracion['numeros_por_segundo']
+    tasas = '  '.join(f"{prueba} {configuracion['tasa_aprobacion'][prueba]:4.0%}" for prueba in PRUEBAS)
+    return (f"{configuracion['generador']:<17} n={configuracion['n']:>11,}  "
+            f"{velocidad / 1e6 if velocidad else float('inf'):10.2f} M/s  "
+            f"{configuracion['memoria_pico_bytes'] / 2 ** 20:8.1f} MiB  {tasas}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark de calidad y rendimiento de los generadores')
+    parser.add_argument('-n', '--tamanos', type=int, nargs='+', default=list(TAMANOS),
+                        help='Tamaños de muestra (por defecto: de 10^3 a 10^8)')
+    parser.add_argument('-r', '--repeticiones', type=int, default=3, help='Repeticiones por configuración')
+    parser.add_argument('-g', '--generadores', nargs='+', default=list(GENERADORES), choices=GENERADORES,
+                        help='Generadores a medir (por defecto: todos)')
+    parser.add_argument('-s', '--semilla', type=int, default=0, help='Semilla raíz de las repeticiones')
+    parser.add_argument('-a', '--alfa', type=float, default=0.01, help='Nivel de significación de las pruebas')
+    parser.add_argument('-b', '--tamano-bloque', type=int, default=TAMANO_BLOQUE, help='Números por bloque')
+    parser.add_argument('-p', '--presupuesto', type=float, default=120.0,
+                        help='Segundos estimados por encima de los cuales se omite una configuración; '
+                             '0 o negativo para no omitir ninguna')
+    parser.add_argument('-o', '--salida', default='benchmark_generadores.json', help='Archivo JSON del reporte')
+    args = parser.parse_args(argv)
+
+    try:
+        reporte = benchmark(args.generadores, args.tamanos, args.repeticiones, args.semilla, args.alfa,
+                            args.tamano_bloque, args.presupuesto if args.presupuesto > 0 else None)
+    except ValueError as ve:
+        print("Error en los argumentos de entrada:", ve)
+        return None
+
+    with open(args.salida, 'w', encoding='utf-8') as archivo:
+        json.dump(reporte, archivo, indent=2)
+    print(f"Reporte guardado en {args.salida}")
+    return reporte
+
+
+if __name__ == "__main__":
+    main()
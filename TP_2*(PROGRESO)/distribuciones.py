@@ -0,0 +1,505 @@
+import hashlib
+import os
+import sys
+import time
+from collections import OrderedDict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from comun.perezoso import ModuloPerezoso
+
+np = ModuloPerezoso('numpy')
+
+# Probabilidad de cola que se descarta al tabular una distribución discreta no acotada:
+# por debajo de la resolución de un uniforme de doble precisión
+COLA_DESCARTABLE = 2.0 ** -53
+
+# Valores propuestos por ronda en los muestreadores por rechazo, relativos a los que faltan
+HOLGURA_RECHAZO = 1.2
+
+# Réplicas de la distribución nula de Monte Carlo de la prueba K-S discreta
+REPLICAS_KS = 1000
+
+# Hasta esta cantidad de valores sorteados (tamaño de muestra por réplicas) la nula se simula
+# exacta; con más se usa su límite, el puente browniano evaluado en el soporte
+MAXIMO_NULA_EXACTA = 1 << 26
+
+# Elementos por bloque al simular la nula, para acotar la memoria
+ELEMENTOS_BLOQUE = 1 << 22
+
+# Tablas Empirica que se conservan, las usadas más recientemente
+MAX_EMPIRICAS = 32
+
+DISTRIBUCIONES = {}
+
+_EMPIRICAS = OrderedDict()
+
+
+class Distribucion:
+    """
+    Distribución registrada: sus parámetros por defecto, la distribución de scipy.stats que
+    da la función de distribución y la densidad o probabilidad, y uno o más muestreadores.
+
+    Cada muestreador es una función (rng, size, **parámetros) que recibe un np.random.Generator
+    explícito, así todos los métodos consumen la misma fuente de aleatoriedad.
+    """
+
+    def __init__(self, nombre, parametros, scipy=None, discreta=False, metodo_por_defecto='numpy'):
+        """
+        Parámetros:
+            nombre (str): Nombre con el que se registra.
+            parametros (dict): Parámetros aceptados y su valor por defecto.
+            scipy (callable, opcional): Función de los parámetros que devuelve la distribución
+                congelada de scipy.stats; las que no la tienen definen cdf y probabilidad propias.
+            discreta (bool, opcional): Si los valores son discretos.
+            metodo_por_defecto (str, opcional): Muestreador que se usa si no se elige otro.
+        """
+        self.nombre = nombre
+        self.parametros_por_defecto = dict(parametros)
+        self.scipy = scipy
+        self.discreta = discreta
+        self.metodo_por_defecto = metodo_por_defecto
+        self.muestreadores = {}
+
+    def muestreador(self, metodo):
+        """Decorador que registra un muestreador de la distribución con el nombre metodo."""
+        def registrar_muestreador(funcion):
+            self.muestreadores[metodo] = funcion
+            return funcion
+        return registrar_muestreador
+
+    def parametros(self, kwargs):
+        """Parámetros por defecto actualizados con kwargs."""
+        desconocidos = set(kwargs) - set(self.parametros_por_defecto)
+        if desconocidos:
+            raise ValueError(f"Parámetros no soportados para {self.nombre}: {', '.join(sorted(desconocidos))}")
+        return dict(self.parametros_por_defecto, **kwargs)
+
+    def muestrear(self, rng, size, metodo=None, **kwargs):
+        """Genera size valores con el muestreador metodo (por defecto: metodo_por_defecto)."""
+        if metodo is None:
+            metodo = self.metodo_por_defecto
+        if metodo not in self.muestreadores:
+            raise ValueError(f"Método {metodo} no disponible para {self.nombre}; opciones: "
+                             f"{', '.join(self.muestreadores)}")
+        return self.muestreadores[metodo](rng, size, **self.parametros(kwargs))
+
+    def congelada(self, **kwargs):
+        """Distribución congelada de scipy.stats con los parámetros dados."""
+        if self.scipy is None:
+            raise ValueError(f"La distribución {self.nombre} no tiene equivalente en scipy.stats")
+        return self.scipy(**self.parametros(kwargs))
+
+    def cdf(self, x, **kwargs):
+        """Función de distribución acumulada en x."""
+        return self.congelada(**kwargs).cdf(x)
+
+    def probabilidad(self, x, **kwargs):
+        """Función de probabilidad (discretas) o de densidad (continuas) en x."""
+        congelada = self.congelada(**kwargs)
+        return congelada.pmf(x) if self.discreta else congelada.pdf(x)
+
+    def tabla(self, **kwargs):
+        """
+        Valores y probabilidades de una distribución discreta, para los muestreadores por tabla.
+
+        El soporte no acotado se corta donde la cola restante es menor que COLA_DESCARTABLE
+        y las probabilidades se renormalizan.
+        """
+        if not self.discreta:
+            raise ValueError(f"La distribución {self.nombre} no es discreta")
+        congelada = self.congelada(**kwargs)
+        inicio = int(congelada.support()[0])
+        fin = int(congelada.isf(COLA_DESCARTABLE))
+        valores = np.arange(inicio, fin + 1)
+        probabilidades = congelada.pmf(valores)
+        return valores, probabilidades / probabilidades.sum()
+
+    def empirica(self, **kwargs):
+        """Tabla de la distribución discreta como Empirica, construida una vez por juego de parámetros."""
+        valores, probabilidades = self.tabla(**kwargs)
+        return _empirica(valores, probabilidades)
+
+    def ks_test(self, numeros, **kwargs):
+        """
+        Prueba de Kolmogorov-Smirnov de los números contra la distribución.
+
+        Las continuas usan la distribución exacta de scipy; las discretas, el estadístico sobre
+        todos los puntos del soporte con un valor p de Monte Carlo (ver Empirica.ks_test).
+        """
+        from scipy.stats import kstest
+
+        if self.discreta:
+            return self.empirica(**kwargs).ks_test(numeros)
+        d_stat, p_value = kstest(numeros, self.congelada(**kwargs).cdf)
+        return d_stat, p_value
+
+
+def registrar(distribucion):
+    """Agrega la distribución al registro DISTRIBUCIONES y la devuelve."""
+    DISTRIBUCIONES[distribucion.nombre] = distribucion
+    return distribucion
+
+
+def obtener(nombre):
+    """Distribución registrada con ese nombre."""
+    if nombre not in DISTRIBUCIONES:
+        raise ValueError(f"Distribución {nombre} no soportada.")
+    return DISTRIBUCIONES[nombre]
+
+
+class Empirica:
+    """
+    Distribución discreta finita con la acumulada y la tabla de alias calculadas una sola vez:
+    cada valor sorteado cuesta O(1) sin importar el tamaño del soporte.
+    """
+
+    def __init__(self, valores, probabilidades):
+        """
+        Parámetros:
+            valores (array): Soporte; los valores repetidos suman sus probabilidades.
+            probabilidades (array): Probabilidad (o peso no negativo) de cada valor.
+        """
+        valores = np.asarray(valores)
+        probabilidades = np.asarray(probabilidades, dtype=np.float64)
+        if valores.ndim != 1 or len(valores) != len(probabilidades) or not len(valores):
+            raise ValueError("values y probabilities deben tener el mismo largo, no nulo")
+        if np.any(probabilidades < 0) or not probabilidades.sum() > 0:
+            raise ValueError("Las probabilidades deben ser no negativas y sumar un valor positivo")
+        self.valores, inversos = np.unique(valores, return_inverse=True)
+        pesos = np.bincount(inversos, weights=probabilidades, minlength=len(self.valores))
+        self.probabilidades = pesos / pesos.sum()
+        self.acumulada = np.cumsum(self.probabilidades)
+        self.acumulada[-1] = 1.0
+        self.umbral, self.alias = tabla_alias(self.probabilidades)
+        self._nulas = {}
+
+    def muestrear(self, rng, size):
+        """Sorteo por el método de alias."""
+        return muestrear_alias(rng, size, self.valores, self.umbral, self.alias)
+
+    def cdf(self, x):
+        acumulada = np.concatenate([[0.0], self.acumulada])
+        return acumulada[np.searchsorted(self.valores, x, side='right')]
+
+    def probabilidad(self, x):
+        x = np.asarray(x)
+        indices = np.clip(np.searchsorted(self.valores, x), 0, len(self.valores) - 1)
+        return np.where(self.valores[indices] == x, self.probabilidades[indices], 0.0)
+
+    def estadistico_ks(self, numeros):
+        """
+        D = max |F_n(x) - F(x)| sobre todos los puntos del soporte (aparezcan o no en la muestra)
+        y sobre los valores de la muestra fuera del soporte.
+        """
+        numeros = np.asarray(numeros)
+        if not len(numeros):
+            raise ValueError("Se necesita al menos un valor.")
+        indices = np.searchsorted(self.valores, numeros)
+        dentro = indices < len(self.valores)
+        dentro[dentro] = self.valores[indices[dentro]] == numeros[dentro]
+        if dentro.all():
+            conteos = np.bincount(indices, minlength=len(self.valores))
+            return float(np.max(np.abs(np.cumsum(conteos) / len(numeros) - self.acumulada)))
+        # Hay valores fuera del soporte: F_n también salta en ellos
+        puntos = np.union1d(self.valores, numeros)
+        empirica = np.searchsorted(np.sort(numeros), puntos, side='right') / len(numeros)
+        return float(np.max(np.abs(empirica - self.cdf(puntos))))
+
+    def distribucion_nula_ks(self, n, replicas=REPLICAS_KS, semilla=0):
+        """
+        Estadísticos D de replicas muestras de tamaño n de la propia distribución, ordenados.
+
+        Se calcula una vez por (n, replicas, semilla). Si n * replicas no supera MAXIMO_NULA_EXACTA
+        las muestras se sortean por alias y se cuentan por réplica; si no, se usa el límite
+        sqrt(n) D -> max |B(F(x))| del puente browniano B en los puntos del soporte.
+        """
+        clave = (n, replicas, semilla)
+        if clave not in self._nulas:
+            rng = np.random.default_rng(semilla)
+            cantidad = len(self.valores)
+            exacta = n * replicas <= MAXIMO_NULA_EXACTA
+            por_bloque = max(1, ELEMENTOS_BLOQUE // (max(n, cantidad) if exacta else cantidad))
+            estadisticos = np.empty(replicas)
+            for inicio in range(0, replicas, por_bloque):
+                filas = min(por_bloque, replicas - inicio)
+                if exacta:
+                    celdas = _celdas_alias(rng, (filas, n), self.umbral, self.alias)
+                    celdas += np.arange(filas)[:, None] * cantidad
+                    conteos = np.bincount(celdas.ravel(), minlength=filas * cantidad).reshape(filas, cantidad)
+                    diferencias = np.cumsum(conteos, axis=1) / n - self.acumulada
+                else:
+                    # Operaciones en el lugar: el costo es sortear los normales, no las copias
+                    diferencias = rng.standard_normal((filas, cantidad))
+                    diferencias *= np.sqrt(self.probabilidades)
+                    np.cumsum(diferencias, axis=1, out=diferencias)
+                    diferencias -= np.multiply.outer(diferencias[:, -1], self.acumulada)
+                    diferencias /= np.sqrt(n)
+                estadisticos[inicio:inicio + filas] = np.max(np.abs(diferencias), axis=1)
+            self._nulas[clave] = np.sort(estadisticos)
+        return self._nulas[clave]
+
+    def ks_test(self, numeros, replicas=REPLICAS_KS, semilla=0):
+        """
+        Prueba K-S discreta: el estadístico de estadistico_ks y un valor p de Monte Carlo,
+        (1 + réplicas con D mayor o igual) / (replicas + 1).
+        """
+        d_stat = self.estadistico_ks(numeros)
+        nula = self.distribucion_nula_ks(len(numeros), replicas, semilla)
+        # Tolerancia relativa para que empates exactos no dependan del redondeo de las sumas
+        mayores = len(nula) - np.searchsorted(nula, d_stat * (1 - 1e-12), side='left')
+        return d_stat, (1 + mayores) / (replicas + 1)
+
+
+def _empirica(valores, probabilidades):
+    """Empirica de la tabla, reutilizada mientras la tabla no cambie; la clave es un resumen de sus bytes."""
+    valores = np.asarray(valores)
+    probabilidades = np.asarray(probabilidades, dtype=np.float64)
+    digesto = hashlib.blake2b(digest_size=16)
+    if valores.dtype == object:
+        digesto.update(repr(valores.tolist()).encode())
+    else:
+        digesto.update(valores.dtype.str.encode())
+        digesto.update(np.ascontiguousarray(valores).tobytes())
+    digesto.update(np.ascontiguousarray(probabilidades).tobytes())
+    clave = (valores.shape, probabilidades.shape, digesto.digest())
+    if clave in _EMPIRICAS:
+        _EMPIRICAS.move_to_end(clave)
+    else:
+        _EMPIRICAS[clave] = Empirica(valores, probabilidades)
+        if len(_EMPIRICAS) > MAX_EMPIRICAS:
+            _EMPIRICAS.popitem(last=False)
+    return _EMPIRICAS[clave]
+
+
+# Muestreadores genéricos de la materia
+
+def tabla_alias(probabilidades):
+    """
+    Tabla de alias de Walker para muestrear en O(1) por valor.
+
+    Se construye por rondas vectorizadas: en cada una todas las celdas chicas (altura < 1) toman
+    su alias de las grandes, repartidas según el déficit acumulado de las chicas contra el exceso
+    acumulado de las grandes; cada grande cubre a lo sumo una chica de más y, si queda por debajo
+    de 1, pasa a ser chica en la ronda siguiente. La masa de cada grande se descuenta exacta, así
+    que la tabla reproduce las probabilidades aunque las sumas acumuladas redondeen.
+
+    Retorna:
+        tuple: Probabilidad de quedarse en cada celda y celda alias a la que se salta si no.
+    """
+    probabilidades = np.asarray(probabilidades, dtype=np.float64)
+    cantidad = len(probabilidades)
+    altura = probabilidades * (cantidad / probabilidades.sum())
+    umbral = np.ones(cantidad)
+    alias = np.arange(cantidad)
+    chicas = np.flatnonzero(altura < 1)
+    grandes = np.flatnonzero(altura >= 1)
+    while len(chicas) and len(grandes):
+        deficit = 1 - altura[chicas]
+        inicio = np.cumsum(deficit) - deficit
+        donante = np.searchsorted(np.cumsum(altura[grandes] - 1), inicio, side='right')
+        donante = np.minimum(donante, len(grandes) - 1)
+        umbral[chicas] = altura[chicas]
+        alias[chicas] = grandes[donante]
+        altura[grandes] -= np.bincount(donante, weights=deficit, minlength=len(grandes))
+        agotadas = altura[grandes] < 1
+        chicas, grandes = grandes[agotadas], grandes[~agotadas]
+    # Lo que queda tiene altura 1 salvo por errores de redondeo
+    return umbral, alias
+
+
+def muestrear_alias(rng, size, valores, umbral, alias):
+    """Método de alias: una celda uniforme y un uniforme para decidir entre la celda y su alias."""
+    return np.asarray(valores)[_celdas_alias(rng, size, umbral, alias)]
+
+
+def _celdas_alias(rng, size, umbral, alias):
+    celdas = rng.integers(0, len(umbral), size=size)
+    saltan = rng.random(size) >= umbral[celdas]
+    celdas[saltan] = alias[celdas[saltan]]
+    return celdas
+
+
+def muestrear_inversa_discreta(rng, size, valores, probabilidades):
+    """Transformada inversa sobre la tabla acumulada: el menor valor con F(x) > u."""
+    acumulada = np.cumsum(probabilidades)
+    acumulada /= acumulada[-1]
+    indices = np.searchsorted(acumulada, rng.random(size), side='right')
+    return np.asarray(valores)[np.minimum(indices, len(acumulada) - 1)]
+
+
+def muestrear_rechazo_discreto(rng, size, valores, probabilidades):
+    """Rechazo con propuesta uniforme sobre la tabla: se acepta la celda i con probabilidad p_i / max(p)."""
+    probabilidades = np.asarray(probabilidades, dtype=np.float64)
+    relativas = probabilidades / probabilidades.max()
+    tasa = relativas.mean()
+    return _rechazo(rng, size, tasa, lambda cantidad: _proponer_discreto(rng, cantidad, relativas),
+                    np.asarray(valores))
+
+
+def _proponer_discreto(rng, cantidad, relativas):
+    celdas = rng.integers(0, len(relativas), size=cantidad)
+    return celdas[rng.random(cantidad) < relativas[celdas]]
+
+
+def _rechazo(rng, size, tasa, proponer, valores=None):
+    """Junta valores aceptados por proponer(cantidad) hasta tener size, en rondas vectorizadas."""
+    partes, faltan = [], size
+    while faltan > 0:
+        aceptados = proponer(int(np.ceil(faltan / tasa * HOLGURA_RECHAZO)) + 1)[:faltan]
+        partes.append(aceptados)
+        faltan -= len(aceptados)
+    muestra = np.concatenate(partes) if partes else np.empty(0, dtype=np.int64)
+    return muestra if valores is None else valores[muestra]
+
+
+def _muestreadores_por_tabla(distribucion):
+    """Registra inversa, rechazo y alias sobre la tabla de una distribución discreta."""
+    @distribucion.muestreador('inversa')
+    def inversa(rng, size, **parametros):
+        empirica = distribucion.empirica(**parametros)
+        return muestrear_inversa_discreta(rng, size, empirica.valores, empirica.probabilidades)
+
+    @distribucion.muestreador('rechazo')
+    def rechazo(rng, size, **parametros):
+        empirica = distribucion.empirica(**parametros)
+        return muestrear_rechazo_discreto(rng, size, empirica.valores, empirica.probabilidades)
+
+    @distribucion.muestreador('alias')
+    def alias(rng, size, **parametros):
+        return distribucion.empirica(**parametros).muestrear(rng, size)
+
+
+def _scipy(nombre, convertir):
+    """Constructor de la distribución congelada scipy.stats.nombre a partir de los parámetros."""
+    def congelar(**parametros):
+        from scipy import stats
+        return getattr(stats, nombre)(*convertir(**parametros))
+    return congelar
+
+
+# Distribuciones
+
+UNIFORME = registrar(Distribucion('uniform', {'a': 0, 'b': 1}, _scipy('uniform', lambda a, b: (a, b - a))))
+
+
+@UNIFORME.muestreador('numpy')
+def _uniforme_numpy(rng, size, a, b):
+    return rng.uniform(a, b, size)
+
+
+@UNIFORME.muestreador('inversa')
+def _uniforme_inversa(rng, size, a, b):
+    return a + (b - a) * rng.random(size)
+
+
+EXPONENCIAL = registrar(Distribucion('exponential', {'scale': 1}, _scipy('expon', lambda scale: (0, scale))))
+
+
+@EXPONENCIAL.muestreador('numpy')
+def _exponencial_numpy(rng, size, scale):
+    return rng.exponential(scale, size)
+
+
+@EXPONENCIAL.muestreador('inversa')
+def _exponencial_inversa(rng, size, scale):
+    return -scale * np.log1p(-rng.random(size))
+
+
+NORMAL = registrar(Distribucion('normal', {'mu': 0, 'sigma': 1}, _scipy('norm', lambda mu, sigma: (mu, sigma))))
+
+
+@NORMAL.muestreador('numpy')
+def _normal_numpy(rng, size, mu, sigma):
+    return rng.normal(mu, sigma, size)
+
+
+@NORMAL.muestreador('inversa')
+def _normal_inversa(rng, size, mu, sigma):
+    from scipy.special import ndtri
+    return mu + sigma * ndtri(rng.random(size))
+
+
+@NORMAL.muestreador('rechazo')
+def _normal_rechazo(rng, size, mu, sigma):
+    # Media normal con propuesta exponencial de media 1: se acepta y si u <= exp(-(y - 1)**2 / 2),
+    # con tasa sqrt(pi / (2e)); luego un signo al azar
+    def proponer(cantidad):
+        y = rng.exponential(1.0, cantidad)
+        aceptados = y[rng.random(cantidad) <= np.exp(-(y - 1) ** 2 / 2)]
+        return np.where(rng.random(len(aceptados)) < 0.5, -aceptados, aceptados)
+    return mu + sigma * _rechazo(rng, size, np.sqrt(np.pi / (2 * np.e)), proponer)
+
+
+PASCAL = registrar(Distribucion('pascal', {'n': 1, 'p': 0.5}, _scipy('nbinom', lambda n, p: (n, p)), discreta=True))
+
+
+@PASCAL.muestreador('numpy')
+def _pascal_numpy(rng, size, n, p):
+    return rng.negative_binomial(n, p, size)
+
+
+BINOMIAL = registrar(Distribucion('binomial', {'n': 1, 'p': 0.5}, _scipy('binom', lambda n, p: (n, p)), discreta=True))
+
+
+@BINOMIAL.muestreador('numpy')
+def _binomial_numpy(rng, size, n, p):
+    return rng.binomial(n, p, size)
+
+
+POISSON = registrar(Distribucion('poisson', {'lam': 1}, _scipy('poisson', lambda lam: (lam,)), discreta=True))
+
+
+@POISSON.muestreador('numpy')
+def _poisson_numpy(rng, size, lam):
+    return rng.poisson(lam, size)
+
+
+for _distribucion in (PASCAL, BINOMIAL, POISSON):
+    _muestreadores_por_tabla(_distribucion)
+
+
+class _DistribucionEmpirica(Distribucion):
+    """Distribución discreta dada por sus valores y probabilidades, sin equivalente en scipy.stats."""
+
+    def tabla(self, **kwargs):
+        parametros = self.parametros(kwargs)
+        return parametros['values'], parametros['probabilities']
+
+    def cdf(self, x, **kwargs):
+        return self.empirica(**kwargs).cdf(x)
+
+    def probabilidad(self, x, **kwargs):
+        return self.empirica(**kwargs).probabilidad(x)
+
+
+# np.random.Generator.choice con p= rehace la acumulada en cada llamada: por defecto se usa el alias
+EMPIRICA = registrar(_DistribucionEmpirica('empirical_discrete', {'values': [0, 1], 'probabilities': [0.5, 0.5]},
+                                           discreta=True, metodo_por_defecto='alias'))
+
+
+@EMPIRICA.muestreador('numpy')
+def _empirica_numpy(rng, size, values, probabilities):
+    return rng.choice(values, size=size, p=probabilities)
+
+
+_muestreadores_por_tabla(EMPIRICA)
+
+
+def medir_muestreadores(nombre, size, semilla=0, repeticiones=3, **kwargs):
+    """
+    Mide cada muestreador de una distribución con el mismo tipo de generador y tamaño.
+
+    Retorna:
+        dict: Mejor tiempo en segundos de cada método, entre las repeticiones.
+    """
+    distribucion = obtener(nombre)
+    tiempos = {}
+    for metodo in distribucion.muestreadores:
+        mejor = float('inf')
+        for repeticion in range(repeticiones):
+            rng = np.random.default_rng([semilla, repeticion])
+            inicio = time.perf_counter()
+            distribucion.muestrear(rng, size, metodo, **kwargs)
+            mejor = min(mejor, time.perf_counter() - inicio)
+        tiempos[metodo] = mejor
+    return tiempos
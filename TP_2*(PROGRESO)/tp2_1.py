@@ -0,0 +1,737 @@
+import argparse
+import os
+import random
+import sys
+import time
+from functools import lru_cache, partial
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from comun.perezoso import ModuloPerezoso
+from comun.paralelo import ejecutar_corridas
+from comun.semillas import secuencias_hijas
+
+np = ModuloPerezoso('numpy')
+
+# Valores que avanzan juntos en cada paso de los generadores vectorizados
+CARRILES = 1 << 16
+
+# Números por bloque en el modo streaming
+TAMANO_BLOQUE = 1 << 20
+
+MASCARA_32 = 0xFFFFFFFF
+
+# Divisiones del histograma fino de la batería incremental y máximo de clases del chi-cuadrado
+DIVISIONES_HISTOGRAMA = 1 << 16
+MAX_CLASES_CHI2 = 1 << 10
+
+# Hasta esta cantidad de rezagos la autocorrelación se calcula directamente, O(n·k); con más, por FFT
+REZAGOS_DIRECTOS = 128
+
+# Clases equiprobables del chi-cuadrado de segundo nivel sobre los valores p de las réplicas
+CLASES_SEGUNDO_NIVEL = 10
+
+# Pruebas de la batería y clave de su valor p en el resultado de BateriaIncremental.resultados
+VALORES_P = {'chi2': 'p_value_chi2', 'runs': 'p_value_runs', 'ks': 'p_value_ks'}
+
+METODOS = ('middle_square', 'lcg', 'mersenne_twister', 'xorshift')
+MENSAJE_METODO = "Método no soportado. Usa 'middle_square', 'lcg', 'mersenne_twister' o 'xorshift'."
+
+
+class RandomNumber:
+    def __init__(self, num_numbers, method, **kwargs):
+        self.num_numbers = num_numbers
+        self.method = method
+        self.kwargs = kwargs
+        self.numbers = []
+        # Estado del modo streaming (ver iterar_bloques); None hasta generar el primer bloque
+        self.estado = None
+        # Estado del que parte cada pasada completa, fijado la primera vez (con o sin semilla explícita)
+        self._estado_origen = None
+
+    def generate(self):
+        if self.method == 'middle_square':
+            self.numbers = self.middle_square_method()
+        elif self.method == 'lcg':
+            self.numbers = self.linear_congruential_generator()
+        elif self.method == 'mersenne_twister':
+            self.numbers = self.mersenne_twister()
+        elif self.method == 'xorshift':
+            self.numbers = self.xorshift()
+        else:
+            raise ValueError(MENSAJE_METODO)
+        return self.numbers
+
+    def middle_square_method(self):
+        """Método de los cuadrados medios; la secuencia entra en un ciclo y se repite con NumPy."""
+        seed = self.kwargs.get('seed', int(time.time()))
+        return _bloque_cuadrados_medios(seed, self.num_numbers)
+
+    def linear_congruential_generator(self):
+        """Generador congruencial lineal por carriles: cada carril salta CARRILES pasos a la vez."""
+        seed = self.kwargs.get('seed', int(time.time()))
+        return _bloque_lcg(seed, *self._parametros_lcg(), self.num_numbers)
+
+    def mersenne_twister(self):
+        seed = self.kwargs.get('seed', int(time.time()))
+        random.seed(seed)
+        return [random.randint(0, 2**32 - 1) for _ in range(self.num_numbers)]
+
+    def xorshift(self):
+        """Xorshift por carriles: el salto de CARRILES pasos es lineal en GF(2) y se aplica por tablas de bytes."""
+        seed = self.kwargs.get('seed', int(time.time()))
+        return _bloque_xorshift(seed, self.num_numbers)
+
+    def _parametros_lcg(self):
+        return self.kwargs.get('a', 1103515245), self.kwargs.get('c', 12345), self.kwargs.get('m', 2**31)
+
+    def iterar_bloques(self, tamano_bloque=TAMANO_BLOQUE):
+        """
+        Genera los num_numbers números en bloques NumPy de tamano_bloque (el último puede ser menor),
+        sin guardarlos: la memoria no depende de num_numbers.
+
+        La secuencia es la misma que la de generate. Después de cada bloque, guardar_estado permite
+        reanudarla desde ese punto en otra instancia con restaurar_estado. Una vez generados los
+        num_numbers, una nueva iteración vuelve a empezar la misma secuencia desde la semilla.
+        """
+        if self.method not in METODOS:
+            raise ValueError(MENSAJE_METODO)
+        if tamano_bloque < 1:
+            raise ValueError("El tamaño de bloque debe ser positivo.")
+        if self.estado is None or self.estado['generados'] >= self.num_numbers:
+            self.estado = self._estado_inicial()
+        while self.estado['generados'] < self.num_numbers:
+            bloque = self._siguiente_bloque(min(tamano_bloque, self.num_numbers - self.estado['generados']))
+            yield bloque
+
+    def guardar_estado(self):
+        """Copia del estado del modo streaming, serializable con pickle o JSON (salvo mersenne_twister, solo pickle)."""
+        if self.estado is None:
+            self.estado = self._estado_inicial()
+        return dict(self.estado)
+
+    def restaurar_estado(self, estado):
+        """Continúa la secuencia desde un estado devuelto por guardar_estado."""
+        if estado['method'] != self.method:
+            raise ValueError(f"El estado es del método {estado['method']}, no de {self.method}.")
+        self.estado = dict(estado)
+
+    def _estado_inicial(self):
+        if self._estado_origen is None:
+            seed = self.kwargs.get('seed', int(time.time()))
+            if self.method == 'mersenne_twister':
+                # Generador propio: random.Random(seed) da la misma secuencia que random.seed(seed)
+                seed = random.Random(seed).getstate()
+            # x es el último número generado, o la semilla si todavía no se generó ninguno
+            self._estado_origen = {'method': self.method, 'generados': 0, 'x': seed}
+        return dict(self._estado_origen)
+
+    def _siguiente_bloque(self, cantidad):
+        x = self.estado['x']
+        if self.method == 'middle_square':
+            bloque = _bloque_cuadrados_medios(x, cantidad)
+        elif self.method == 'lcg':
+            bloque = _bloque_lcg(x, *self._parametros_lcg(), cantidad)
+        elif self.method == 'xorshift':
+            bloque = _bloque_xorshift(x, cantidad)
+        else:
+            generador = random.Random()
+            generador.setstate(x)
+            bloque = np.array([generador.randint(0, 2**32 - 1) for _ in range(cantidad)], dtype=np.int64)
+        self.estado = {'method': self.method, 'generados': self.estado['generados'] + cantidad,
+                       'x': generador.getstate() if self.method == 'mersenne_twister' else int(bloque[-1])}
+        return bloque
+
+    def rango(self):
+        """Intervalo [bajo, alto) de los valores que produce el método."""
+        if self.method == 'middle_square':
+            return 0, 10000
+        if self.method == 'lcg':
+            return 0, self._parametros_lcg()[2]
+        if self.method == 'xorshift' and not 0 <= self.kwargs.get('seed', 0) < 2**32:
+            return 0, 2**64
+        return 0, 2**32
+
+    def probar(self, tamano_bloque=TAMANO_BLOQUE, rezagos=(1,)):
+        """
+        Corre la batería incremental en una pasada: sobre self.numbers si ya se generaron,
+        o sobre los bloques de iterar_bloques sin guardarlos.
+        """
+        bateria = BateriaIncremental(*self.rango(), rezagos=rezagos)
+        if len(self.numbers):
+            numeros = np.asarray(self.numbers)
+            for inicio in range(0, len(numeros), tamano_bloque):
+                bateria.actualizar(numeros[inicio:inicio + tamano_bloque])
+        else:
+            for bloque in self.iterar_bloques(tamano_bloque):
+                bateria.actualizar(bloque)
+        return dict(bateria.resultados(), method=self.method)
+
+    def chi_square_test(self):
+        from scipy.stats import chisquare
+        observed_freq, _ = np.histogram(self.numbers, bins='auto')
+        expected_freq = np.full_like(observed_freq, np.mean(observed_freq))
+        observed_sum = observed_freq.sum()
+        expected_sum = expected_freq.sum()
+        if observed_sum != expected_sum:
+            scale_factor = observed_sum / expected_sum
+            expected_freq = expected_freq * scale_factor
+        chi2_stat, p_value = chisquare(observed_freq, expected_freq)
+        return chi2_stat, p_value
+
+    def runs_test(self):
+        """Prueba de rachas respecto de la mediana teórica del rango; la calcula la batería incremental."""
+        resultados = self.probar()
+        return resultados['runs_stat'], resultados['p_value_runs']
+
+    def autocorrelation_test(self, lag=1):
+        # Un solo rezago: producto escalar directo, O(n), en lugar de la correlación completa O(n²)
+        y = np.asarray(self.numbers, dtype=np.float64)
+        y = y - y.mean()
+        return float(np.dot(y[:len(y) - lag], y[lag:]) / np.dot(y, y))
+
+    def analisis_autocorrelacion(self, max_rezago=1000, confianza=0.95, metodo='auto'):
+        """Autocorrelación de los rezagos 1..max_rezago con sus límites de confianza y la prueba de Ljung-Box."""
+        autocorr = autocorrelaciones(self.numbers, max_rezago, metodo)
+        return analizar_autocorrelaciones(np.arange(1, len(autocorr)), autocorr[1:], len(self.numbers), confianza)
+
+    def ks_test(self):
+        from scipy.stats import kstest
+        d_stat, p_value = kstest(self.numbers, 'uniform', args=(min(self.numbers), max(self.numbers) - min(self.numbers)))
+        return d_stat, p_value
+
+
+class BateriaIncremental:
+    """
+    Pruebas de uniformidad e independencia acumuladas bloque a bloque, en una pasada.
+
+    Los valores se llevan a u = (x - bajo) / (alto - bajo) en [0, 1). Por bloque se actualizan
+    un histograma fino (chi-cuadrado y Kolmogorov-Smirnov en los bordes de las divisiones), las
+    rachas respecto de la mediana teórica 0.5 y las sumas de productos rezagados (autocorrelación exacta).
+    """
+
+    def __init__(self, bajo, alto, rezagos=(1,), divisiones=DIVISIONES_HISTOGRAMA):
+        if alto <= bajo:
+            raise ValueError("El rango de valores debe ser no vacío.")
+        if divisiones < 2 or divisiones & (divisiones - 1):
+            raise ValueError("Las divisiones del histograma deben ser una potencia de dos.")
+        if not rezagos or min(rezagos) < 1:
+            raise ValueError("Los rezagos deben ser enteros positivos.")
+        self.bajo = bajo
+        self.ancho = alto - bajo
+        self.rezagos = tuple(rezagos)
+        self.divisiones = divisiones
+        self.n = 0
+        self.conteos = np.zeros(divisiones, dtype=np.int64)
+        self.altos = 0
+        self.rachas = 0
+        self.ultimo_alto = None
+        # Sumas de y = u - 0.5 (centrado en la media teórica para no perder precisión)
+        self.suma = 0.0
+        self.suma_cuadrados = 0.0
+        self.productos = {k: 0.0 for k in self.rezagos}
+        # Primeros y últimos max(rezagos) valores, para las sumas parciales y los productos entre bloques
+        self.cabeza = np.empty(0)
+        self.cola = np.empty(0)
+
+    def _indices(self, x):
+        """División del histograma fino de cada valor (aritmética entera cuando es exacta)."""
+        if self.ancho < 2**47 and x.dtype.kind in 'iu':
+            return (x.astype(np.int64) - self.bajo) * self.divisiones // self.ancho
+        u = (np.asarray(x, dtype=np.float64) - self.bajo) / self.ancho
+        return np.clip((u * self.divisiones).astype(np.int64), 0, self.divisiones - 1)
+
+    def actualizar(self, bloque):
+        """Incorpora un bloque de valores, en el orden de la secuencia."""
+        bloque = np.asarray(bloque)
+        if bloque.dtype == object:
+            bloque = bloque.astype(np.float64)
+        if not len(bloque):
+            return self
+        self.conteos += np.bincount(self._indices(bloque), minlength=self.divisiones)
+        y = (bloque.astype(np.float64) - self.bajo) / self.ancho - 0.5
+
+        altos = y >= 0
+        self.altos += int(np.count_nonzero(altos))
+        self.rachas += int(np.count_nonzero(altos[1:] != altos[:-1]))
+        if self.ultimo_alto is None:
+            self.rachas += 1
+        elif self.ultimo_alto != altos[0]:
+            self.rachas += 1
+        self.ultimo_alto = bool(altos[-1])
+
+        self.suma += float(y.sum())
+        self.suma_cuadrados += float(np.dot(y, y))
+        extendido = np.concatenate([self.cola, y])
+        previos = len(self.cola)
+        maximo = max(self.rezagos)
+        if len(self.rezagos) > REZAGOS_DIRECTOS:
+            sumas = _productos_rezagados_fft(extendido, previos, maximo)
+            for k in self.rezagos:
+                self.productos[k] += float(sumas[k - 1])
+        else:
+            for k in self.rezagos:
+                desde = max(0, previos - k)
+                if len(extendido) - k > desde:
+                    self.productos[k] += float(np.dot(extendido[desde:len(extendido) - k], extendido[desde + k:]))
+        if len(self.cabeza) < maximo:
+            self.cabeza = np.concatenate([self.cabeza, y[:maximo - len(self.cabeza)]])
+        self.cola = extendido[-maximo:].copy()
+        self.n += len(bloque)
+        return self
+
+    def _probabilidades(self):
+        """Probabilidad de cada división si los valores son enteros uniformes en [bajo, alto)."""
+        if self.ancho >= 2**47:
+            return np.full(self.divisiones, 1 / self.divisiones)
+        bordes = (np.arange(self.divisiones + 1, dtype=np.int64) * self.ancho + self.divisiones - 1) // self.divisiones
+        return np.diff(bordes) / self.ancho
+
+    def resultados(self, confianza=0.95):
+        """Estadísticos y valores p de todas las pruebas con los valores acumulados."""
+        from scipy.stats import chi2, kstwo, norm
+        n = self.n
+        if n < 2:
+            raise ValueError("Se necesitan al menos dos valores.")
+
+        # Chi-cuadrado sobre clases que agrupan divisiones contiguas, con al menos 5 esperados por clase
+        clases = 2
+        while clases * 2 <= min(self.divisiones, MAX_CLASES_CHI2) and n // (clases * 2) >= 5:
+            clases *= 2
+        observados = self.conteos.reshape(clases, -1).sum(axis=1)
+        esperados = self._probabilidades().reshape(clases, -1).sum(axis=1) * n
+        validas = esperados > 0
+        chi2_stat = float(np.sum((observados[validas] - esperados[validas]) ** 2 / esperados[validas]))
+        p_value_chi2 = float(chi2.sf(chi2_stat, np.count_nonzero(validas) - 1))
+
+        n1, n2 = self.altos, n - self.altos
+        if n1 and n2:
+            expected_runs = 2 * n1 * n2 / n + 1
+            std_runs = np.sqrt(2 * n1 * n2 * (2 * n1 * n2 - n) / (n ** 2 * (n - 1)))
+            runs_stat = float((self.rachas - expected_runs) / std_runs)
+            p_value_runs = float(2 * norm.sf(abs(runs_stat)))
+        else:
+            runs_stat = p_value_runs = None
+
+        media = self.suma / n
+        varianza = self.suma_cuadrados / n - media ** 2
+        autocorr = {}
+        for k in self.rezagos:
+            if k >= n or varianza <= 0:
+                autocorr[k] = None
+                continue
+            primeros = self.suma - float(self.cola[len(self.cola) - k:].sum())
+            ultimos = self.suma - float(self.cabeza[:k].sum())
+            autocovarianza = self.productos[k] - media * (primeros + ultimos) + (n - k) * media ** 2
+            autocorr[k] = autocovarianza / (varianza * n)
+
+        # D exacto en los bordes de las divisiones (cota inferior del D completo) y cota superior,
+        # porque dentro de una división F_n y F varían a lo sumo hasta sus bordes. La cota superior
+        # excede a D en hasta 1 / divisiones, que en sqrt(n) D crece con n; la inferior se aparta en
+        # el orden de las fluctuaciones dentro de una división, sqrt(n) D ~ 1 / sqrt(divisiones) sin
+        # importar n, así que es la que se usa para el valor p
+        acumulada = np.concatenate([[0], np.cumsum(self.conteos)]) / n
+        bordes = np.concatenate([[0], np.cumsum(self._probabilidades())])
+        ks_stat = float(np.max(np.abs(acumulada - bordes)))
+        ks_stat_superior = float(max(np.max(acumulada[1:] - bordes[:-1]), np.max(bordes[1:] - acumulada[:-1])))
+        p_value_ks = float(kstwo.sf(ks_stat, n))
+
+        return {
+            "n": n,
+            "chi_square_stat": chi2_stat,
+            "p_value_chi2": p_value_chi2,
+            "runs_stat": runs_stat,
+            "p_value_runs": p_value_runs,
+            "autocorr": autocorr[self.rezagos[0]],
+            "autocorr_rezagos": autocorr,
+            "analisis_autocorrelacion": analizar_autocorrelaciones(
+                np.array([k for k in self.rezagos if autocorr[k] is not None], dtype=np.int64),
+                np.array([autocorr[k] for k in self.rezagos if autocorr[k] is not None]), n, confianza),
+            "ks_stat": ks_stat,
+            "ks_stat_superior": ks_stat_superior,
+            "p_value_ks": p_value_ks
+        }
+
+
+def autocorrelaciones(numeros, max_rezago, metodo='auto'):
+    """
+    Autocorrelaciones r_0..r_max_rezago (índice = rezago), con la definición de autocorrelation_test.
+
+    metodo 'directo' calcula cada rezago con un producto escalar, O(n·k); 'fft' calcula todos
+    juntos con la transformada rápida, O(n log n); 'auto' elige según REZAGOS_DIRECTOS.
+    """
+    y = np.asarray(numeros, dtype=np.float64)
+    n = len(y)
+    if n < 2:
+        raise ValueError("Se necesitan al menos dos valores.")
+    if max_rezago < 0:
+        raise ValueError("El rezago máximo no puede ser negativo.")
+    y = y - y.mean()
+    max_rezago = min(max_rezago, n - 1)
+    if metodo == 'auto':
+        metodo = 'directo' if max_rezago <= REZAGOS_DIRECTOS else 'fft'
+    if metodo == 'directo':
+        covarianzas = np.array([np.dot(y[:n - k], y[k:]) for k in range(max_rezago + 1)])
+    elif metodo == 'fft':
+        from scipy.fft import irfft, next_fast_len, rfft
+        # Con al menos n + max_rezago puntos la correlación circular no mezcla los rezagos pedidos
+        largo = next_fast_len(n + max_rezago, real=True)
+        espectro = rfft(y, largo)
+        covarianzas = irfft(espectro.real ** 2 + espectro.imag ** 2, largo)[:max_rezago + 1]
+    else:
+        raise ValueError("El método debe ser 'auto', 'directo' o 'fft'.")
+    # Denominador var * n de la definición original
+    return covarianzas / np.dot(y, y)
+
+
+def analizar_autocorrelaciones(rezagos, autocorr, n, confianza=0.95):
+    """
+    Límites de confianza por rezago y prueba de Ljung-Box para autocorrelaciones de n valores.
+
+    Bajo independencia r_k es aproximadamente normal con media -1/n y varianza (n - k) / n**2.
+    """
+    from scipy.stats import chi2, norm
+    rezagos = np.asarray(rezagos)
+    autocorr = np.asarray(autocorr, dtype=np.float64)
+    radio = norm.ppf((1 + confianza) / 2) * np.sqrt(n - rezagos) / n
+    limite_inferior = -1 / n - radio
+    limite_superior = -1 / n + radio
+    ljung_box = float(n * (n + 2) * np.sum(autocorr ** 2 / (n - rezagos)))
+    return {
+        "rezagos": rezagos,
+        "autocorr": autocorr,
+        "limite_inferior": limite_inferior,
+        "limite_superior": limite_superior,
+        "fuera_de_limites": rezagos[(autocorr < limite_inferior) | (autocorr > limite_superior)],
+        "ljung_box_stat": ljung_box,
+        "p_value_ljung_box": float(chi2.sf(ljung_box, len(rezagos))) if len(rezagos) else None
+    }
+
+
+def _productos_rezagados_fft(extendido, previos, max_rezago):
+    """
+    Sumas de extendido[j - k] * extendido[j] para j >= previos y k = 1..max_rezago, con una convolución.
+    """
+    from scipy.signal import fftconvolve
+    nuevos = extendido[previos:]
+    convolucion = fftconvolve(extendido, nuevos[::-1])
+    indices = len(extendido) - 1 - np.arange(1, max_rezago + 1)
+    sumas = np.zeros(max_rezago)
+    validos = indices >= 0
+    sumas[validos] = convolucion[indices[validos]]
+    return sumas
+
+
+def _bloque_cuadrados_medios(x, cantidad):
+    """Los cantidad números de cuadrados medios que siguen a x."""
+    if cantidad <= 0:
+        return np.empty(0, dtype=np.int64)
+    # Primer paso con la definición original: la semilla puede tener más de cuatro dígitos
+    x = int(str(x ** 2).zfill(8)[2:6])
+    # Desde ahí los estados tienen cuatro dígitos y los cuatro centrales de x**2 son (x**2 // 100) % 10000
+    siguiente = (np.arange(10000, dtype=np.int64) ** 2 // 100) % 10000
+    posicion = np.full(10000, -1, dtype=np.int64)
+    prefijo = []
+    while len(prefijo) < cantidad and posicion[x] < 0:
+        posicion[x] = len(prefijo)
+        prefijo.append(x)
+        x = int(siguiente[x])
+    prefijo = np.array(prefijo, dtype=np.int64)
+    if len(prefijo) == cantidad:
+        return prefijo
+    ciclo = prefijo[posicion[x]:]
+    resto = cantidad - len(prefijo)
+    return np.concatenate([prefijo, np.tile(ciclo, -(-resto // len(ciclo)))[:resto]])
+
+
+def _bloque_lcg(x, a, c, m, cantidad):
+    """Los cantidad números del generador congruencial lineal que siguen a x."""
+    if not (0 < m <= 2**32 or m & (m - 1) == 0 and m <= 2**64):
+        # Los productos no entran en 64 bits: se usa la definición secuencial
+        return np.array(_lcg_lista(x, a, c, m, cantidad))
+    carriles = min(cantidad, CARRILES)
+    if carriles <= 0:
+        return np.empty(0, dtype=np.int64)
+    bloque = np.empty((-(-cantidad // carriles), carriles), dtype=np.uint64)
+    primera = bloque[0]
+    primera[0] = (a * x + c) % m
+    a, c = a % m, c % m
+    # Primera fila por duplicación: los valores hechos[0:k] saltan k pasos hasta hechos[k:2k]
+    hechos = 1
+    while hechos < carriles:
+        k = min(hechos, carriles - hechos)
+        _saltar_lcg(primera[:k], primera[hechos:hechos + k], *_salto_lcg(a, c, m, hechos), m)
+        hechos += k
+    # x[k + carriles] = (A * x[k] + C) mod m
+    A, C = _salto_lcg(a, c, m, carriles)
+    for anterior, fila in zip(bloque, bloque[1:]):
+        _saltar_lcg(anterior, fila, A, C, m)
+    numeros = bloque.reshape(-1)[:cantidad]
+    return numeros.astype(np.int64) if m <= 2**63 else numeros
+
+
+def _saltar_lcg(origen, destino, A, C, m):
+    np.multiply(origen, np.uint64(A), out=destino)
+    destino += np.uint64(C)
+    if m & (m - 1) == 0:
+        # Con m divisor de 2**64 el desborde de uint64 no altera el resto
+        destino &= np.uint64(m - 1)
+    else:
+        # A, x y C son menores que m <= 2**32: la cuenta entra en 64 bits
+        destino %= np.uint64(m)
+
+
+def _lcg_lista(x, a, c, m, cantidad):
+    """Definición secuencial del generador congruencial lineal."""
+    numeros = []
+    for _ in range(cantidad):
+        x = (a * x + c) % m
+        numeros.append(x)
+    return numeros
+
+
+def _salto_lcg(a, c, m, pasos):
+    """Coeficientes (A, C) de pasos aplicaciones de x -> (a * x + c) mod m, por duplicación."""
+    A, C = 1, 0
+    while pasos:
+        if pasos & 1:
+            A, C = (a * A) % m, (a * C + c) % m
+        a, c = (a * a) % m, (a * c + c) % m
+        pasos >>= 1
+    return A, C
+
+
+def _bloque_xorshift(x, cantidad):
+    """Los cantidad números de xorshift que siguen a x."""
+    if not 0 <= x < 2**64:
+        return np.array(_xorshift_lista(x, cantidad))
+    carriles = min(cantidad, CARRILES)
+    if carriles <= 0:
+        return np.empty(0, dtype=np.int64)
+    # Con un estado de 32 bits los siguientes nunca pasan de 32 bits
+    octetos = 4 if x < 2**32 else 8
+    # Little-endian explícito para leer el byte j de cada estado con una vista uint8
+    bloque = np.empty((-(-cantidad // carriles), carriles), dtype='<u8')
+    primera = bloque[0]
+    primera[0] = _xorshift_lista(x, 1)[0]
+    hechos = 1
+    while hechos < carriles:
+        k = min(hechos, carriles - hechos)
+        _saltar_xorshift(primera[:k], primera[hechos:hechos + k], _tablas_salto_xorshift(hechos, octetos))
+        hechos += k
+    tablas = _tablas_salto_xorshift(carriles, octetos)
+    for anterior, fila in zip(bloque, bloque[1:]):
+        _saltar_xorshift(anterior, fila, tablas)
+    numeros = bloque.reshape(-1)[:cantidad]
+    return numeros.astype(np.int64) if x < 2**63 else numeros
+
+
+def _saltar_xorshift(origen, destino, tablas):
+    octetos = origen.view(np.uint8).reshape(len(origen), 8)
+    np.take(tablas[0], octetos[:, 0], out=destino)
+    for j in range(1, len(tablas)):
+        destino ^= tablas[j][octetos[:, j]]
+
+
+def _xorshift_lista(x, cantidad):
+    """Definición secuencial de xorshift."""
+    numeros = []
+    for _ in range(cantidad):
+        x ^= (x << 13) & MASCARA_32
+        x ^= (x >> 17)
+        x ^= (x << 5) & MASCARA_32
+        numeros.append(x)
+    return numeros
+
+
+def _paso_xorshift(x):
+    x = x ^ ((x << np.uint64(13)) & np.uint64(MASCARA_32))
+    x ^= x >> np.uint64(17)
+    return x ^ ((x << np.uint64(5)) & np.uint64(MASCARA_32))
+
+
+def _aplicar_lineal(columnas, x):
+    """Aplica la transformación lineal en GF(2) cuya imagen del bit b es columnas[b]."""
+    y = np.zeros_like(x)
+    for b, columna in enumerate(columnas):
+        y ^= np.where((x >> np.uint64(b)) & np.uint64(1), columna, np.uint64(0))
+    return y
+
+
+@lru_cache(maxsize=64)
+def _tablas_salto_xorshift(pasos, octetos):
+    """Tablas de 256 entradas por byte del estado con la imagen de pasos pasos de xorshift."""
+    base = np.uint64(1) << np.arange(64, dtype=np.uint64)
+    potencia = _paso_xorshift(base)
+    salto = base
+    while pasos:
+        if pasos & 1:
+            salto = _aplicar_lineal(potencia, salto)
+        potencia = _aplicar_lineal(potencia, potencia)
+        pasos >>= 1
+    valores = np.arange(256, dtype=np.uint64)
+    return tuple(_aplicar_lineal(salto, valores << np.uint64(8 * j)) for j in range(octetos))
+
+
+# Función para ejecutar pruebas y recolectar resultados
+def run_tests(rng):
+    """
+    Corre todas las pruebas en una sola pasada con la batería incremental (ver RandomNumber.probar).
+
+    Retorna:
+        dict: Resultados de BateriaIncremental.resultados más el método.
+    """
+    return rng.probar()
+
+def ajustar_semilla(method, semilla, m=2**31):
+    """Lleva una semilla entera no negativa al dominio que acepta cada método."""
+    if method == 'middle_square':
+        # Los cuadrados medios trabajan con semillas de cuatro dígitos
+        return 1000 + semilla % 9000
+    if method == 'lcg':
+        return semilla % m
+    if method == 'xorshift':
+        # El estado cero es un punto fijo
+        return semilla or 1
+    return semilla
+
+
+def valores_p(resultados):
+    """Valor p de cada prueba de la batería; la autocorrelación usa el de Ljung-Box."""
+    valores = {prueba: resultados[clave] for prueba, clave in VALORES_P.items()}
+    valores['autocorr'] = resultados['analisis_autocorrelacion']['p_value_ljung_box']
+    return valores
+
+
+def _replica_bateria(method, num_numbers, tamano_bloque, rezagos, kwargs, secuencia):
+    """Una réplica de la batería con la semilla de su secuencia; puede ejecutarse en los procesos del pool."""
+    semilla = ajustar_semilla(method, int(secuencia.generate_state(1)[0]), kwargs.get('m', 2**31))
+    rng = RandomNumber(num_numbers, method, **dict(kwargs, seed=semilla))
+    return valores_p(rng.probar(tamano_bloque, rezagos))
+
+
+def replicar_bateria(method, num_numbers, replicas, semilla=None, workers=1, tamano_bloque=TAMANO_BLOQUE,
+                     rezagos=(1,), **kwargs):
+    """
+    Corre la batería sobre replicas secuencias independientes del método, repartidas entre procesos.
+
+    La réplica i toma su semilla de la i-ésima secuencia hija de semilla, así que los valores p
+    son los mismos con cualquier cantidad de workers.
+
+    Retorna:
+        dict: Arreglo con el valor p de cada réplica por prueba (NaN donde la prueba no se pudo calcular).
+    """
+    if method not in METODOS:
+        raise ValueError(MENSAJE_METODO)
+    if replicas < 1 or workers < 1:
+        raise ValueError("Las réplicas y los workers deben ser enteros positivos.")
+    funcion = partial(_replica_bateria, method, num_numbers, tamano_bloque, tuple(rezagos), kwargs)
+    replicados = ejecutar_corridas(funcion, secuencias_hijas(replicas, semilla), workers)
+    return {prueba: np.array([np.nan if replica[prueba] is None else replica[prueba] for replica in replicados])
+            for prueba in replicados[0]}
+
+
+def analisis_segundo_nivel(valores_p_replicas, alfa=0.01, clases=CLASES_SEGUNDO_NIVEL):
+    """
+    Prueba de segundo nivel: bajo la hipótesis nula los valores p de las réplicas son uniformes en [0, 1].
+
+    Por prueba aplica K-S contra la uniforme y un chi-cuadrado sobre clases equiprobables
+    (menos de clases si no alcanzan 5 esperados por clase). La prueba se aprueba si ninguno
+    de los dos rechaza al nivel alfa.
+
+    Retorna:
+        dict: Por prueba, 'replicas' válidas, estadísticos y valores p de segundo nivel, 'aprobada'.
+    """
+    from scipy.stats import chisquare, kstest
+    analisis = {}
+    for prueba, valores in valores_p_replicas.items():
+        valores = valores[~np.isnan(valores)]
+        if len(valores) < 2:
+            analisis[prueba] = {'replicas': len(valores), 'ks_stat': None, 'p_value_ks': None,
+                                'chi_square_stat': None, 'p_value_chi2': None, 'aprobada': None}
+            continue
+        ks_stat, p_value_ks = kstest(valores, 'uniform')
+        cantidad = max(2, min(clases, len(valores) // 5))
+        observados = np.bincount(np.minimum((valores * cantidad).astype(np.int64), cantidad - 1), minlength=cantidad)
+        chi2_stat, p_value_chi2 = chisquare(observados)
+        analisis[prueba] = {'replicas': len(valores), 'ks_stat': float(ks_stat), 'p_value_ks': float(p_value_ks),
+                            'chi_square_stat': float(chi2_stat), 'p_value_chi2': float(p_value_chi2),
+                            'aprobada': bool(p_value_ks > alfa and p_value_chi2 > alfa)}
+    return analisis
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Pruebas de generadores de números pseudoaleatorios')
+    parser.add_argument('-n', '--numeros', type=int, default=10000,
+                        help='Cantidad de números por generador o por réplica (por defecto: 10000)')
+    parser.add_argument('-r', '--replicas', type=int, default=0,
+                        help='Réplicas independientes de la batería por método, con prueba de segundo nivel '
+                             'sobre sus valores p (por defecto: 0, una sola corrida)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Cantidad de procesos para repartir las réplicas (por defecto: 1)')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Semilla raíz de las réplicas (por defecto: aleatoria)')
+    parser.add_argument('--alfa', type=float, default=0.01,
+                        help='Nivel de significación de la prueba de segundo nivel (por defecto: 0.01)')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.numeros < 2:
+            raise ValueError("-n debe ser un entero mayor que 1")
+        if args.replicas < 0:
+            raise ValueError("-r debe ser un entero no negativo")
+        if args.workers < 1:
+            raise ValueError("--workers debe ser un entero positivo")
+        if not 0 < args.alfa < 1:
+            raise ValueError("--alfa debe estar entre 0 y 1")
+    except ValueError as ve:
+        print("Error en los argumentos de entrada:", ve)
+        return None
+
+    if args.replicas:
+        return main_replicas(args)
+
+    num_numbers = args.numeros  # Ajusta el número de números a generar
+
+    methods = ['middle_square', 'lcg', 'mersenne_twister', 'xorshift']
+    results = []
+    for method in methods:
+        # Sin generate: la batería recorre los bloques sin guardar los números
+        rng = RandomNumber(num_numbers, method)
+        result = run_tests(rng)
+        results.append(result)
+
+    # Crear tabla de resultados
+    print("\nTabla de resultados:\n")
+    print(f"{'Generador':<20} {'Chi-Square':<15} {'Runs Test':<15} {'Autocorr':<15} {'K-S Test':<15}")
+    print("=" * 80)
+    for result in results:
+        chi2 = f"{result['p_value_chi2']:<15.4f}" if result['p_value_chi2'] is not None else "N/A".ljust(15)
+        runs = f"{result['p_value_runs']:<15.4f}" if result['p_value_runs'] is not None else "N/A".ljust(15)
+        autocorr = f"{result['autocorr']:<15.4f}" if result['autocorr'] is not None else "N/A".ljust(15)
+        ks = f"{result['p_value_ks']:<15.4f}" if result['p_value_ks'] is not None else "N/A".ljust(15)
+
+        print(f"{result['method']:<20} {chi2} {runs} {autocorr} {ks}")
+    return results
+
+
+def main_replicas(args):
+    analisis = {}
+    for method in METODOS:
+        replicas = replicar_bateria(method, args.numeros, args.replicas, args.seed, args.workers)
+        analisis[method] = analisis_segundo_nivel(replicas, args.alfa)
+
+    print(f"\nSegundo nivel: uniformidad de {args.replicas} valores p por prueba "
+          f"(n={args.numeros}, alfa={args.alfa}):\n")
+    print(f"{'Generador':<20} {'Prueba':<10} {'K-S':<15} {'Chi-Square':<15} {'Veredicto':<10}")
+    print("=" * 70)
+    for method, pruebas in analisis.items():
+        for prueba, resultado in pruebas.items():
+            ks = f"{resultado['p_value_ks']:<15.4f}" if resultado['p_value_ks'] is not None else "N/A".ljust(15)
+            chi2 = f"{resultado['p_value_chi2']:<15.4f}" if resultado['p_value_chi2'] is not None else "N/A".ljust(15)
+            veredicto = {True: 'aprueba', False: 'rechaza', None: 'N/A'}[resultado['aprobada']]
+            print(f"{method:<20} {prueba:<10} {ks} {chi2} {veredicto:<10}")
+    return analisis
+
+
+if __name__ == "__main__":
+    main()
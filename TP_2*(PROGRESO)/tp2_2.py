@@ -0,0 +1,164 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from comun.perezoso import ModuloPerezoso
+from distribuciones import obtener
+
+np = ModuloPerezoso('numpy')
+
+# Frecuencia esperada mínima de cada clase del Chi-Cuadrado
+MINIMO_ESPERADO = 5
+
+
+class RandomNumberGenerator:
+    def __init__(self, dist_name, rng=None, method=None, **kwargs):
+        """
+        dist_name es una distribución de distribuciones.DISTRIBUCIONES, rng el np.random.Generator
+        que consumen los muestreadores (por defecto uno nuevo sin semilla) y method el muestreador
+        ('numpy', 'inversa', 'rechazo' o 'alias', según la distribución; por defecto el de la distribución).
+        """
+        self.dist_name = dist_name
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.method = method
+        self.kwargs = kwargs
+        self.numbers = []
+
+    @property
+    def distribucion(self):
+        return obtener(self.dist_name)
+
+    def generate(self, size=1000):
+        """Genera números pseudoaleatorios según la distribución especificada."""
+        self.numbers = self.distribucion.muestrear(self.rng, size, self.method, **self.kwargs)
+        return self.numbers
+
+    def _cdf(self, x):
+        """Función de distribución acumulada teórica en los puntos x."""
+        return self.distribucion.cdf(x, **self.kwargs)
+
+    def _bordes_clases(self):
+        """
+        Bordes interiores de las clases del Chi-Cuadrado; las colas quedan dentro de la primera y la última.
+
+        Las distribuciones discretas usan una clase por valor (bordes en los semienteros, o en los
+        puntos medios del soporte de la empírica) y las continuas los bordes 'auto' de NumPy.
+        """
+        if self.dist_name == 'empirical_discrete':
+            soporte = np.asarray(self.distribucion.empirica(**self.kwargs).valores, dtype=np.float64)
+            return (soporte[:-1] + soporte[1:]) / 2
+        if self.distribucion.discreta:
+            return np.arange(np.min(self.numbers), np.max(self.numbers)) + 0.5
+        return np.histogram_bin_edges(self.numbers, bins='auto')[1:-1]
+
+    def _expected_frequencies(self, size, bins):
+        """
+        Frecuencias esperadas exactas de las clases separadas por los bordes interiores bins,
+        a partir de la función de distribución (sin muestrear).
+        """
+        probabilidades = np.diff(np.concatenate([[0.0], self._cdf(np.asarray(bins, dtype=np.float64)), [1.0]]))
+        return size * np.maximum(probabilidades, 0.0)
+
+    def chi_square_test(self):
+        """Realiza la prueba de Chi-Cuadrado para comparar las frecuencias observadas con las esperadas."""
+        from scipy.stats import chisquare
+
+        bordes = self._bordes_clases()
+        observed_freq = np.bincount(np.searchsorted(bordes, self.numbers, side='right'), minlength=len(bordes) + 1)
+        expected_freq = self._expected_frequencies(len(self.numbers), bordes)
+        observed_freq, expected_freq = _agrupar_clases(observed_freq, expected_freq)
+        if len(expected_freq) < 2:
+            return None, None
+
+        chi2_stat, p_value = chisquare(observed_freq, expected_freq)
+        return chi2_stat, p_value
+
+    def ks_test(self):
+        """Realiza la prueba de Kolmogorov-Smirnov específica para cada distribución."""
+        return self.distribucion.ks_test(self.numbers, **self.kwargs)
+
+    def custom_empirical_ks_test(self):
+        """
+        Prueba K-S para distribuciones discretas: estadístico sobre todos los puntos del soporte
+        y valor p de Monte Carlo (ver distribuciones.Empirica.ks_test).
+        """
+        return self.distribucion.empirica(**self.kwargs).ks_test(self.numbers)
+
+
+def _agrupar_clases(observados, esperados, minimo=MINIMO_ESPERADO):
+    """Une clases contiguas de izquierda a derecha hasta que cada una espere al menos minimo valores."""
+    grupos_observados, grupos_esperados = [], []
+    observado = esperado = 0
+    for o, e in zip(observados, esperados):
+        observado += o
+        esperado += e
+        if esperado >= minimo:
+            grupos_observados.append(observado)
+            grupos_esperados.append(esperado)
+            observado = esperado = 0
+    if observado or esperado:
+        # El resto no llega al mínimo: se suma a la última clase
+        if grupos_esperados:
+            grupos_observados[-1] += observado
+            grupos_esperados[-1] += esperado
+        else:
+            grupos_observados.append(observado)
+            grupos_esperados.append(esperado)
+    return np.array(grupos_observados, dtype=np.float64), np.array(grupos_esperados)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generación y pruebas de distribuciones de probabilidad')
+    parser.add_argument('-n', '--numeros', type=int, default=1000,
+                        help='Cantidad de números por distribución (por defecto: 1000)')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Semilla de los generadores (por defecto: aleatoria)')
+    args = parser.parse_args(argv)
+    try:
+        if args.numeros < 2:
+            raise ValueError("-n debe ser un entero mayor que 1")
+    except ValueError as ve:
+        print("Error en los argumentos de entrada:", ve)
+        return
+
+    from matplotlib import pyplot as plt
+
+    # Definición de las distribuciones a ser generadas y testeadas
+    distributions = [
+        ('uniform', {'a': 0, 'b': 1}),
+        ('exponential', {'scale': 1}),
+        ('normal', {'mu': 0, 'sigma': 1}),
+        ('pascal', {'n': 10, 'p': 0.5}),
+        ('binomial', {'n': 10, 'p': 0.5}),
+        ('poisson', {'lam': 5}),
+        ('empirical_discrete', {'values': [0, 1], 'probabilities': [0.5, 0.5]})
+    ]
+
+    # Generación y testeo de números para cada distribución
+    for dist_name, params in distributions:
+        rng = RandomNumberGenerator(dist_name, np.random.default_rng(args.seed), **params)
+        numbers = rng.generate(size=args.numeros)
+
+        if dist_name == 'empirical_discrete':
+            # Prueba personalizada para distribuciones empíricas discretas
+            d_stat, p_value = rng.custom_empirical_ks_test()
+            print(f"{dist_name} - Custom Empirical K-S Test: Statistic={d_stat}, p-value={p_value}")
+        else:
+            # Prueba de Kolmogorov-Smirnov
+            d_stat, p_value = rng.ks_test()
+            print(f"{dist_name} - Kolmogorov-Smirnov Test: Statistic={d_stat}, p-value={p_value}")
+
+        # Prueba de Chi-Cuadrado
+        chi2_stat, p_value_chi2 = rng.chi_square_test()
+        print(f"{dist_name} - Chi-Square Test: Statistic={chi2_stat}, p-value={p_value_chi2}")
+
+        # Visualización de la distribución
+        plt.figure()
+        plt.hist(numbers, bins=30, density=True, alpha=0.6, color='g')
+        plt.title(f'{dist_name.capitalize()} Distribution')
+        plt.show()
+
+
+if __name__ == "__main__":
+    main()
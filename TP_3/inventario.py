@@ -1,12 +1,23 @@
-import simpy
-import numpy as np
-import matplotlib.pyplot as plt
+import argparse
+import os
+import sys
 import logging
 
-# Configurar el logger
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from comun.perezoso import ModuloPerezoso
+from comun.graficos import configurar_salida, graficar_corridas, guardar, mostrar_o_guardar, obtener_figura
+from comun.resultados import Resultados
+from comun.secuencial import correr_hasta_precision, describir_informe
+from comun.semillas import generador_numpy, secuencia_raiz, secuencias_hijas
+
+np = ModuloPerezoso('numpy')
+simpy = ModuloPerezoso('simpy')
+
 logger = logging.getLogger(__name__)
 
+# Costos acumulados que se registran cada día, en el orden de las filas de costos_diarios
+COSTOS = ('Costo de Orden', 'Costo de Mantenimiento', 'Costo de Faltante', 'Costo Total')
+
 class ModeloInventario:
     def __init__(self, D, Q, R, i, k, h, p):
         self.D = D  # Demanda anual
@@ -33,15 +44,20 @@ class ModeloInventario:
         logger.info('Valores teóricos calculados: %s', valores_teoricos)
         return valores_teoricos
 
-    def proceso_inventario(self, env, sim_time, costos_diarios):
-        """Proceso de simulación del inventario."""
+    def proceso_inventario(self, env, sim_time, costos_diarios, rng):
+        """
+        Proceso de simulación del inventario; rng es el generador de la corrida.
+
+        costos_diarios es una matriz (len(COSTOS), días) donde se registran los costos
+        acumulados al final de cada día.
+        """
         inventario = self.Q
         costo_orden = 0
         costo_mantenimiento = 0
         costo_faltante = 0
 
         while env.now < sim_time:
-            demanda = np.random.poisson(self.D / 365)
+            demanda = rng.poisson(self.D / 365)
             if inventario >= demanda:
                 inventario -= demanda
             else:
@@ -54,13 +70,11 @@ class ModeloInventario:
                 costo_orden += self.k
 
             # Registrar costos diarios
-            costos_diarios.append({
-                'Día': env.now,
-                'Costo de Orden': costo_orden,
-                'Costo de Mantenimiento': costo_mantenimiento,
-                'Costo de Faltante': costo_faltante,
-                'Costo Total': costo_orden + costo_mantenimiento + costo_faltante
-            })
+            dia = int(env.now)
+            costos_diarios[0, dia] = costo_orden
+            costos_diarios[1, dia] = costo_mantenimiento
+            costos_diarios[2, dia] = costo_faltante
+            costos_diarios[3, dia] = costo_orden + costo_mantenimiento + costo_faltante
 
             yield env.timeout(1)
 
@@ -73,25 +87,127 @@ class ModeloInventario:
         logger.info('Resultados de la simulación: %s', resultados_corrida)
         return resultados_corrida
 
-    def simular_inventario(self, sim_time):
-        """Simula el inventario para un tiempo de simulación dado."""
+    def simular_inventario(self, sim_time, rng=None, costos_diarios=None):
+        """
+        Simula el inventario para un tiempo de simulación dado.
+
+        Retorna el resultado de la corrida y la matriz (len(COSTOS), días) de costos diarios;
+        si se pasa costos_diarios, se escribe ahí en lugar de reservar una nueva.
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        if costos_diarios is None:
+            costos_diarios = np.zeros((len(COSTOS), _cantidad_dias(sim_time)))
         env = simpy.Environment()
-        costos_diarios = []
-        resultado = env.process(self.proceso_inventario(env, sim_time, costos_diarios))
+        resultado = env.process(self.proceso_inventario(env, sim_time, costos_diarios, rng))
         env.run()
         return resultado.value, costos_diarios
 
-    def multiple_corridas(self, num_runs, sim_time):
-        """Realiza múltiples corridas de la simulación."""
+    def simular_lote(self, demandas, costos=None):
+        """
+        Avanza día a día todas las corridas juntas, sin simpy; demandas es la matriz (corridas, días)
+        de demandas diarias ya sorteadas.
+
+        Aplica las mismas reglas y en el mismo orden que proceso_inventario, así que con las mismas
+        demandas los costos coinciden exactamente. Retorna la lista de resultados de cada corrida
+        y la matriz (len(COSTOS), corridas, días) de costos diarios; si se pasa costos, se escribe ahí.
+        """
+        corridas, dias = demandas.shape
+        if costos is None:
+            costos = np.zeros((len(COSTOS), corridas, dias))
+        inventario = np.full(corridas, self.Q, dtype=np.int64)
+        costo_orden = np.zeros(corridas)
+        costo_mantenimiento = np.zeros(corridas)
+        costo_faltante = np.zeros(corridas)
+
+        for dia in range(dias):
+            demanda = demandas[:, dia]
+            faltante = np.maximum(demanda - inventario, 0)
+            costo_faltante += faltante * self.p
+            inventario = np.maximum(inventario - demanda, 0)
+
+            costo_mantenimiento += inventario * self.h / 365
+            reponen = inventario <= self.R
+            inventario[reponen] += self.Q
+            costo_orden[reponen] += self.k
+
+            costos[0, :, dia] = costo_orden
+            costos[1, :, dia] = costo_mantenimiento
+            costos[2, :, dia] = costo_faltante
+            costos[3, :, dia] = costo_orden + costo_mantenimiento + costo_faltante
+
+        finales = np.stack([costo_orden, costo_mantenimiento, costo_faltante,
+                            costo_orden + costo_mantenimiento + costo_faltante], axis=1)
+        return [dict(zip(COSTOS, map(float, fila))) for fila in finales], costos
+
+    def sortear_demandas(self, secuencias, dias):
+        """
+        Matriz (corridas, días) de demandas diarias, una fila por secuencia de semillas.
+
+        Cada fila sale del generador de su corrida en el mismo orden en que proceso_inventario
+        sortea una demanda por día, así que reproduce la corrida de simpy con esa secuencia.
+        """
+        demandas = np.empty((len(secuencias), dias), dtype=np.int64)
+        for corrida, secuencia in enumerate(secuencias):
+            demandas[corrida] = generador_numpy(secuencia).poisson(self.D / 365, dias)
+        return demandas
+
+    def multiple_corridas(self, num_runs, sim_time, semilla=None, vectorizado=True):
+        """
+        Realiza múltiples corridas de la simulación, cada una con su propio generador derivado de semilla.
+
+        Con vectorizado (por defecto) las demandas se sortean de antemano y todas las corridas
+        avanzan juntas con simular_lote; si no, cada corrida es un proceso de simpy. Con la misma
+        semilla los dos caminos dan los mismos costos.
+
+        Retorna la lista de resultados de cada corrida y un contenedor Resultados con la columna
+        'Día' y una matriz (corridas, días) por cada costo de COSTOS.
+        """
         logger.info('Iniciando múltiples corridas: num_runs=%d, sim_time=%d', num_runs, sim_time)
-        resultados = []
-        todos_costos_diarios = []
-        for _ in range(num_runs):
-            resultado, costos_diarios = self.simular_inventario(sim_time)
-            resultados.append(resultado)
-            todos_costos_diarios.append(costos_diarios)
+        dias = _cantidad_dias(sim_time)
+        costos = np.zeros((len(COSTOS), num_runs, dias))
+        secuencias = secuencias_hijas(num_runs, semilla)
+        if vectorizado:
+            resultados, _ = self.simular_lote(self.sortear_demandas(secuencias, dias), costos)
+        else:
+            resultados = []
+            for corrida, secuencia in enumerate(secuencias):
+                resultado, _ = self.simular_inventario(sim_time, generador_numpy(secuencia), costos[:, corrida])
+                resultados.append(resultado)
         logger.info('Resultados de todas las corridas: %s', resultados)
-        return resultados, todos_costos_diarios
+        columnas = {'Día': np.arange(dias)}
+        columnas.update(zip(COSTOS, costos))
+        metadatos = {'D': self.D, 'Q': self.Q, 'R': self.R, 'i': self.i, 'k': self.k, 'h': self.h, 'p': self.p,
+                     'num_runs': num_runs, 'sim_time': sim_time}
+        return resultados, Resultados(columnas, metadatos)
+
+    def corridas_hasta_precision(self, metrica, precision, sim_time, semilla=None, confianza=0.95, lote=10,
+                                 max_corridas=10000, vectorizado=True):
+        """
+        Realiza corridas por lotes hasta estimar el costo final metrica con la precisión pedida.
+
+        Los lotes derivan sus generadores de la misma semilla raíz, así que las corridas
+        coinciden con las de multiple_corridas con la misma semilla y cantidad de corridas.
+
+        Retorna la lista de resultados de cada corrida, el contenedor Resultados de todas ellas
+        y el informe de comun.secuencial.correr_hasta_precision.
+        """
+        if metrica not in COSTOS:
+            raise ValueError(f"Métrica {metrica} no soportada; opciones: {', '.join(COSTOS)}")
+        raiz = secuencia_raiz(semilla)
+        resultados, lotes = [], []
+
+        def simular_lote(cantidad):
+            resultados_lote, costos_lote = self.multiple_corridas(cantidad, sim_time, raiz, vectorizado)
+            resultados.extend(resultados_lote)
+            lotes.append(costos_lote)
+            return [resultado[metrica] for resultado in resultados_lote]
+
+        informe = correr_hasta_precision(simular_lote, precision, confianza, lote, max_corridas)
+        columnas = {'Día': lotes[0]['Día']}
+        columnas.update((costo, np.concatenate([costos[costo] for costos in lotes])) for costo in COSTOS)
+        metadatos = dict(lotes[0].metadatos, num_runs=len(resultados))
+        return resultados, Resultados(columnas, metadatos), informe
 
     def calcular_promedios(self, resultados):
         """Calcula los promedios de los resultados de las corridas."""
@@ -117,7 +233,7 @@ class ModeloInventario:
         x = np.arange(len(categorias))  # La posición de las etiquetas en el eje x
         width = 0.35  # El ancho de las barras
 
-        fig, ax = plt.subplots()
+        fig, ax = obtener_figura('comparacion_costos', figsize=(6.4, 4.8))
         barras_teoricas = ax.bar(x - width/2, valores_teoricos_lista, width, label='Teórico')
         barras_simuladas = ax.bar(x + width/2, valores_simulacion_lista, width, label='Simulado')
 
@@ -142,12 +258,12 @@ class ModeloInventario:
         agregar_etiquetas(barras_teoricas)
         agregar_etiquetas(barras_simuladas)
 
-        plt.show()
+        mostrar_o_guardar(fig, 'comparacion_costos.png')
         logger.info('Gráficos generados y mostrados')
 
     def graficar_evolucion_costos(self, todos_costos_diarios):
-        """Genera gráficos de la evolución de los costos a lo largo del tiempo de simulación."""
-        indicadores = ['Costo de Orden', 'Costo de Mantenimiento', 'Costo de Faltante', 'Costo Total']
+        """Genera gráficos de la evolución de los costos (un Resultados de multiple_corridas)."""
+        indicadores = COSTOS
         titulos = [
             'Evolución del Costo de Orden a lo Largo del Tiempo de Simulación',
             'Evolución del Costo de Mantenimiento a lo Largo del Tiempo de Simulación',
@@ -156,50 +272,107 @@ class ModeloInventario:
         ]
         archivos = ['costo_orden.png', 'costo_mantenimiento.png', 'costo_faltante.png', 'costo_total.png']
 
+        dias = todos_costos_diarios['Día']
         for i, indicador in enumerate(indicadores):
-            plt.figure(figsize=(12, 8))
-            for costos_diarios in todos_costos_diarios:
-                dias = [costo['Día'] for costo in costos_diarios]
-                plt.plot(dias, [costo[indicador] for costo in costos_diarios], alpha=0.5)
-            plt.title(titulos[i])
-            plt.xlabel('Día')
-            plt.ylabel(indicador)
-            plt.savefig(archivos[i])
-            plt.close()
-            logger.info(f'Gráfico de {indicador} generado y guardado como {archivos[i]}')
-
-
-# Parámetros del modelo ajustados para aumentar la probabilidad de faltante
-D = 2000  # Demanda anual
-Q = 100  # Cantidad de pedido
-R = 10  # Punto de reorden
-i = 1  # Costo unitario del producto
-k = 50  # Costo de preparación
-h = 1  # Costo de mantenimiento por unidad por año
-p = 10  # Costo de faltante por unidad
-num_runs = 10  # Número de corridas
-sim_time = 365  # Tiempo de simulación (días)
-
-# Crear instancia del modelo de inventario
-modelo = ModeloInventario(D, Q, R, i, k, h, p)
-
-# Calcular valores teóricos
-valores_teoricos = modelo.calcular_valores_teoricos()
-print("Valores Teóricos:")
-for key, value in valores_teoricos.items():
-    print(f"{key}: {value}")
-
-# Realizar múltiples corridas
-resultados_simulacion, todos_costos_diarios = modelo.multiple_corridas(num_runs, sim_time)
-
-# Calcular promedios de las corridas
-promedios_simulacion = modelo.calcular_promedios(resultados_simulacion)
-print("\nPromedios de Simulación:")
-for key, value in promedios_simulacion.items():
-    print(f"{key}: {value}")
-
-# Generar gráficos comparativos
-modelo.graficar_resultados(valores_teoricos, promedios_simulacion)
-
-# Generar gráficos de la evolución de los costos
-modelo.graficar_evolucion_costos(todos_costos_diarios)
+            fig, ax = obtener_figura('evolucion_costos', figsize=(12, 8))
+            graficar_corridas(ax, dias, todos_costos_diarios[indicador])
+            ax.set_title(titulos[i])
+            ax.set_xlabel('Día')
+            ax.set_ylabel(indicador)
+            ruta = guardar(fig, archivos[i])
+            logger.info(f'Gráfico de {indicador} generado y guardado como {ruta}')
+
+
+def _cantidad_dias(sim_time):
+    # El proceso registra un día por cada unidad de tiempo mientras env.now < sim_time
+    return int(np.ceil(sim_time))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Simulación de un modelo de inventario')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Semilla raíz para reproducir la simulación (por defecto: aleatoria)')
+    parser.add_argument('--output-dir', type=str, default=None,
+                        help='Guarda todos los gráficos en este directorio sin abrir ventanas '
+                             '(por defecto: la comparación se muestra y la evolución se guarda en el directorio actual)')
+    parser.add_argument('--guardar', type=str, default=None,
+                        help='Guarda los costos diarios en este directorio (columnas .npy) o archivo .npz comprimido')
+    parser.add_argument('--precision', type=float, default=None,
+                        help='Semiancho relativo buscado para --metrica; lanza lotes de corridas hasta '
+                             'alcanzarlo (por defecto: 10 corridas fijas)')
+    parser.add_argument('--confianza', type=float, default=0.95,
+                        help='Nivel de confianza del intervalo con --precision (por defecto: 0.95)')
+    parser.add_argument('--metrica', type=str, choices=COSTOS, default='Costo Total',
+                        help='Costo final a estimar con --precision (por defecto: Costo Total)')
+    parser.add_argument('--lote', type=int, default=10,
+                        help='Corridas por lote con --precision (por defecto: 10)')
+    parser.add_argument('--max-corridas', type=int, default=10000,
+                        help='Presupuesto máximo de corridas con --precision (por defecto: 10000)')
+    parser.add_argument('--simpy', action='store_true',
+                        help='Simula cada corrida como un proceso de simpy en lugar de avanzar todas juntas '
+                             'con NumPy; los resultados son los mismos (por defecto: desactivado)')
+    args = parser.parse_args(argv)
+    if args.precision is not None:
+        try:
+            if args.precision <= 0:
+                raise ValueError("--precision debe ser positiva")
+            if not 0 < args.confianza < 1:
+                raise ValueError("--confianza debe estar entre 0 y 1")
+            if args.lote < 2 or args.max_corridas < 2:
+                raise ValueError("--lote y --max-corridas deben ser al menos 2")
+        except ValueError as ve:
+            print("Error en los argumentos de entrada:", ve)
+            return
+
+    # Configurar el logger
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    configurar_salida(args.output_dir)
+
+    # Parámetros del modelo ajustados para aumentar la probabilidad de faltante
+    D = 2000  # Demanda anual
+    Q = 100  # Cantidad de pedido
+    R = 10  # Punto de reorden
+    i = 1  # Costo unitario del producto
+    k = 50  # Costo de preparación
+    h = 1  # Costo de mantenimiento por unidad por año
+    p = 10  # Costo de faltante por unidad
+    num_runs = 10  # Número de corridas
+    sim_time = 365  # Tiempo de simulación (días)
+
+    # Crear instancia del modelo de inventario
+    modelo = ModeloInventario(D, Q, R, i, k, h, p)
+
+    # Calcular valores teóricos
+    valores_teoricos = modelo.calcular_valores_teoricos()
+    print("Valores Teóricos:")
+    for key, value in valores_teoricos.items():
+        print(f"{key}: {value}")
+
+    # Realizar múltiples corridas
+    if args.precision is None:
+        resultados_simulacion, todos_costos_diarios = modelo.multiple_corridas(num_runs, sim_time, args.seed,
+                                                                               not args.simpy)
+    else:
+        resultados_simulacion, todos_costos_diarios, informe = modelo.corridas_hasta_precision(
+            args.metrica, args.precision, sim_time, args.seed, args.confianza, args.lote, args.max_corridas,
+            not args.simpy)
+        print(describir_informe(informe, args.metrica))
+    if args.guardar:
+        logger.info('Costos diarios guardados en %s', todos_costos_diarios.guardar(args.guardar))
+
+    # Calcular promedios de las corridas
+    promedios_simulacion = modelo.calcular_promedios(resultados_simulacion)
+    print("\nPromedios de Simulación:")
+    for key, value in promedios_simulacion.items():
+        print(f"{key}: {value}")
+
+    # Generar gráficos comparativos
+    modelo.graficar_resultados(valores_teoricos, promedios_simulacion)
+
+    # Generar gráficos de la evolución de los costos
+    modelo.graficar_evolucion_costos(todos_costos_diarios)
+    return promedios_simulacion
+
+
+if __name__ == "__main__":
+    main()
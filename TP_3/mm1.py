@@ -1,17 +1,37 @@
-import simpy
+import argparse
+import array
+import os
 import random
-import numpy as np
-import matplotlib.pyplot as plt
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from comun.perezoso import ModuloPerezoso
+from comun.graficos import configurar_salida, mostrar_o_guardar, obtener_figura
+from comun.resultados import Resultados
+from comun.secuencial import correr_hasta_precision, describir_informe
+from comun.semillas import generador_random, secuencia_raiz, secuencias_hijas
+
+np = ModuloPerezoso('numpy')
+simpy = ModuloPerezoso('simpy')
+
+# Métricas por corrida que se pueden estimar con una precisión dada
+METRICAS_PRECISION = ('L', 'L_q', 'W', 'W_q')
+
+# Series de cada corrida que se conservan para guardarlas
+SERIES = ('queue_length', 'wait_times')
 
 
 class MM1Queue:
-    def __init__(self, env, arrival_rate, service_rate):
+    def __init__(self, env, arrival_rate, service_rate, rng=None):
         self.env = env
+        # Generador propio de la corrida; se guarda el método para no buscarlo en cada evento
+        self.expovariate = (rng if rng is not None else random.Random()).expovariate
         self.server = simpy.Resource(env, capacity=1)
         self.arrival_rate = arrival_rate
         self.service_rate = service_rate
-        self.queue_length = []
-        self.wait_times = []
+        # Arreglos tipados y contiguos: 8 bytes por valor en lugar de un objeto por valor
+        self.queue_length = array.array('q')
+        self.wait_times = array.array('d')
         self.customers_served = 0
 
     def process_customer(self, customer):
@@ -20,7 +40,7 @@ class MM1Queue:
             yield request
             wait_time = self.env.now - arrival_time
             self.wait_times.append(wait_time)
-            service_time = random.expovariate(self.service_rate)
+            service_time = self.expovariate(self.service_rate)
             yield self.env.timeout(service_time)
             self.queue_length.append(len(self.server.queue))
             self.customers_served += 1
@@ -28,7 +48,7 @@ class MM1Queue:
     def run(self):
         customer_id = 0
         while True:
-            yield self.env.timeout(random.expovariate(self.arrival_rate))
+            yield self.env.timeout(self.expovariate(self.arrival_rate))
             self.env.process(self.process_customer(customer_id))
             customer_id += 1
 
@@ -64,45 +84,120 @@ def calcular_valores_teoricos(arrival_rate, service_rate, K):
     }
 
 
-def simulate_mm1(arrival_rate, service_rate, num_runs, sim_time, K):
-    avg_customers_in_system = []
-    avg_customers_in_queue = []
-    avg_time_in_system = []
-    avg_time_in_queue = []
-    server_utilization = []
-    P_n = [[] for _ in range(K + 1)]
-    denegacion_count = []
-
-    for _ in range(num_runs):
-        env = simpy.Environment()
-        mm1_queue = MM1Queue(env, arrival_rate, service_rate)
-        env.process(mm1_queue.run())
-        env.run(until=sim_time)
-        avg_customers_in_system.append(
-            np.mean(mm1_queue.queue_length) + np.mean([1 if i < service_rate else 0 for i in mm1_queue.wait_times]))
-        avg_customers_in_queue.append(np.mean(mm1_queue.queue_length))
-        avg_time_in_system.append(np.mean(mm1_queue.wait_times) + (1 / service_rate))
-        avg_time_in_queue.append(np.mean(mm1_queue.wait_times))
-        server_utilization.append(arrival_rate / service_rate)
-        queue_lengths = np.array(mm1_queue.queue_length)
-        for n in range(K + 1):
-            P_n[n].append(np.sum(queue_lengths == n) / len(queue_lengths))
-        denegacion_count.append(np.sum(queue_lengths >= K) / len(queue_lengths))
-
-    P_n_avg = [np.mean(P_n_n) for P_n_n in P_n]
-    P_denegacion_avg = np.mean(denegacion_count)
+def simular_corrida_mm1(arrival_rate, service_rate, sim_time, K, secuencia, conservar_series=False):
+    """
+    Simula una corrida de la cola con el generador derivado de secuencia.
+
+    Retorna un diccionario con L, L_q, W, W_q, rho, P_n y P_denegacion de la corrida;
+    con conservar_series también incluye las series de SERIES como arreglos NumPy.
+    """
+    env = simpy.Environment()
+    mm1_queue = MM1Queue(env, arrival_rate, service_rate, generador_random(secuencia))
+    env.process(mm1_queue.run())
+    env.run(until=sim_time)
+    # Vistas NumPy sobre los arreglos de la corrida, sin copiarlos
+    queue_lengths = np.frombuffer(mm1_queue.queue_length, dtype=np.int64)
+    wait_times = np.frombuffer(mm1_queue.wait_times, dtype=np.float64)
+    corrida = {
+        'L': np.mean(queue_lengths) + np.mean(wait_times < service_rate),
+        'L_q': np.mean(queue_lengths),
+        'W': np.mean(wait_times) + (1 / service_rate),
+        'W_q': np.mean(wait_times),
+        'rho': arrival_rate / service_rate,
+        'P_n': [np.sum(queue_lengths == n) / len(queue_lengths) for n in range(K + 1)],
+        'P_denegacion': np.sum(queue_lengths >= K) / len(queue_lengths)
+    }
+    if conservar_series:
+        corrida['queue_length'], corrida['wait_times'] = queue_lengths, wait_times
+    return corrida
+
 
+def promediar_corridas(corridas, K):
+    """Promedia las métricas de las corridas devueltas por simular_corrida_mm1."""
     return {
-        'L': np.mean(avg_customers_in_system),
-        'L_q': np.mean(avg_customers_in_queue),
-        'W': np.mean(avg_time_in_system),
-        'W_q': np.mean(avg_time_in_queue),
-        'rho': np.mean(server_utilization),
-        'P_n': P_n_avg,
-        'P_denegacion': P_denegacion_avg
+        'L': np.mean([corrida['L'] for corrida in corridas]),
+        'L_q': np.mean([corrida['L_q'] for corrida in corridas]),
+        'W': np.mean([corrida['W'] for corrida in corridas]),
+        'W_q': np.mean([corrida['W_q'] for corrida in corridas]),
+        'rho': np.mean([corrida['rho'] for corrida in corridas]),
+        'P_n': [np.mean([corrida['P_n'][n] for corrida in corridas]) for n in range(K + 1)],
+        'P_denegacion': np.mean([corrida['P_denegacion'] for corrida in corridas])
     }
 
 
+def simulate_mm1(arrival_rate, service_rate, num_runs, sim_time, K, semilla=None, corridas=None):
+    """
+    Simula num_runs corridas y promedia sus métricas.
+
+    Si se pasa la lista corridas, se le agregan las corridas simuladas con sus series.
+    """
+    simuladas = [simular_corrida_mm1(arrival_rate, service_rate, sim_time, K, secuencia, corridas is not None)
+                 for secuencia in secuencias_hijas(num_runs, semilla)]
+    if corridas is not None:
+        corridas.extend(simuladas)
+    return promediar_corridas(simuladas, K)
+
+
+def simulate_mm1_hasta_precision(arrival_rate, service_rate, sim_time, K, metrica, precision, semilla=None,
+                                 confianza=0.95, lote=10, max_corridas=1000, corridas=None):
+    """
+    Realiza corridas por lotes hasta estimar metrica (una de METRICAS_PRECISION) con la precisión pedida.
+
+    Las corridas coinciden con las de simulate_mm1 con la misma semilla y cantidad de corridas.
+    Con una tasa de arribo inestable la métrica no converge y se agota el presupuesto.
+    Si se pasa la lista corridas, se le agregan las corridas simuladas con sus series.
+
+    Retorna el promedio de las corridas (como simulate_mm1) y el informe de
+    comun.secuencial.correr_hasta_precision.
+    """
+    if metrica not in METRICAS_PRECISION:
+        raise ValueError(f"Métrica {metrica} no soportada; opciones: {', '.join(METRICAS_PRECISION)}")
+    raiz = secuencia_raiz(semilla)
+    simuladas = []
+
+    def simular_lote(cantidad):
+        lote_corridas = [simular_corrida_mm1(arrival_rate, service_rate, sim_time, K, secuencia,
+                                             corridas is not None)
+                         for secuencia in secuencias_hijas(cantidad, raiz)]
+        simuladas.extend(lote_corridas)
+        return [corrida[metrica] for corrida in lote_corridas]
+
+    informe = correr_hasta_precision(simular_lote, precision, confianza, lote, max_corridas)
+    if corridas is not None:
+        corridas.extend(simuladas)
+    return promediar_corridas(simuladas, K), informe
+
+
+def a_resultados(arrival_rates, corridas_por_tasa, metadatos=None):
+    """
+    Reúne las corridas de todas las tasas de arribo en un contenedor columnar.
+
+    Cada corrida tiene series de distinto largo, así que cada serie de SERIES se
+    guarda concatenada en una columna, y 'inicio_<serie>' (corridas + 1 valores)
+    marca dónde empieza cada corrida: la corrida i es serie[inicio[i]:inicio[i + 1]].
+
+    Parámetros:
+        arrival_rates (list): Tasa de arribo de cada grupo de corridas.
+        corridas_por_tasa (list): Corridas de cada tasa, simuladas con sus series.
+        metadatos (dict, opcional): Parámetros de la simulación.
+
+    Retorna:
+        Resultados: Columnas 'tasa_arribo' y una por métrica de METRICAS_PRECISION más
+        'P_denegacion' (una fila por corrida), y las series con sus inicios.
+    """
+    corridas = [corrida for grupo in corridas_por_tasa for corrida in grupo]
+    columnas = {'tasa_arribo': np.repeat(np.asarray(arrival_rates, dtype=np.float64),
+                                         [len(grupo) for grupo in corridas_por_tasa])}
+    for metrica in METRICAS_PRECISION + ('P_denegacion',):
+        columnas[metrica] = np.array([corrida[metrica] for corrida in corridas], dtype=np.float64)
+    for serie in SERIES:
+        largos = [len(corrida[serie]) for corrida in corridas]
+        columnas[f'inicio_{serie}'] = np.concatenate(([0], np.cumsum(largos, dtype=np.int64)))
+        columnas[serie] = (np.concatenate([corrida[serie] for corrida in corridas]) if corridas
+                           else np.empty(0))
+    return Resultados(columnas, metadatos)
+
+
 def comparar_resultados(resultados_teoricos, resultados_simulacion, K):
     print("Comparación de Resultados:")
     for key in ['rho', 'L', 'L_q', 'W', 'W_q']:
@@ -133,42 +228,99 @@ def graficar_resultados(arrival_rates, resultados_teoricos, resultados_simulacio
         valores_teoricos = [res[metrica] for res in resultados_teoricos]
         valores_simulados = [res[metrica] for res in resultados_simulacion]
 
-        plt.figure(figsize=(10, 6))
-        plt.plot(arrival_rates, valores_teoricos, marker='o', label='Teórico')
-        plt.plot(arrival_rates, valores_simulados, marker='x', label='Simulado')
-        plt.xlabel('Tasa de arribo (proporción de la tasa de servicio)')
-        plt.ylabel(metrica)
-        plt.title(f'{metrica} vs Tasa de Arribo')
-        plt.legend()
-        plt.grid(True)
-        plt.show()
+        fig, ax = obtener_figura('resultados', figsize=(10, 6))
+        ax.plot(arrival_rates, valores_teoricos, marker='o', label='Teórico')
+        ax.plot(arrival_rates, valores_simulados, marker='x', label='Simulado')
+        ax.set_xlabel('Tasa de arribo (proporción de la tasa de servicio)')
+        ax.set_ylabel(metrica)
+        ax.set_title(f'{metrica} vs Tasa de Arribo')
+        ax.legend()
+        ax.grid(True)
+        mostrar_o_guardar(fig, f'{metrica}_vs_tasa_arribo.png')
 
 
 def graficar_densidad_probabilidad(arrival_rates, resultados_simulacion, K):
     for arrival_rate, res_sim in zip(arrival_rates, resultados_simulacion):
-        plt.figure(figsize=(10, 6))
-        plt.bar(range(K + 1), res_sim['P_n'])
-        plt.xlabel('Número de clientes en cola')
-        plt.ylabel('Probabilidad')
-        plt.title(f'Densidad de Probabilidad de Clientes en Cola\nTasa de arribo = {arrival_rate}')
-        plt.grid(True)
-        plt.show()
+        fig, ax = obtener_figura('densidad', figsize=(10, 6))
+        ax.bar(range(K + 1), res_sim['P_n'])
+        ax.set_xlabel('Número de clientes en cola')
+        ax.set_ylabel('Probabilidad')
+        ax.set_title(f'Densidad de Probabilidad de Clientes en Cola\nTasa de arribo = {arrival_rate}')
+        ax.grid(True)
+        mostrar_o_guardar(fig, f'densidad_P_n_tasa_{arrival_rate}.png')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Simulación de una cola M/M/1')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Semilla raíz para reproducir la simulación (por defecto: aleatoria)')
+    parser.add_argument('--output-dir', type=str, default=None,
+                        help='Guarda los gráficos en este directorio sin abrir ventanas (por defecto: se muestran)')
+    parser.add_argument('--precision', type=float, default=None,
+                        help='Semiancho relativo buscado para --metrica en cada tasa de arribo; lanza lotes de '
+                             'corridas hasta alcanzarlo (por defecto: una corrida por tasa)')
+    parser.add_argument('--confianza', type=float, default=0.95,
+                        help='Nivel de confianza del intervalo con --precision (por defecto: 0.95)')
+    parser.add_argument('--metrica', type=str, choices=METRICAS_PRECISION, default='W_q',
+                        help='Métrica a estimar con --precision (por defecto: W_q)')
+    parser.add_argument('--lote', type=int, default=10,
+                        help='Corridas por lote con --precision (por defecto: 10)')
+    parser.add_argument('--max-corridas', type=int, default=1000,
+                        help='Presupuesto máximo de corridas por tasa con --precision (por defecto: 1000)')
+    parser.add_argument('--guardar', type=str, default=None,
+                        help='Guarda las corridas y sus series en este directorio (columnas .npy) o archivo '
+                             '.npz comprimido')
+    args = parser.parse_args(argv)
+    try:
+        if args.precision is not None:
+            if args.precision <= 0:
+                raise ValueError("--precision debe ser positiva")
+            if not 0 < args.confianza < 1:
+                raise ValueError("--confianza debe estar entre 0 y 1")
+            if args.lote < 2 or args.max_corridas < 2:
+                raise ValueError("--lote y --max-corridas deben ser al menos 2")
+    except ValueError as ve:
+        print("Error en los argumentos de entrada:", ve)
+        return
+    configurar_salida(args.output_dir)
+
+    arrival_rates = [0.25, 0.5, 0.75, 1.0, 1.25]
+    service_rate = 1.0
+    num_runs = 1
+    sim_time = 1000
+    K = 50
+
+    resultados_teoricos = []
+    resultados_simulacion = []
+    # Corridas de cada tasa con sus series; solo se conservan si se van a guardar
+    corridas_por_tasa = []
 
+    # Una secuencia independiente por tasa de arribo, derivada de la semilla raíz
+    for arrival_rate, secuencia in zip(arrival_rates, secuencias_hijas(len(arrival_rates), args.seed)):
+        resultados_teoricos.append(calcular_valores_teoricos(arrival_rate, service_rate, K))
+        corridas = [] if args.guardar else None
+        corridas_por_tasa.append(corridas)
+        if args.precision is None:
+            resultados_simulacion.append(simulate_mm1(arrival_rate, service_rate, num_runs, sim_time, K, secuencia,
+                                                      corridas))
+            continue
+        resultado, informe = simulate_mm1_hasta_precision(arrival_rate, service_rate, sim_time, K, args.metrica,
+                                                          args.precision, secuencia, args.confianza, args.lote,
+                                                          args.max_corridas, corridas)
+        resultados_simulacion.append(resultado)
+        print(f'Tasa de arribo {arrival_rate}:', describir_informe(informe, args.metrica))
 
-arrival_rates = [0.25, 0.5, 0.75, 1.0, 1.25]
-service_rate = 1.0
-num_runs = 1
-sim_time = 1000
-K = 50
+    if args.guardar:
+        metadatos = {'service_rate': service_rate, 'sim_time': sim_time, 'K': K, 'semilla': args.seed}
+        print('resultados guardados en: ',
+              a_resultados(arrival_rates, corridas_por_tasa, metadatos).guardar(args.guardar))
 
-resultados_teoricos = []
-resultados_simulacion = []
+    metricas = ['rho', 'L', 'L_q', 'W', 'W_q']
 
-for arrival_rate in arrival_rates:
-    resultados_teoricos.append(calcular_valores_teoricos(arrival_rate, service_rate, K))
-    resultados_simulacion.append(simulate_mm1(arrival_rate, service_rate, num_runs, sim_time, K))
+    graficar_resultados(arrival_rates, resultados_teoricos, resultados_simulacion, metricas)
+    graficar_densidad_probabilidad(arrival_rates, resultados_simulacion, K)
+    return resultados_simulacion
 
-metricas = ['rho', 'L', 'L_q', 'W', 'W_q']
 
-graficar_resultados(arrival_rates, resultados_teoricos, resultados_simulacion, metricas)
-graficar_densidad_probabilidad(arrival_rates, resultados_simulacion, K)
+if __name__ == "__main__":
+    main()
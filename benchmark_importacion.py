@@ -0,0 +1,78 @@
+"""
+Benchmark del tiempo de arranque de los simuladores.
+
+Ejecuta cada script con argumentos que terminan antes de simular (ayuda o
+validación fallida) y mide el tiempo total del proceso. También informa qué
+dependencias pesadas llegaron a importarse, que deberían ser ninguna.
+
+Uso:
+    python3 benchmark_importacion.py [-r REPETICIONES]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+
+INVOCACIONES = [
+    ('TP_1/tp_1.py', ['-c', '-1']),
+    ('TP_1/tp_1.py', ['--help']),
+    ('TP_1.2/tp_2.py', ['-c', '3']),
+    ('TP_1.2/tp_2.py', ['--help']),
+    ('TP_3/mm1.py', ['--help']),
+    ('TP_3/inventario.py', ['--help']),
+    ('TP_2*(PROGRESO)/tp2_1.py', ['-n', '1']),
+    ('TP_2*(PROGRESO)/tp2_1.py', ['--help']),
+    ('TP_2*(PROGRESO)/tp2_2.py', ['-n', '1']),
+    ('TP_2*(PROGRESO)/tp2_2.py', ['--help']),
+]
+
+MODULOS_PESADOS = ('numpy', 'matplotlib', 'scipy', 'simpy')
+
+
+def medir(script, argumentos, repeticiones):
+    """
+    Mide el tiempo de proceso de una invocación.
+
+    Parámetros:
+        script (str): Ruta del script relativa a la raíz del repositorio.
+        argumentos (list): Argumentos de línea de comandos.
+        repeticiones (int): Cantidad de ejecuciones.
+
+    Retorna:
+        tuple: Mediana en milisegundos y lista de módulos pesados importados.
+    """
+    comando = [sys.executable, os.path.join(RAIZ, script)] + argumentos
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        subprocess.run(comando, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+
+    salida = subprocess.run([sys.executable, '-X', 'importtime'] + comando[1:],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True).stderr
+    importados = {linea.rsplit('|', 1)[-1].strip() for linea in salida.splitlines() if '|' in linea}
+    pesados = [modulo for modulo in MODULOS_PESADOS if modulo in importados]
+    return statistics.median(tiempos), pesados
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del tiempo de arranque de los simuladores')
+    parser.add_argument('-r', '--repeticiones', type=int, default=10,
+                        help='Ejecuciones por invocación (por defecto: 10)')
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    subprocess.run([sys.executable, '-c', 'pass'])
+    print(f"{'python -c pass':<40} {(time.perf_counter() - inicio) * 1000:8.1f} ms  (referencia)")
+    for script, argumentos in INVOCACIONES:
+        mediana, pesados = medir(script, argumentos, args.repeticiones)
+        invocacion = ' '.join([script] + argumentos)
+        print(f"{invocacion:<40} {mediana:8.1f} ms  pesados: {', '.join(pesados) or 'ninguno'}")
+
+
+if __name__ == "__main__":
+    main()
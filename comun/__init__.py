@@ -0,0 +1,6 @@
+"""
+Utilidades compartidas por los simuladores de los distintos trabajos prácticos.
+
+Los scripts de cada TP agregan la raíz del repositorio a sys.path para poder
+importar este paquete al ejecutarse directamente.
+"""
@@ -0,0 +1,161 @@
+import os
+
+from comun.perezoso import ModuloPerezoso
+
+colecciones = ModuloPerezoso('matplotlib.collections')
+np = ModuloPerezoso('numpy')
+plt = ModuloPerezoso('matplotlib.pyplot')
+
+# Directorio donde se guardan las figuras; None muestra cada figura en pantalla
+_directorio_salida = None
+
+# Con más corridas que esto no se arma la leyenda, que sería ilegible
+MAX_CORRIDAS_CON_LEYENDA = 10
+
+PERCENTILES_BANDAS = (5, 25, 50, 75, 95)
+
+# Valores que se leen a la vez al calcular las bandas o armar las líneas, para no cargar series mapeadas enteras
+VALORES_POR_BLOQUE = 1 << 23
+
+# Puntos por línea al graficar cada corrida; las series más largas se submuestrean
+MAX_PUNTOS_POR_LINEA = 2000
+
+
+def configurar_salida(directorio=None):
+    """
+    Elige si las figuras se muestran en pantalla o se guardan en archivos.
+
+    Con un directorio se pasa al backend no interactivo Agg, por lo que
+    ninguna figura bloquea la ejecución (útil para corridas desatendidas).
+
+    Parámetros:
+        directorio (str, opcional): Directorio de salida; None para mostrar en pantalla.
+    """
+    global _directorio_salida
+    _directorio_salida = directorio
+    if directorio is not None:
+        os.makedirs(directorio, exist_ok=True)
+        plt.switch_backend('Agg')
+
+
+def obtener_figura(nombre, figsize=(20, 10)):
+    """
+    Devuelve una figura limpia identificada por nombre.
+
+    Si ya existe una figura con ese nombre se reutiliza en lugar de crear
+    una nueva, lo que evita el costo de construir figuras en lotes grandes.
+
+    Parámetros:
+        nombre (str): Identificador de la figura.
+        figsize (tuple, opcional): Tamaño en pulgadas.
+
+    Retorna:
+        tuple: Figura y ejes.
+    """
+    fig = plt.figure(num=nombre, figsize=figsize)
+    fig.clear()
+    return fig, fig.add_subplot()
+
+
+def guardar(fig, nombre_archivo):
+    """
+    Guarda la figura en el directorio de salida, o en el directorio actual si no hay uno.
+
+    Parámetros:
+        fig (matplotlib.figure.Figure): Figura a guardar.
+        nombre_archivo (str): Nombre del archivo (con extensión).
+
+    Retorna:
+        str: Ruta del archivo guardado.
+    """
+    ruta = os.path.join(_directorio_salida or os.curdir, nombre_archivo)
+    fig.savefig(ruta, bbox_inches='tight')
+    return ruta
+
+
+def mostrar_o_guardar(fig, nombre_archivo):
+    """
+    Muestra la figura o la guarda en el directorio de salida.
+
+    Parámetros:
+        fig (matplotlib.figure.Figure): Figura a emitir.
+        nombre_archivo (str): Nombre del archivo (con extensión) en modo sin pantalla.
+
+    Retorna:
+        str: Ruta del archivo guardado, o None si se mostró en pantalla.
+    """
+    if _directorio_salida is None:
+        plt.show()
+        return None
+    return guardar(fig, nombre_archivo)
+
+
+def graficar_corridas(ax, x, series, bandas=False, etiqueta='Corrida', desplazamiento=0.0):
+    """
+    Grafica una serie por corrida con un costo que no crece con la cantidad de corridas.
+
+    Las corridas se dibujan como LineCollection armadas por bloques de filas, con
+    a lo sumo MAX_PUNTOS_POR_LINEA puntos por corrida, o bien como bandas de
+    percentiles entre corridas con la mediana destacada. En ningún caso se copia
+    la matriz entera, así que series mapeadas en memoria se leen por partes.
+
+    Parámetros:
+        ax (matplotlib.axes.Axes): Ejes donde graficar.
+        x (array): Valores del eje x, comunes a todas las corridas.
+        series (array): Matriz de forma (corridas, len(x)); puede estar mapeada en memoria.
+        bandas (bool, opcional): Si es True grafica percentiles en lugar de cada corrida.
+        etiqueta (str, opcional): Prefijo de la leyenda de cada corrida.
+        desplazamiento (float, opcional): Valor que se suma a las series al graficarlas, sin
+            crear una copia desplazada de la matriz.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    # Sin dtype: una matriz (o un memmap) se usa tal cual en lugar de convertirse entera
+    series = np.asanyarray(series)
+    if bandas:
+        p_bajo, q_bajo, mediana, q_alto, p_alto = _percentiles_por_bloques(series) + desplazamiento
+        ax.fill_between(x, p_bajo, p_alto, color='C0', alpha=0.2,
+                        label=f'P{PERCENTILES_BANDAS[0]}-P{PERCENTILES_BANDAS[-1]}')
+        ax.fill_between(x, q_bajo, q_alto, color='C0', alpha=0.4,
+                        label=f'P{PERCENTILES_BANDAS[1]}-P{PERCENTILES_BANDAS[-2]}')
+        ax.plot(x, mediana, color='C0', label='Mediana')
+        ax.legend()
+        return
+
+    columnas = slice(None)
+    if len(x) > MAX_PUNTOS_POR_LINEA:
+        columnas = np.unique(np.rint(np.linspace(0, len(x) - 1, MAX_PUNTOS_POR_LINEA)).astype(np.int64))
+        x = x[columnas]
+    ciclo = plt.rcParams['axes.prop_cycle'].by_key()['color']
+    filas_por_bloque = max(1, VALORES_POR_BLOQUE // max(1, len(x)))
+    for inicio in range(0, len(series), filas_por_bloque):
+        bloque = series[inicio:inicio + filas_por_bloque]
+        segmentos = np.empty((len(bloque), len(x), 2))
+        segmentos[..., 0] = x
+        segmentos[..., 1] = bloque[:, columnas]
+        segmentos[..., 1] += desplazamiento
+        colores = [ciclo[i % len(ciclo)] for i in range(inicio, inicio + len(bloque))]
+        ax.add_collection(colecciones.LineCollection(segmentos, colors=colores, linewidths=1))
+    ax.autoscale_view()
+    if len(series) <= MAX_CORRIDAS_CON_LEYENDA:
+        for i in range(len(series)):
+            ax.plot([], [], color=ciclo[i % len(ciclo)], label=f'{etiqueta} {i + 1}')
+        ax.legend(loc='upper center', bbox_to_anchor=(0.5, -0.1), ncol=min(len(series), 5), fancybox=True,
+                  shadow=True)
+
+
+def _percentiles_por_bloques(series):
+    """
+    Calcula PERCENTILES_BANDAS entre corridas, leyendo la matriz por bloques de columnas.
+
+    Parámetros:
+        series (np.ndarray): Matriz de forma (corridas, puntos).
+
+    Retorna:
+        np.ndarray: Matriz de forma (len(PERCENTILES_BANDAS), puntos).
+    """
+    percentiles = np.empty((len(PERCENTILES_BANDAS), series.shape[1]))
+    columnas_por_bloque = max(1, VALORES_POR_BLOQUE // max(1, len(series)))
+    for inicio in range(0, series.shape[1], columnas_por_bloque):
+        fin = inicio + columnas_por_bloque
+        percentiles[:, inicio:fin] = np.percentile(series[:, inicio:fin], PERCENTILES_BANDAS, axis=0)
+    return percentiles
@@ -0,0 +1,41 @@
+def ejecutar_corridas(funcion, secuencias, workers=1):
+    """
+    Ejecuta funcion(secuencia) una vez por corrida.
+
+    Con workers > 1 reparte las corridas en un pool de procesos; los
+    resultados se devuelven siempre en el orden de las corridas.
+
+    Parámetros:
+        funcion (callable): Función a nivel de módulo (serializable) que simula una corrida.
+        secuencias (list): Secuencia de semillas de cada corrida (ver comun.semillas).
+        workers (int, opcional): Cantidad de procesos a usar.
+
+    Retorna:
+        list: Resultado de cada corrida.
+    """
+    return list(iterar_corridas(funcion, secuencias, workers))
+
+
+def iterar_corridas(funcion, secuencias, workers=1):
+    """
+    Como ejecutar_corridas, pero entrega el resultado de cada corrida a medida que está listo.
+
+    Sirve para volcar cada corrida a su destino sin juntar antes los resultados de todas.
+
+    Parámetros:
+        funcion (callable): Función a nivel de módulo (serializable) que simula una corrida.
+        secuencias (list): Secuencia de semillas de cada corrida (ver comun.semillas).
+        workers (int, opcional): Cantidad de procesos a usar.
+
+    Retorna:
+        generator: Resultado de cada corrida, en el orden de las corridas.
+    """
+    if workers <= 1 or len(secuencias) <= 1:
+        for secuencia in secuencias:
+            yield funcion(secuencia)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    # Bloques de varias corridas por tarea para amortizar la comunicación entre procesos
+    chunksize = max(1, len(secuencias) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(funcion, secuencias, chunksize=chunksize)
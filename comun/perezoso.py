@@ -0,0 +1,28 @@
+import importlib
+
+
+class ModuloPerezoso:
+    """
+    Representa un módulo que recién se importa la primera vez que se usa uno de sus atributos.
+
+    Permite declarar las dependencias pesadas (numpy, matplotlib, scipy, simpy)
+    al principio del archivo sin pagar su importación en las invocaciones que
+    no las necesitan, como las que fallan al validar los argumentos.
+    """
+
+    def __init__(self, nombre):
+        """
+        Parámetros:
+            nombre (str): Nombre completo del módulo, por ejemplo 'matplotlib.pyplot'.
+        """
+        self._nombre = nombre
+        self._modulo = None
+
+    def __getattr__(self, atributo):
+        if self._modulo is None:
+            self._modulo = importlib.import_module(self._nombre)
+        return getattr(self._modulo, atributo)
+
+    def __repr__(self):
+        estado = 'importado' if self._modulo is not None else 'sin importar'
+        return f'<ModuloPerezoso {self._nombre!r} ({estado})>'
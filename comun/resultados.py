@@ -0,0 +1,129 @@
+import json
+import os
+
+from comun.perezoso import ModuloPerezoso
+
+np = ModuloPerezoso('numpy')
+
+# Clave de los metadatos dentro de un archivo .npz
+_CLAVE_METADATOS = '__metadatos__'
+ARCHIVO_METADATOS = 'metadatos.json'
+
+
+class Resultados:
+    """
+    Contenedor columnar de resultados: cada columna es un arreglo tipado y contiguo.
+
+    Las columnas pueden tener distinta forma (por ejemplo, una matriz
+    (corridas, tiradas) y un vector por corrida). Se guardan en un directorio
+    con un archivo .npy por columna, que se puede leer mapeado en memoria, o
+    en un único archivo .npz comprimido.
+    """
+
+    def __init__(self, columnas=None, metadatos=None):
+        """
+        Parámetros:
+            columnas (dict, opcional): Nombre y valores de cada columna.
+            metadatos (dict, opcional): Parámetros de la simulación (serializables a JSON).
+        """
+        self.columnas = {}
+        self.metadatos = dict(metadatos or {})
+        for nombre, valores in (columnas or {}).items():
+            self.agregar(nombre, valores)
+
+    def agregar(self, nombre, valores, dtype=None):
+        """
+        Agrega o reemplaza una columna.
+
+        Parámetros:
+            nombre (str): Nombre de la columna.
+            valores (array): Valores; las listas se convierten a un arreglo contiguo.
+            dtype (np.dtype, opcional): Tipo de los valores.
+        """
+        if isinstance(valores, np.memmap):
+            # Se conserva el mapeo: convertirlo copiaría la columna a memoria
+            self.columnas[nombre] = valores
+        else:
+            self.columnas[nombre] = np.ascontiguousarray(valores, dtype=dtype)
+
+    def __getitem__(self, nombre):
+        return self.columnas[nombre]
+
+    def __contains__(self, nombre):
+        return nombre in self.columnas
+
+    def __iter__(self):
+        return iter(self.columnas)
+
+    def __len__(self):
+        return len(self.columnas)
+
+    @property
+    def nbytes(self):
+        """Bytes ocupados por los valores de todas las columnas."""
+        return sum(valores.nbytes for valores in self.columnas.values())
+
+    def recorrer(self, nombre, filas_por_bloque=4096):
+        """
+        Recorre una columna por bloques de filas, para reducirla sin cargarla entera.
+
+        Parámetros:
+            nombre (str): Nombre de la columna.
+            filas_por_bloque (int, opcional): Filas de cada bloque.
+
+        Retorna:
+            generator: Bloques consecutivos de la columna (vistas, sin copiar).
+        """
+        valores = self.columnas[nombre]
+        for inicio in range(0, len(valores), filas_por_bloque):
+            yield valores[inicio:inicio + filas_por_bloque]
+
+    def guardar(self, ruta):
+        """
+        Guarda los resultados.
+
+        Si la ruta termina en .npz se escribe un único archivo comprimido; si no,
+        un directorio con un .npy por columna y los metadatos en JSON.
+
+        Parámetros:
+            ruta (str): Archivo .npz o directorio de destino.
+
+        Retorna:
+            str: Ruta escrita.
+        """
+        if ruta.endswith('.npz'):
+            arreglos = dict(self.columnas)
+            arreglos[_CLAVE_METADATOS] = np.array(json.dumps(self.metadatos))
+            np.savez_compressed(ruta, **arreglos)
+            return ruta
+        os.makedirs(ruta, exist_ok=True)
+        for nombre, valores in self.columnas.items():
+            np.save(os.path.join(ruta, f'{nombre}.npy'), valores)
+        with open(os.path.join(ruta, ARCHIVO_METADATOS), 'w') as archivo:
+            json.dump({'columnas': list(self.columnas), 'metadatos': self.metadatos}, archivo)
+        return ruta
+
+    @classmethod
+    def cargar(cls, ruta, mmap=True):
+        """
+        Lee resultados guardados con guardar().
+
+        Parámetros:
+            ruta (str): Archivo .npz o directorio.
+            mmap (bool, opcional): En un directorio, mapea las columnas en memoria en lugar
+                de leerlas (solo lectura); los .npz comprimidos siempre se leen enteros.
+
+        Retorna:
+            Resultados: Resultados leídos.
+        """
+        if ruta.endswith('.npz'):
+            with np.load(ruta) as archivo:
+                metadatos = json.loads(str(archivo[_CLAVE_METADATOS]))
+                columnas = {nombre: archivo[nombre] for nombre in archivo.files if nombre != _CLAVE_METADATOS}
+            return cls(columnas, metadatos)
+        with open(os.path.join(ruta, ARCHIVO_METADATOS)) as archivo:
+            indice = json.load(archivo)
+        resultados = cls(metadatos=indice['metadatos'])
+        for nombre in indice['columnas']:
+            resultados.agregar(nombre, np.load(os.path.join(ruta, f'{nombre}.npy'), mmap_mode='r' if mmap else None))
+        return resultados
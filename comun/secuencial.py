@@ -0,0 +1,88 @@
+from comun.perezoso import ModuloPerezoso
+
+np = ModuloPerezoso('numpy')
+stats = ModuloPerezoso('scipy.stats')
+
+
+def intervalo_confianza(valores, confianza=0.95):
+    """
+    Intervalo de confianza t de Student para la media de las corridas.
+
+    Parámetros:
+        valores (array): Valor de la métrica en cada corrida.
+        confianza (float, opcional): Nivel de confianza.
+
+    Retorna:
+        dict: 'media', 'semiancho', 'precision' (semiancho relativo a |media|; inf si no se
+        puede calcular), 'corridas' y 'confianza'.
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    corridas = len(valores)
+    media = float(valores.mean()) if corridas else float('nan')
+    if corridas < 2:
+        semiancho = float('inf')
+    else:
+        cuantil = stats.t.ppf((1 + confianza) / 2, corridas - 1)
+        semiancho = float(cuantil * valores.std(ddof=1) / np.sqrt(corridas))
+    if semiancho == 0:
+        precision = 0.0
+    elif media == 0 or not np.isfinite(media):
+        precision = float('inf')
+    else:
+        precision = semiancho / abs(media)
+    return {'media': media, 'semiancho': semiancho, 'precision': precision, 'corridas': corridas,
+            'confianza': confianza}
+
+
+def correr_hasta_precision(simular_lote, precision_objetivo, confianza=0.95, tamano_lote=10, max_corridas=10000):
+    """
+    Lanza lotes de corridas hasta que el intervalo de confianza de la métrica sea lo bastante angosto.
+
+    Se detiene cuando el semiancho relativo (semiancho / |media|) llega a precision_objetivo
+    o cuando se agota el presupuesto de corridas. Con al menos un lote completo se evita
+    cortar con una varianza estimada con muy pocas corridas.
+
+    Parámetros:
+        simular_lote (callable): simular_lote(cantidad) simula esa cantidad de corridas nuevas
+            y devuelve el valor de la métrica en cada una.
+        precision_objetivo (float): Semiancho relativo buscado (por ejemplo 0.01 para ±1 %).
+        confianza (float, opcional): Nivel de confianza del intervalo.
+        tamano_lote (int, opcional): Corridas por lote.
+        max_corridas (int, opcional): Presupuesto máximo de corridas.
+
+    Retorna:
+        dict: El intervalo de intervalo_confianza más 'objetivo', 'alcanzada' (si se llegó a la
+        precisión pedida) y 'valores' (la métrica de cada corrida, en orden).
+    """
+    if precision_objetivo <= 0:
+        raise ValueError("La precisión objetivo debe ser positiva.")
+    if not 0 < confianza < 1:
+        raise ValueError("La confianza debe estar entre 0 y 1.")
+    if tamano_lote < 2 or max_corridas < 2:
+        raise ValueError("El lote y el presupuesto deben ser de al menos 2 corridas.")
+    valores = []
+    while True:
+        valores.extend(simular_lote(min(tamano_lote, max_corridas - len(valores))))
+        informe = intervalo_confianza(valores, confianza)
+        alcanzada = informe['precision'] <= precision_objetivo
+        if alcanzada or len(valores) >= max_corridas:
+            break
+    informe.update(objetivo=precision_objetivo, alcanzada=alcanzada, valores=valores)
+    return informe
+
+
+def describir_informe(informe, metrica):
+    """
+    Texto con la precisión alcanzada, para mostrar al final de una corrida adaptativa.
+
+    Parámetros:
+        informe (dict): Resultado de correr_hasta_precision.
+        metrica (str): Nombre de la métrica.
+
+    Retorna:
+        str: Descripción en una línea.
+    """
+    estado = 'alcanzada' if informe['alcanzada'] else 'NO alcanzada (se agotó el presupuesto)'
+    return (f"{metrica} = {informe['media']:.6g} ± {informe['semiancho']:.3g} "
+            f"({informe['confianza']:.0%} de confianza, {informe['corridas']} corridas); "
+            f"precisión relativa {informe['precision']:.3%}, objetivo {informe['objetivo']:.3%} {estado}")
@@ -0,0 +1,67 @@
+import random
+
+from comun.perezoso import ModuloPerezoso
+
+np = ModuloPerezoso('numpy')
+
+
+def secuencia_raiz(semilla=None):
+    """
+    Construye la secuencia de semillas raíz de una simulación.
+
+    Parámetros:
+        semilla (int | np.random.SeedSequence, opcional): Semilla raíz; si es None
+            se toma entropía del sistema.
+
+    Retorna:
+        np.random.SeedSequence: Secuencia a partir de la cual se derivan las demás.
+    """
+    if isinstance(semilla, np.random.SeedSequence):
+        return semilla
+    return np.random.SeedSequence(semilla)
+
+
+def secuencias_hijas(cantidad, semilla=None):
+    """
+    Deriva una secuencia independiente por corrida a partir de la semilla raíz.
+
+    La corrida i recibe siempre la misma secuencia sin importar en qué proceso
+    se ejecute, por lo que las ejecuciones en serie y en paralelo coinciden.
+
+    Parámetros:
+        cantidad (int): Cantidad de secuencias a derivar.
+        semilla (int | np.random.SeedSequence, opcional): Semilla raíz.
+
+    Retorna:
+        list: Una np.random.SeedSequence por corrida.
+    """
+    return secuencia_raiz(semilla).spawn(cantidad)
+
+
+def generador_numpy(secuencia):
+    """
+    Crea un generador de NumPy (PCG64) a partir de una secuencia de semillas.
+
+    Parámetros:
+        secuencia (np.random.SeedSequence): Secuencia de la corrida.
+
+    Retorna:
+        np.random.Generator: Generador independiente.
+    """
+    return np.random.default_rng(secuencia)
+
+
+def generador_random(secuencia):
+    """
+    Crea un random.Random a partir de una secuencia de semillas.
+
+    Conviene en los bucles que sortean de a un valor, donde las llamadas
+    escalares de random son más baratas que las de NumPy.
+
+    Parámetros:
+        secuencia (np.random.SeedSequence): Secuencia de la corrida.
+
+    Retorna:
+        random.Random: Generador independiente.
+    """
+    return random.Random(int.from_bytes(secuencia.generate_state(4).tobytes(), 'little'))